@@ -1,11 +1,17 @@
-import google.generativeai as genai
+import json
+from concurrent.futures import ThreadPoolExecutor
 from config import Config
 from error_handlers import with_ai_error_handling
 from logger_config import get_logger
-from image_generation import generate_image_for_post
+from image_generation import generate_image_for_post, create_platform_crops, IMAGE_MODEL_NAME
+from generation_providers import get_generation_provider
+from generation_cache import build_cache_key, get_cached_generation, store_generation
 
 logger = get_logger('ai_service')
-genai.configure(api_key=Config.GEMINI_API_KEY)
+
+TEXT_MODEL_NAME = 'gemini-2.5-pro'
+SUPPORTED_PLATFORMS = ['LinkedIn', 'Twitter', 'Instagram', 'Facebook']
+generation_executor = ThreadPoolExecutor(max_workers=Config.GENERATION_MAX_WORKERS, thread_name_prefix='generation')
 
 def get_platform_prompt(platform, topic):
     prompts = {
@@ -18,13 +24,20 @@ def get_platform_prompt(platform, topic):
 
 @with_ai_error_handling('content_generation')
 def generate_post_content(platform, topic):
-    model = genai.GenerativeModel('gemini-2.5-pro')
     prompt = get_platform_prompt(platform, topic)
     
     logger.info(f"Generating content for platform: {platform}, topic: {topic}")
-    response = model.generate_content(prompt)
+    content = get_generation_provider().generate_text(TEXT_MODEL_NAME, prompt)
     logger.info("Content generated successfully")
-    return response.text
+    return content
+
+def stream_post_content(platform, topic):
+    prompt = get_platform_prompt(platform, topic)
+    
+    logger.info(f"Streaming content for platform: {platform}, topic: {topic}")
+    for text in get_generation_provider().stream_text(TEXT_MODEL_NAME, prompt):
+        yield text
+    logger.info("Content streamed successfully")
 
 def generate_ai_image_for_content(content, platform):
     logger.info(f"Generating AI image for {platform} content")
@@ -32,18 +45,134 @@ def generate_ai_image_for_content(content, platform):
     logger.info("AI image generated successfully")
     return image_url
 
-@with_ai_error_handling('complete_post_generation')
-def generate_complete_post(platform, topic):
-    logger.info(f"Starting complete post generation for {platform} about {topic}")
-    content = generate_post_content(platform, topic)
-    image_url = generate_ai_image_for_content(content, platform)
-    
-    result = {
+def get_generation_cache_key(platform, topic):
+    model_id = f"{TEXT_MODEL_NAME}+{IMAGE_MODEL_NAME}"
+    provider_name = get_generation_provider().name
+    if provider_name != 'gemini':
+        model_id = f"{provider_name}/{model_id}"
+    return build_cache_key(get_platform_prompt(platform, topic), platform, model_id)
+
+def build_generation_result(content, image_url, platform, topic, cached=False):
+    return {
         'content': content,
         'image_url': image_url,
         'platform': platform,
-        'topic': topic
+        'topic': topic,
+        'cached': cached
     }
+
+def start_image_generation(topic, platform):
+    logger.info(f"Starting pipelined image generation for {platform} from topic")
+    return generation_executor.submit(generate_ai_image_for_content, topic, platform)
+
+@with_ai_error_handling('complete_post_generation')
+def generate_complete_post(platform, topic, force_regenerate=False):
+    logger.info(f"Starting complete post generation for {platform} about {topic}")
+    cache_key = get_generation_cache_key(platform, topic)
+    
+    if not force_regenerate:
+        cached_post = get_cached_generation(cache_key)
+        if cached_post:
+            return build_generation_result(cached_post['content'], cached_post['image_url'], platform, topic, cached=True)
+    
+    if Config.GENERATION_PIPELINE_ENABLED:
+        image_future = start_image_generation(topic, platform)
+        content = generate_post_content(platform, topic)
+        image_url = image_future.result()
+    else:
+        content = generate_post_content(platform, topic)
+        image_url = generate_ai_image_for_content(content, platform)
+    store_generation(cache_key, {'content': content, 'image_url': image_url})
     
     logger.info("Complete post generation finished successfully")
-    return result
\ No newline at end of file
+    return build_generation_result(content, image_url, platform, topic)
+
+def stream_complete_post(platform, topic, force_regenerate=False):
+    cache_key = get_generation_cache_key(platform, topic)
+    
+    if not force_regenerate:
+        cached_post = get_cached_generation(cache_key)
+        if cached_post:
+            yield 'token', cached_post['content']
+            yield 'done', build_generation_result(cached_post['content'], cached_post['image_url'], platform, topic, cached=True)
+            return
+    
+    image_future = start_image_generation(topic, platform) if Config.GENERATION_PIPELINE_ENABLED else None
+    content_parts = []
+    for text in stream_post_content(platform, topic):
+        content_parts.append(text)
+        yield 'token', text
+    
+    content = ''.join(content_parts)
+    image_url = image_future.result() if image_future else generate_ai_image_for_content(content, platform)
+    store_generation(cache_key, {'content': content, 'image_url': image_url})
+    
+    logger.info("Streamed post generation finished successfully")
+    yield 'done', build_generation_result(content, image_url, platform, topic)
+
+def get_batch_prompt(topic, platforms):
+    instructions = '\n'.join(f'- "{platform}": {get_platform_prompt(platform, topic)}' for platform in platforms)
+    return (
+        f"Write one social media post about {topic} for each of these platforms, following each instruction:\n"
+        f"{instructions}\n"
+        "Return one item per platform with the platform name and the finished post text."
+    )
+
+def get_batch_schema(platforms):
+    return {
+        'type': 'ARRAY',
+        'items': {
+            'type': 'OBJECT',
+            'properties': {
+                'platform': {'type': 'STRING', 'enum': list(platforms)},
+                'content': {'type': 'STRING'}
+            },
+            'required': ['platform', 'content']
+        },
+        'min_items': str(len(platforms)),
+        'max_items': str(len(platforms))
+    }
+
+def parse_batch_response(response_text, platforms):
+    items = json.loads(response_text)
+    if not isinstance(items, list) or len(items) != len(platforms):
+        raise Exception(f"Batch generation returned {len(items) if isinstance(items, list) else 0} posts for {len(platforms)} platforms")
+    
+    posts = {item.get('platform'): (item.get('content') or '').strip() for item in items}
+    missing_platforms = [platform for platform in platforms if not posts.get(platform)]
+    if missing_platforms:
+        raise Exception(f"Batch generation missing platforms: {', '.join(missing_platforms)}")
+    return {platform: posts[platform] for platform in platforms}
+
+@with_ai_error_handling('batch_content_generation')
+def generate_batch_content(topic, platforms):
+    prompt = get_batch_prompt(topic, platforms)
+    
+    logger.info(f"Generating batch content for {len(platforms)} platforms, topic: {topic}")
+    response_text = get_generation_provider().generate_json(TEXT_MODEL_NAME, prompt, get_batch_schema(platforms))
+    logger.info("Batch content generated successfully")
+    return parse_batch_response(response_text, platforms)
+
+@with_ai_error_handling('batch_post_generation')
+def generate_batch_posts(topic, platforms=None):
+    platforms = [platform for platform in (platforms or SUPPORTED_PLATFORMS) if platform in SUPPORTED_PLATFORMS]
+    if not platforms:
+        raise ValueError("No supported platforms selected for batch generation")
+    
+    logger.info(f"Starting batch post generation for {', '.join(platforms)} about {topic}")
+    image_future = generation_executor.submit(generate_ai_image_for_content, topic, 'multi-platform')
+    contents = generate_batch_content(topic, platforms)
+    base_image_url = image_future.result()
+    platform_images = create_platform_crops(base_image_url, platforms)
+    
+    result = {
+        'topic': topic,
+        'base_image_url': base_image_url,
+        'posts': [
+            {'platform': platform, 'content': contents[platform], 'image_url': platform_images[platform]}
+            for platform in platforms
+        ]
+    }
+    
+    logger.info("Batch post generation finished successfully")
+    return result
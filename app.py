@@ -1,22 +1,32 @@
-from flask import Flask, render_template, request, redirect, url_for, flash, jsonify, send_from_directory
+from flask import Flask, render_template, request, redirect, url_for, flash, jsonify, send_from_directory, Response, stream_with_context
 from flask_login import LoginManager, login_required, current_user
 from datetime import datetime
+import base64
+import binascii
 import json
 import os
+import threading
 
 from config import Config, get_upload_folder
-from models import db, User, SocialAccount, Post, init_db, ensure_user_has_accounts
+from models import db, SocialAccount, Post, init_db, create_post_deliveries
 from auth import auth_bp
-from ai_service import generate_complete_post
-from scheduler import start_scheduler, schedule_post, cancel_scheduled_post
+from ai_service import generate_complete_post, stream_complete_post, generate_batch_posts
+from scheduler import start_scheduler, cancel_scheduled_post
+from publish_queue import start_publish_queue, enqueue_post_publication
 from error_handlers import with_error_handling, with_database_error_handling
 from logger_config import setup_application_logger, get_logger
 from image_generation import cleanup_old_images
-from social_platforms.platform_manager import post_to_platform, validate_platform_requirements
 from social_platforms.linkedin_publisher import get_linkedin_auth_url, exchange_code_for_token as linkedin_exchange
 from social_platforms.facebook_publisher import get_facebook_auth_url, exchange_code_for_token as facebook_exchange
+from social_platforms.identity_cache import invalidate_token_identities
+from social_platforms.circuit_breaker import get_circuit_states
+from social_platforms.rate_limiter import get_account_key
+from user_cache import (load_cached_user, load_cached_accounts, get_cached_dashboard, store_dashboard,
+                        invalidate_user_cache, invalidate_dashboard_cache)
 
 app = Flask(__name__)
+background_workers_lock = threading.Lock()
+background_workers_started = False
 app.config.from_object(Config)
 
 setup_application_logger()
@@ -29,7 +39,7 @@ login_manager.login_view = 'auth.login'
 
 @login_manager.user_loader
 def load_user(user_id):
-    return User.query.get(int(user_id))
+    return load_cached_user(int(user_id))
 
 app.register_blueprint(auth_bp, url_prefix='/auth')
 
@@ -39,14 +49,13 @@ def serve_generated_image(filename):
     return send_from_directory(upload_folder, filename)
 
 def get_user_accounts():
-    ensure_user_has_accounts(current_user.id, current_user.username)
-    accounts = SocialAccount.query.filter_by(user_id=current_user.id, is_active=True).all()
+    accounts = load_cached_accounts(current_user.id)
     logger.info(f"Retrieved {len(accounts)} accounts for user {current_user.id}")
     return accounts
 
 def create_post_record(content, image_url, platforms, scheduled_time=None):
     platforms_str = ','.join(platforms) if platforms else ''
-    status = 'scheduled' if scheduled_time else 'posted'
+    status = 'scheduled' if scheduled_time else 'queued'
     
     post = Post(
         user_id=current_user.id,
@@ -58,71 +67,110 @@ def create_post_record(content, image_url, platforms, scheduled_time=None):
     )
     
     db.session.add(post)
+    create_post_deliveries(post, platforms)
     db.session.commit()
+    invalidate_dashboard_cache(current_user.id)
     logger.info(f"Post record created with ID {post.id} for user {current_user.id}")
     return post
 
-def publish_post_immediately(content, image_url, selected_accounts):
-    success_count = 0
-    failed_platforms = []
-    
-    for account in selected_accounts:
-        try:
-            is_valid, error_msg = validate_platform_requirements(account.platform, content, image_url)
-            if not is_valid:
-                failed_platforms.append(f"{account.platform}: {error_msg}")
-                continue
-            
-            if account.access_token:
-                result = post_to_platform(account.platform, account.access_token, content, image_url)
-                if result:
-                    success_count += 1
-                else:
-                    failed_platforms.append(account.platform)
-            else:
-                failed_platforms.append(f"{account.platform}: No access token - connect account first")
-        except Exception as error:
-            failed_platforms.append(f"{account.platform}: {str(error)}")
-            logger.error(f"Failed to post to {account.platform}: {str(error)}")
-    
-    return success_count, failed_platforms
-
 def process_post_submission(content, image_url, selected_accounts, schedule_datetime):
     platforms = [acc.platform for acc in selected_accounts]
     
     if schedule_datetime:
         post = create_post_record(content, image_url, platforms, schedule_datetime)
-        schedule_post(post.id, schedule_datetime)
         flash(f'Post scheduled for {schedule_datetime.strftime("%Y-%m-%d %H:%M")}', 'success')
         logger.info(f"Post {post.id} scheduled for {schedule_datetime}")
     else:
-        success_count, failed_platforms = publish_post_immediately(content, image_url, selected_accounts)
-        
         post = create_post_record(content, image_url, platforms)
-        
-        if success_count > 0:
-            post.status = 'posted'
-            post.posted_at = datetime.utcnow()
-            if failed_platforms:
-                post.error_message = f"Failed on: {', '.join(failed_platforms)}"
-            flash(f'Post published successfully to {success_count} platforms!', 'success')
-            if failed_platforms:
-                flash(f'Failed on: {", ".join(failed_platforms)}', 'error')
-        else:
-            post.status = 'failed'
-            post.error_message = f'Failed on all platforms: {", ".join(failed_platforms)}'
-            flash('Post failed to publish. Please connect your social media accounts first.', 'error')
-        
-        db.session.commit()
-        logger.info(f"Post {post.id} published to {success_count} platforms")
-
-def get_dashboard_stats():
-    stats = {
-        'total_posts': Post.query.filter_by(user_id=current_user.id).count(),
-        'scheduled_posts': Post.query.filter_by(user_id=current_user.id, status='scheduled').count(),
-        'connected_accounts': len([acc for acc in get_user_accounts() if acc.access_token])
+        enqueue_post_publication(post.id, [acc.id for acc in selected_accounts])
+        flash(f'Post queued for publishing to {len(platforms)} platforms. Check Post History for results.', 'success')
+        logger.info(f"Post {post.id} queued for immediate publishing")
+
+HISTORY_PREVIEW_LENGTH = 50
+
+def encode_history_cursor(post):
+    raw_cursor = f"{post.created_at.isoformat()}|{post.id}"
+    return base64.urlsafe_b64encode(raw_cursor.encode('utf-8')).decode('ascii')
+
+def decode_history_cursor(cursor):
+    try:
+        created_at, post_id = base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8').split('|')
+        return datetime.fromisoformat(created_at), int(post_id)
+    except (ValueError, binascii.Error, UnicodeError):
+        logger.warning(f"Invalid history cursor: {cursor}")
+        return None
+
+def get_post_history_page(user_id, cursor=None, page_size=None):
+    page_size = page_size or Config.HISTORY_PAGE_SIZE
+    query = Post.query.options(
+        db.load_only(Post.id, Post.status, Post.platforms, Post.created_at, Post.scheduled_time, Post.posted_at),
+        db.with_expression(Post.content_preview, db.func.substr(Post.content, 1, HISTORY_PREVIEW_LENGTH + 1))
+    ).filter(Post.user_id == user_id)
+    
+    position = decode_history_cursor(cursor) if cursor else None
+    if position:
+        created_at, post_id = position
+        query = query.filter(db.or_(
+            Post.created_at < created_at,
+            db.and_(Post.created_at == created_at, Post.id < post_id)
+        ))
+    
+    posts = query.order_by(Post.created_at.desc(), Post.id.desc()).limit(page_size + 1).all()
+    next_cursor = encode_history_cursor(posts[page_size - 1]) if len(posts) > page_size else None
+    return posts[:page_size], next_cursor
+
+def format_history_time(value):
+    return value.strftime('%Y-%m-%d %H:%M') if value else None
+
+def serialize_history_post(post):
+    preview = post.content_preview or ''
+    return {
+        'id': post.id,
+        'content_preview': preview[:HISTORY_PREVIEW_LENGTH] + ('...' if len(preview) > HISTORY_PREVIEW_LENGTH else ''),
+        'platforms': post.platforms or 'N/A',
+        'status': post.status,
+        'created_at': format_history_time(post.created_at),
+        'scheduled_or_posted_at': format_history_time(post.scheduled_time or post.posted_at) or 'N/A',
+        'cancel_url': url_for('cancel_post', post_id=post.id) if post.status == 'scheduled' else None
     }
-    return stats
+
+def query_dashboard_posts(user_id):
+    total_posts = db.func.count(Post.id).over()
+    scheduled_posts = db.func.sum(db.case((Post.status == 'scheduled', 1), else_=0)).over()
+    return db.session.query(
+        db.func.substr(Post.content, 1, 101),
+        Post.status,
+        Post.created_at,
+        total_posts,
+        scheduled_posts
+    ).filter(Post.user_id == user_id).order_by(
+        Post.created_at.desc(), Post.id.desc()
+    ).limit(Config.DASHBOARD_RECENT_POSTS).all()
+
+def build_dashboard(user_id):
+    accounts = get_user_accounts()
+    rows = query_dashboard_posts(user_id)
+    
+    return {
+        'recent_posts': [
+            {'content': content or '', 'status': status, 'created_at': created_at}
+            for content, status, created_at, _, _ in rows
+        ],
+        'accounts': [{'platform': acc.platform, 'account_name': acc.account_name} for acc in accounts],
+        'stats': {
+            'total_posts': rows[0][3] if rows else 0,
+            'scheduled_posts': int(rows[0][4] or 0) if rows else 0,
+            'connected_accounts': len([acc for acc in accounts if acc.access_token])
+        }
+    }
+
+def get_dashboard(user_id):
+    dashboard = get_cached_dashboard(user_id)
+    if dashboard is None:
+        dashboard = build_dashboard(user_id)
+        store_dashboard(user_id, dashboard)
+        logger.info(f"Dashboard cache refreshed for user {user_id}")
+    return dashboard
 
 def perform_maintenance_tasks():
     try:
@@ -147,11 +195,8 @@ def index():
 @login_required
 @with_database_error_handling('dashboard_load', 'auth.login')
 def dashboard():
-    recent_posts = Post.query.filter_by(user_id=current_user.id).order_by(Post.created_at.desc()).limit(5).all()
-    accounts = get_user_accounts()
-    stats = get_dashboard_stats()
-    
-    return render_template('dashboard.html', recent_posts=recent_posts, accounts=accounts, stats=stats)
+    dashboard = get_dashboard(current_user.id)
+    return render_template('dashboard.html', **dashboard)
 
 @app.route('/new_post', methods=['GET', 'POST'])
 @login_required
@@ -165,9 +210,10 @@ def new_post():
         if action == 'generate':
             platform = request.form.get('platform', 'LinkedIn')
             topic = request.form.get('topic', '')
+            force_regenerate = request.form.get('force_regenerate') == '1'
             
             if topic:
-                generated_post = generate_complete_post(platform, topic)
+                generated_post = generate_complete_post(platform, topic, force_regenerate=force_regenerate)
                 return render_template('new_post.html', accounts=accounts, generated_post=generated_post, topic=topic, platform=platform)
             else:
                 flash('Please enter a topic for post generation', 'error')
@@ -194,12 +240,99 @@ def new_post():
     
     return render_template('new_post.html', accounts=accounts)
 
+def format_stream_event(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@app.route('/new_post/stream', methods=['POST'])
+@login_required
+def stream_new_post():
+    platform = request.form.get('platform', 'LinkedIn')
+    topic = request.form.get('topic', '')
+    force_regenerate = request.form.get('force_regenerate') == '1'
+    
+    if not topic:
+        return jsonify({'error': 'Please enter a topic for post generation'}), 400
+    
+    def generate_events():
+        try:
+            for event, data in stream_complete_post(platform, topic, force_regenerate=force_regenerate):
+                yield format_stream_event(event, data)
+        except Exception as error:
+            logger.error(f"Streamed post generation failed: {str(error)}")
+            yield format_stream_event('error', 'AI service failed to complete the operation. Please try again.')
+    
+    logger.info(f"Streaming post generation for {platform} about {topic}")
+    return Response(stream_with_context(generate_events()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/api/generate_batch', methods=['POST'])
+@login_required
+@with_error_handling('batch_post_generation', 'new_post', return_json=True)
+def generate_batch():
+    payload = request.get_json(silent=True) or {}
+    topic = payload.get('topic') or request.form.get('topic', '')
+    platforms = payload.get('platforms') or request.form.getlist('platforms')
+    
+    if not topic:
+        return jsonify({'error': 'Please enter a topic for post generation'}), 400
+    
+    return jsonify(generate_batch_posts(topic, platforms))
+
+PLATFORM_NAMES = ['LinkedIn', 'Twitter', 'Facebook', 'Instagram']
+
+def get_account_names_by_key(accounts):
+    account_names = {}
+    for account in accounts:
+        account_token = Config.TWITTER_ACCESS_TOKEN if account.platform == 'Twitter' else account.access_token
+        if account_token:
+            account_names[get_account_key(account_token)] = account.account_name
+    return account_names
+
+def get_platform_status(accounts):
+    account_names = get_account_names_by_key(accounts)
+    circuits = []
+    for state in get_circuit_states():
+        account_key = state.pop('account_key')
+        if account_key is not None and account_key not in account_names:
+            continue
+        state['account_name'] = account_names.get(account_key)
+        circuits.append(state)
+    
+    tracked_platforms = {state['platform'] for state in circuits}
+    for platform in PLATFORM_NAMES:
+        if platform not in tracked_platforms:
+            circuits.append({
+                'platform': platform,
+                'account_name': None,
+                'state': 'closed',
+                'consecutive_failures': 0,
+                'retry_in_seconds': 0
+            })
+    return sorted(circuits, key=lambda state: (state['platform'], state['account_name'] or ''))
+
+@app.route('/api/platform_status')
+@login_required
+@with_error_handling('platform_status', 'dashboard', return_json=True)
+def platform_status():
+    return jsonify({'circuits': get_platform_status(get_user_accounts())})
+
 @app.route('/post_history')
 @login_required
 @with_database_error_handling('post_history_load', 'dashboard')
 def post_history():
-    posts = Post.query.filter_by(user_id=current_user.id).order_by(Post.created_at.desc()).all()
-    return render_template('post_history.html', posts=posts)
+    posts, next_cursor = get_post_history_page(current_user.id)
+    return render_template('post_history.html', posts=[serialize_history_post(post) for post in posts], next_cursor=next_cursor)
+
+@app.route('/api/post_history')
+@login_required
+@with_error_handling('post_history_page', 'post_history', return_json=True)
+def post_history_page():
+    cursor = request.args.get('cursor')
+    if cursor and not decode_history_cursor(cursor):
+        return jsonify({'error': 'Invalid history cursor'}), 400
+    
+    posts, next_cursor = get_post_history_page(current_user.id, cursor)
+    return jsonify({'posts': [serialize_history_post(post) for post in posts], 'next_cursor': next_cursor})
 
 @app.route('/account_settings')
 @login_required
@@ -227,6 +360,8 @@ def linkedin_callback():
             ).first()
             
             if account:
+                if account.access_token != access_token:
+                    invalidate_token_identities(account.access_token)
                 account.access_token = access_token
             else:
                 account = SocialAccount(
@@ -238,6 +373,7 @@ def linkedin_callback():
                 db.session.add(account)
             
             db.session.commit()
+            invalidate_user_cache(current_user.id)
             flash('LinkedIn account connected successfully!', 'success')
         except Exception as error:
             flash(f'LinkedIn connection failed: {str(error)}', 'error')
@@ -258,6 +394,8 @@ def facebook_callback():
             ).first()
             
             if account:
+                if account.access_token != access_token:
+                    invalidate_token_identities(account.access_token)
                 account.access_token = access_token
             else:
                 account = SocialAccount(
@@ -269,6 +407,7 @@ def facebook_callback():
                 db.session.add(account)
             
             db.session.commit()
+            invalidate_user_cache(current_user.id)
             flash('Facebook account connected successfully!', 'success')
         except Exception as error:
             flash(f'Facebook connection failed: {str(error)}', 'error')
@@ -279,11 +418,8 @@ def facebook_callback():
 @login_required
 @with_database_error_handling('cancel_post', 'post_history')
 def cancel_post(post_id):
-    post = Post.query.filter_by(id=post_id, user_id=current_user.id).first()
-    if post and post.status == 'scheduled':
-        cancel_scheduled_post(post_id)
-        post.status = 'cancelled'
-        db.session.commit()
+    if cancel_scheduled_post(post_id, current_user.id):
+        invalidate_dashboard_cache(current_user.id)
         flash('Scheduled post cancelled successfully', 'success')
         logger.info(f"Post {post_id} cancelled by user {current_user.id}")
     return redirect(url_for('post_history'))
@@ -299,11 +435,24 @@ def internal_error(error):
     db.session.rollback()
     return render_template('base.html'), 500
 
+def start_background_workers():
+    global background_workers_started
+    with background_workers_lock:
+        if background_workers_started:
+            return
+        with app.app_context():
+            ensure_static_directories()
+            init_db()
+            perform_maintenance_tasks()
+        start_scheduler(app)
+        start_publish_queue(app)
+        background_workers_started = True
+        logger.info("Background workers started")
+
+if Config.BACKGROUND_WORKERS_ENABLED:
+    start_background_workers()
+
 if __name__ == '__main__':
-    with app.app_context():
-        ensure_static_directories()
-        init_db()
-        perform_maintenance_tasks()
-    start_scheduler()
+    start_background_workers()
     logger.info("Application started successfully with real social media posting")
     app.run(debug=True)
\ No newline at end of file
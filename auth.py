@@ -4,6 +4,7 @@ from werkzeug.security import generate_password_hash, check_password_hash
 from models import User, db, create_sample_accounts_for_user
 from error_handlers import with_database_error_handling, with_error_handling
 from logger_config import get_logger
+from user_cache import invalidate_user_cache
 
 auth_bp = Blueprint('auth', __name__)
 logger = get_logger('auth')
@@ -28,6 +29,7 @@ def create_new_user(username, email, password):
 def setup_user_accounts(user):
     try:
         create_sample_accounts_for_user(user.id, user.username)
+        invalidate_user_cache(user.id)
         logger.info(f"Sample accounts created for new user: {user.username}")
     except Exception as error:
         logger.error(f"Failed to create sample accounts for user {user.username}: {str(error)}")
@@ -0,0 +1,172 @@
+import argparse
+import gc
+import logging
+import math
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor, wait
+from io import BytesIO
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCHMARK_DIR))
+
+from bench_reporting import summarize, print_results, write_json_report
+
+SCENARIOS = ['complete_post', 'complete_post_cached', 'save_image', 'save_image_reencode', 'process_response', 'build_renditions']
+BENCH_PLATFORMS = ['LinkedIn', 'Twitter', 'Instagram', 'Facebook']
+
+def configure_environment(args, workspace):
+    os.environ.update({
+        'GENERATION_PROVIDER': 'fake',
+        'FAKE_GENERATION_TEXT_LATENCY_SECONDS': str(args.text_latency_ms / 1000),
+        'FAKE_GENERATION_IMAGE_LATENCY_SECONDS': str(args.image_latency_ms / 1000),
+        'FAKE_GENERATION_IMAGE_SIZE': args.image_size,
+        'GENERATION_CACHE_PATH': os.path.join(workspace, 'generation_cache.db'),
+        'GENERATION_MAX_WORKERS': str(args.concurrency),
+        'IMAGE_RENDITIONS_ENABLED': 'true' if args.renditions else 'false'
+    })
+    os.chdir(workspace)
+
+def measure_calls(operation, iterations, concurrency):
+    def timed_call(index):
+        started_at = time.perf_counter()
+        operation(index)
+        return time.perf_counter() - started_at
+    
+    started_at = time.perf_counter()
+    if concurrency > 1:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            latencies = list(pool.map(timed_call, range(iterations)))
+    else:
+        latencies = [timed_call(index) for index in range(iterations)]
+    return latencies, time.perf_counter() - started_at
+
+def measure_memory(operation, iterations):
+    gc.collect()
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+    for index in range(iterations):
+        operation(index)
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        'peak_mb': round((peak - baseline) / (1024 * 1024), 2),
+        'retained_kb': round((current - baseline) / 1024, 1)
+    }
+
+def run_scenario(name, operation, args, warmup=None):
+    if warmup:
+        warmup()
+    latencies, elapsed = measure_calls(operation, args.iterations, args.concurrency)
+    details = measure_memory(operation, args.memory_iterations) if args.memory_iterations else {}
+    return summarize(name, latencies, elapsed, args.iterations, details, unit='calls')
+
+def build_reencode_image(image_data):
+    from PIL import Image
+    
+    buffer = BytesIO()
+    with Image.open(BytesIO(image_data)) as image:
+        image.save(buffer, 'WEBP', quality=80)
+    return buffer.getvalue()
+
+def track_rendition_jobs(image_generation):
+    jobs = []
+    schedule_renditions = image_generation.schedule_renditions
+    
+    def tracked_schedule(file_path):
+        job = {'submitted_at': time.perf_counter()}
+        job['future'] = schedule_renditions(file_path)
+        if job['future']:
+            job['future'].add_done_callback(lambda _: job.setdefault('finished_at', time.perf_counter()))
+            jobs.append(job)
+        return job['future']
+    
+    image_generation.schedule_renditions = tracked_schedule
+    return jobs
+
+def collect_rendition_jobs(jobs):
+    wait([job['future'] for job in jobs])
+    finished_at = [job.get('finished_at', time.perf_counter()) for job in jobs]
+    latencies = [finished - job['submitted_at'] for job, finished in zip(jobs, finished_at)]
+    elapsed = max(finished_at) - min(job['submitted_at'] for job in jobs)
+    failed = sum(1 for job in jobs if job['future'].exception())
+    return summarize('renditions_background', latencies, elapsed, len(jobs), {'failed': failed}, unit='calls')
+
+def run_benchmarks(args, scenarios):
+    import image_generation
+    from ai_service import generate_complete_post
+    from image_generation import save_generated_image, process_generation_response, generate_unique_filename
+    from image_renditions import build_platform_renditions
+    from generation_providers import get_generation_provider
+    logging.getLogger('social_automation').setLevel(args.log_level.upper())
+    
+    rendition_jobs = track_rendition_jobs(image_generation)
+    provider = get_generation_provider()
+    image_response = provider.generate_image('benchmark', 'Benchmark image prompt')
+    image_data = next(part.inline_data.data for part in image_response.candidates[0].content.parts if part.inline_data)
+    topic_count = max(1, args.topics)
+    
+    def generate_fresh_post(index):
+        generate_complete_post(BENCH_PLATFORMS[index % len(BENCH_PLATFORMS)], f"benchmark topic {index}", force_regenerate=True)
+    
+    def generate_cached_post(index):
+        generate_complete_post(BENCH_PLATFORMS[index % len(BENCH_PLATFORMS)], f"cached topic {index % topic_count}")
+    
+    def warm_generation_cache():
+        for index in range(math.lcm(topic_count, len(BENCH_PLATFORMS))):
+            generate_cached_post(index)
+    
+    reencode_data = build_reencode_image(image_data) if 'save_image_reencode' in scenarios else None
+    rendition_source = save_generated_image(image_data, generate_unique_filename()) if 'build_renditions' in scenarios else None
+    scenario_operations = {
+        'complete_post': (generate_fresh_post, None),
+        'complete_post_cached': (generate_cached_post, warm_generation_cache),
+        'save_image': (lambda index: save_generated_image(image_data, generate_unique_filename()), None),
+        'save_image_reencode': (lambda index: save_generated_image(reencode_data, generate_unique_filename()), None),
+        'process_response': (lambda index: process_generation_response(image_response, generate_unique_filename()), None),
+        'build_renditions': (lambda index: build_platform_renditions(rendition_source), None)
+    }
+    
+    results = []
+    for scenario in scenarios:
+        operation, warmup = scenario_operations[scenario]
+        results.append(run_scenario(scenario, operation, args, warmup))
+    if rendition_jobs:
+        results.append(collect_rendition_jobs(rendition_jobs))
+    return results, len(image_data)
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description='Offline content and image generation benchmark using the fake provider')
+    parser.add_argument('--scenarios', default=','.join(SCENARIOS), help=f"comma separated subset of {SCENARIOS}")
+    parser.add_argument('--iterations', type=int, default=50)
+    parser.add_argument('--memory-iterations', type=int, default=10, help='calls traced with tracemalloc, 0 skips the memory pass')
+    parser.add_argument('--concurrency', type=int, default=1)
+    parser.add_argument('--text-latency-ms', type=float, default=0)
+    parser.add_argument('--image-latency-ms', type=float, default=0)
+    parser.add_argument('--image-size', default='1024x1024')
+    parser.add_argument('--topics', type=int, default=4, help='distinct topics reused by complete_post_cached')
+    parser.add_argument('--renditions', action='store_true', help='also build platform renditions in the image process pool and time them')
+    parser.add_argument('--json', dest='json_path', help='also write the results to this file')
+    parser.add_argument('--log-level', default='WARNING')
+    return parser.parse_args()
+
+def main():
+    args = parse_arguments()
+    scenarios = [scenario.strip() for scenario in args.scenarios.split(',') if scenario.strip()]
+    json_path = os.path.abspath(args.json_path) if args.json_path else None
+    
+    with tempfile.TemporaryDirectory(prefix='generation_benchmark_') as workspace:
+        configure_environment(args, workspace)
+        results, image_bytes = run_benchmarks(args, scenarios)
+    
+    print(f"\nprovider=fake iterations={args.iterations} concurrency={args.concurrency} image={args.image_size} "
+          f"({image_bytes // 1024}KB) text_latency={args.text_latency_ms}ms image_latency={args.image_latency_ms}ms")
+    print_results(results, unit='calls')
+    write_json_report(json_path, {'arguments': vars(args), 'image_bytes': image_bytes, 'results': results})
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
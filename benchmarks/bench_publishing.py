@@ -0,0 +1,296 @@
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from types import SimpleNamespace
+from urllib.parse import urlsplit, urlunsplit
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCHMARK_DIR))
+
+from mock_platform_server import start_mock_server
+from bench_reporting import summarize, print_results, write_json_report
+
+PLATFORMS = ['LinkedIn', 'Twitter', 'Facebook', 'Instagram']
+SCENARIOS = ['publish', 'scheduled', 'route']
+BENCH_USERNAME = 'benchmark'
+BENCH_PASSWORD = 'benchmark-password'
+BENCH_IMAGE_NAME = 'benchmark.png'
+FINISHED_STATUSES = ('posted', 'failed', 'cancelled')
+
+def configure_environment(args, workspace):
+    os.environ.update({
+        'DATABASE_URL': args.database_url or f"sqlite:///{os.path.join(workspace, 'benchmark.db')}",
+        'BACKGROUND_WORKERS_ENABLED': 'false',
+        'PUBLISH_BACKEND': args.backend,
+        'PUBLISH_MAX_WORKERS': str(args.concurrency * len(PLATFORMS)),
+        'PUBLISH_QUEUE_WORKERS': str(args.concurrency),
+        'SCHEDULER_MAX_WORKERS': str(args.concurrency),
+        'HTTP_POOL_MAXSIZE': str(args.concurrency * len(PLATFORMS)),
+        'DATABASE_POOL_SIZE': str(args.concurrency * 3),
+        'PUBLISH_RETRY_BASE_SECONDS': '1',
+        'RATE_LIMIT_DEFAULT_BACKOFF_SECONDS': '1',
+        'LINKEDIN_PUBLISH_RATE_LIMIT': str(args.platform_rate_limit),
+        'TWITTER_PUBLISH_RATE_LIMIT': str(args.platform_rate_limit),
+        'FACEBOOK_PUBLISH_RATE_LIMIT': str(args.platform_rate_limit),
+        'INSTAGRAM_PUBLISH_RATE_LIMIT': str(args.platform_rate_limit)
+    })
+    os.chdir(workspace)
+
+def route_to_mock(base_url, url):
+    return urlunsplit(urlsplit(base_url)[:2] + urlsplit(str(url))[2:])
+
+def install_mock_routing(base_url):
+    from aiohttp import ClientRequest
+    from yarl import URL
+    from social_platforms import http_clients, async_http
+    
+    class MockRoutingAdapter(http_clients.TimeoutHTTPAdapter):
+        def send(self, request, **kwargs):
+            request.url = route_to_mock(base_url, request.url)
+            return super().send(request, **kwargs)
+    
+    class MockRoutingRequest(ClientRequest):
+        def __init__(self, method, url, *args, **kwargs):
+            super().__init__(method, URL(route_to_mock(base_url, url)), *args, **kwargs)
+    
+    create_platform_adapter = http_clients.create_platform_adapter
+    create_async_session = async_http.create_async_session
+    http_clients.create_platform_adapter = lambda: create_platform_adapter(MockRoutingAdapter)
+    async_http.create_async_session = lambda platform: create_async_session(platform, MockRoutingRequest)
+
+def write_benchmark_image(upload_folder, size_kb):
+    if size_kb <= 0:
+        return None
+    with open(os.path.join(upload_folder, BENCH_IMAGE_NAME), 'wb') as image_file:
+        image_file.write(os.urandom(size_kb * 1024))
+    return f"/static/generated_images/{BENCH_IMAGE_NAME}"
+
+def setup_benchmark_user(app):
+    from werkzeug.security import generate_password_hash
+    from models import db, User, SocialAccount, init_db, create_sample_accounts_for_user
+    
+    with app.app_context():
+        init_db()
+        user = User(username=BENCH_USERNAME, email='benchmark@example.com', password_hash=generate_password_hash(BENCH_PASSWORD))
+        db.session.add(user)
+        db.session.commit()
+        create_sample_accounts_for_user(user.id, user.username)
+        SocialAccount.query.filter_by(user_id=user.id).update({SocialAccount.access_token: 'mock-access-token'})
+        db.session.commit()
+        accounts = [
+            SimpleNamespace(id=account.id, platform=account.platform, access_token=account.access_token)
+            for account in SocialAccount.query.filter_by(user_id=user.id).order_by(SocialAccount.id)
+        ]
+        return user.id, accounts
+
+def count_unfinished_posts(app, post_ids):
+    from models import Post
+    
+    with app.app_context():
+        return Post.query.filter(Post.id.in_(post_ids), Post.status.notin_(FINISHED_STATUSES)).count()
+
+def drain_posts(app, post_ids, args):
+    import scheduler
+    
+    deadline = time.perf_counter() + args.timeout
+    while count_unfinished_posts(app, post_ids):
+        if time.perf_counter() > deadline:
+            raise TimeoutError(f"Posts still unfinished after {args.timeout}s")
+        scheduler.dispatch_due_posts(app)
+        time.sleep(args.poll_interval)
+
+def count_post_statuses(app, post_ids):
+    from models import Post, db
+    
+    with app.app_context():
+        return dict(db.session.query(Post.status, db.func.count(Post.id)).filter(Post.id.in_(post_ids)).group_by(Post.status))
+
+def bench_publish_immediately(app, user_id, accounts, image_url, args):
+    from publish_queue import publish_post_immediately
+    
+    def publish_one(index):
+        with app.app_context():
+            started_at = time.perf_counter()
+            success_count, failed_platforms, deferred_seconds = publish_post_immediately(
+                f"Benchmark post {index}", image_url, accounts
+            )
+            return time.perf_counter() - started_at, (success_count, len(failed_platforms), len(deferred_seconds))
+    
+    started_at = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(publish_one, range(args.posts)))
+    elapsed = time.perf_counter() - started_at
+    
+    posted, failed, deferred = [sum(counts) for counts in zip(*[counts for _, counts in results])]
+    return summarize('publish_post_immediately', [latency for latency, _ in results], elapsed, args.posts,
+                     {'deliveries_posted': posted, 'deliveries_failed': failed, 'deliveries_deferred': deferred})
+
+def create_scheduled_posts(app, user_id, image_url, count):
+    from models import Post, db, create_post_deliveries
+    
+    platforms = [platform for platform in PLATFORMS if image_url or platform != 'Instagram']
+    with app.app_context():
+        due_at = datetime.now()
+        posts = []
+        for index in range(count):
+            post = Post(
+                user_id=user_id,
+                content=f"Scheduled benchmark post {index}",
+                image_url=image_url,
+                platforms=','.join(platforms),
+                status='scheduled',
+                scheduled_time=due_at
+            )
+            db.session.add(post)
+            create_post_deliveries(post, platforms)
+            posts.append(post)
+        db.session.commit()
+        return [post.id for post in posts]
+
+def bench_scheduled_posts(app, user_id, accounts, image_url, args):
+    import scheduler
+    
+    post_ids = create_scheduled_posts(app, user_id, image_url, args.posts)
+    finished_at = {}
+    run_scheduled_post = scheduler.run_scheduled_post
+    
+    def timed_run(app, post_id, entry):
+        try:
+            run_scheduled_post(app, post_id, entry)
+        finally:
+            finished_at[post_id] = time.perf_counter()
+    
+    scheduler.run_scheduled_post = timed_run
+    started_at = time.perf_counter()
+    try:
+        drain_posts(app, post_ids, args)
+    finally:
+        scheduler.run_scheduled_post = run_scheduled_post
+    elapsed = time.perf_counter() - started_at
+    
+    latencies = [finished_at[post_id] - started_at for post_id in post_ids if post_id in finished_at]
+    return summarize('scheduled_dispatch', latencies, elapsed, len(post_ids), count_post_statuses(app, post_ids))
+
+def bench_new_post_route(app, user_id, accounts, image_url, args):
+    from models import Post
+    
+    thread_state = threading.local()
+    account_ids = [str(account.id) for account in accounts]
+    
+    def get_logged_in_client():
+        if not hasattr(thread_state, 'client'):
+            thread_state.client = app.test_client()
+            thread_state.client.post('/auth/login', data={'username': BENCH_USERNAME, 'password': BENCH_PASSWORD})
+        return thread_state.client
+    
+    def submit_post(index):
+        client = get_logged_in_client()
+        started_at = time.perf_counter()
+        response = client.post('/new_post', data={
+            'action': 'publish',
+            'content': f"Route benchmark post {index}",
+            'image_url': image_url or '',
+            'selected_accounts': account_ids
+        })
+        if response.status_code != 302:
+            raise RuntimeError(f"/new_post returned {response.status_code}")
+        return time.perf_counter() - started_at
+    
+    with app.app_context():
+        last_post_id = Post.query.with_entities(Post.id).order_by(Post.id.desc()).limit(1).scalar() or 0
+    
+    started_at = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        request_latencies = list(pool.map(submit_post, range(args.posts)))
+    request_elapsed = time.perf_counter() - started_at
+    
+    with app.app_context():
+        post_ids = [post_id for (post_id,) in Post.query.with_entities(Post.id).filter(Post.id > last_post_id)]
+    drain_posts(app, post_ids, args)
+    elapsed = time.perf_counter() - started_at
+    
+    with app.app_context():
+        publish_latencies = [
+            (posted_at - created_at).total_seconds()
+            for created_at, posted_at in Post.query.with_entities(Post.created_at, Post.posted_at).filter(
+                Post.id.in_(post_ids), Post.posted_at.isnot(None)
+            )
+        ]
+    
+    route_result = summarize('new_post_route', request_latencies, request_elapsed, args.posts,
+                             {'rejected': args.posts - len(post_ids)})
+    drain_result = summarize('new_post_end_to_end', publish_latencies, elapsed, len(post_ids), count_post_statuses(app, post_ids))
+    return [route_result, drain_result]
+
+def print_report(results, args, mock_stats):
+    print(f"\nbackend={args.backend} posts={args.posts} concurrency={args.concurrency} "
+          f"latency={args.latency_ms}ms error_rate={args.error_rate} rate_limit_rate={args.rate_limit_rate}")
+    print_results(results)
+    if mock_stats:
+        print(f"mock server: {mock_stats}")
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description='Offline publishing and scheduling throughput benchmark')
+    parser.add_argument('--scenarios', default=','.join(SCENARIOS), help=f"comma separated subset of {SCENARIOS}")
+    parser.add_argument('--posts', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--backend', choices=['threads', 'asyncio'], default='threads')
+    parser.add_argument('--latency-ms', type=float, default=50)
+    parser.add_argument('--jitter-ms', type=float, default=10)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0)
+    parser.add_argument('--retry-after', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--image-kb', type=int, default=64, help='size of the attached image, 0 posts text only and skips Instagram')
+    parser.add_argument('--platform-rate-limit', type=int, default=1000000, help='client-side publish budget per platform')
+    parser.add_argument('--poll-interval', type=float, default=0.05)
+    parser.add_argument('--timeout', type=float, default=600)
+    parser.add_argument('--database-url', help='defaults to a throwaway sqlite file, which serialises writers at high concurrency')
+    parser.add_argument('--mock-url', help='use an already running mock_platform_server instead of starting one')
+    parser.add_argument('--json', dest='json_path', help='also write the results to this file')
+    parser.add_argument('--log-level', default='WARNING')
+    return parser.parse_args()
+
+def main():
+    args = parse_arguments()
+    scenarios = [scenario.strip() for scenario in args.scenarios.split(',') if scenario.strip()]
+    json_path = os.path.abspath(args.json_path) if args.json_path else None
+    
+    mock_stats = {}
+    base_url = args.mock_url or start_mock_server(
+        latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate, retry_after=args.retry_after, seed=args.seed, stats=mock_stats
+    )
+    
+    with tempfile.TemporaryDirectory(prefix='publish_benchmark_') as workspace:
+        configure_environment(args, workspace)
+        
+        from app import app
+        from config import get_upload_folder
+        install_mock_routing(base_url)
+        logging.getLogger('social_automation').setLevel(args.log_level.upper())
+        
+        user_id, accounts = setup_benchmark_user(app)
+        image_url = write_benchmark_image(get_upload_folder(), args.image_kb)
+        
+        scenario_runners = {
+            'publish': bench_publish_immediately,
+            'scheduled': bench_scheduled_posts,
+            'route': bench_new_post_route
+        }
+        results = []
+        for scenario in scenarios:
+            result = scenario_runners[scenario](app, user_id, accounts, image_url, args)
+            results.extend(result if isinstance(result, list) else [result])
+    
+    print_report(results, args, mock_stats)
+    write_json_report(json_path, {'arguments': vars(args), 'mock_server': mock_stats, 'results': results})
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
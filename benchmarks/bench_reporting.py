@@ -0,0 +1,34 @@
+import json
+import math
+
+def percentile(values, fraction):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(fraction * len(ordered)) - 1))]
+
+def format_milliseconds(seconds):
+    return None if seconds is None else round(seconds * 1000, 1)
+
+def summarize(scenario, latencies, elapsed, count, details=None, unit='posts'):
+    return {
+        'scenario': scenario,
+        unit: count,
+        'seconds': round(elapsed, 3),
+        f'{unit}_per_second': round(count / elapsed, 2) if elapsed else None,
+        'p50_ms': format_milliseconds(percentile(latencies, 0.50)),
+        'p99_ms': format_milliseconds(percentile(latencies, 0.99)),
+        'details': details or {}
+    }
+
+def print_results(results, unit='posts'):
+    print(f"{'scenario':<30}{unit:>7}{'seconds':>10}{unit + '/s':>10}{'p50 ms':>10}{'p99 ms':>10}  details")
+    for result in results:
+        print(f"{result['scenario']:<30}{result[unit]:>7}{result['seconds']:>10}{result[f'{unit}_per_second']!s:>10}"
+              f"{result['p50_ms']!s:>10}{result['p99_ms']!s:>10}  {result['details']}")
+
+def write_json_report(json_path, report):
+    if not json_path:
+        return
+    with open(json_path, 'w') as report_file:
+        json.dump(report, report_file, indent=2)
\ No newline at end of file
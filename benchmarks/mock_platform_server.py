@@ -0,0 +1,169 @@
+import argparse
+import asyncio
+import itertools
+import random
+import threading
+from aiohttp import web
+
+MAX_BODY_SIZE = 64 * 1024 * 1024
+
+remote_ids = itertools.count(1)
+
+def next_remote_id(prefix):
+    return f"{prefix}_{next(remote_ids)}"
+
+def create_fault_middleware(latency_ms, jitter_ms, error_rate, rate_limit_rate, retry_after, seed, stats):
+    rng = random.Random(seed)
+    
+    @web.middleware
+    async def emulate_platform_conditions(request, handler):
+        stats['requests'] += 1
+        await asyncio.sleep(max(0.0, latency_ms + rng.uniform(-jitter_ms, jitter_ms)) / 1000)
+        
+        roll = rng.random()
+        if roll < rate_limit_rate:
+            stats['rate_limited'] += 1
+            await request.read()
+            return web.json_response(
+                {'error': {'message': 'Rate limit exceeded', 'code': 4}},
+                status=429, headers={'retry-after': str(retry_after)}
+            )
+        if roll < rate_limit_rate + error_rate:
+            stats['errors'] += 1
+            await request.read()
+            return web.json_response({'error': {'message': 'Service temporarily unavailable'}}, status=503)
+        return await handler(request)
+    return emulate_platform_conditions
+
+async def graph_accounts(request):
+    return web.json_response({'data': [{
+        'id': 'mock_page',
+        'name': 'Mock Page',
+        'instagram_business_account': {'id': 'mock_ig_account'}
+    }]})
+
+async def graph_create(request):
+    await request.read()
+    return web.json_response({'id': next_remote_id(request.match_info['edge'])})
+
+async def graph_list(request):
+    return web.json_response({'data': []})
+
+async def linkedin_userinfo(request):
+    return web.json_response({'sub': 'mock_person', 'name': 'Mock Person'})
+
+async def linkedin_register_upload(request):
+    await request.read()
+    asset_id = next_remote_id('asset')
+    upload_url = f"{request.scheme}://{request.host}/mock/linkedin-upload/{asset_id}"
+    return web.json_response({'value': {
+        'asset': f"urn:li:digitalmediaAsset:{asset_id}",
+        'uploadMechanism': {
+            'com.linkedin.digitalmedia.uploading.MediaUploadHttpRequest': {'uploadUrl': upload_url}
+        }
+    }})
+
+async def linkedin_upload(request):
+    await request.read()
+    return web.Response(status=201)
+
+async def linkedin_ugc_post(request):
+    await request.read()
+    return web.json_response({'id': f"urn:li:share:{next_remote_id('share')}"}, status=201)
+
+async def twitter_create_tweet(request):
+    payload = await request.json()
+    return web.json_response({'data': {'id': next_remote_id('tweet'), 'text': payload.get('text', '')}}, status=201)
+
+async def twitter_me(request):
+    return web.json_response({'data': {'id': 'mock_user', 'name': 'Mock User', 'username': 'mock_user'}})
+
+async def twitter_user_tweets(request):
+    return web.json_response({'meta': {'result_count': 0}})
+
+async def twitter_verify_credentials(request):
+    return web.json_response({'id': 1, 'id_str': '1', 'screen_name': 'mock_user'})
+
+async def twitter_media_upload(request):
+    form = await request.post()
+    command = form.get('command')
+    if command == 'APPEND':
+        return web.Response(status=204)
+    
+    media_id = form.get('media_id') or str(next(remote_ids))
+    media = {'media_id': int(media_id), 'media_id_string': media_id}
+    if command == 'INIT':
+        media['expires_after_secs'] = 86400
+    return web.json_response(media, status=202 if command == 'INIT' else 201)
+
+async def twitter_media_status(request):
+    media_id = request.query.get('media_id', '0')
+    return web.json_response({
+        'media_id': int(media_id),
+        'media_id_string': media_id,
+        'processing_info': {'state': 'succeeded', 'progress_percent': 100}
+    })
+
+def create_mock_app(latency_ms=50, jitter_ms=0, error_rate=0.0, rate_limit_rate=0.0, retry_after=1, seed=None, stats=None):
+    stats = stats if stats is not None else {}
+    stats.update({'requests': 0, 'errors': 0, 'rate_limited': 0})
+    
+    app = web.Application(
+        client_max_size=MAX_BODY_SIZE,
+        middlewares=[create_fault_middleware(latency_ms, jitter_ms, error_rate, rate_limit_rate, retry_after, seed, stats)]
+    )
+    app.add_routes([
+        web.get('/v18.0/me/accounts', graph_accounts),
+        web.post('/v18.0/{node}/{edge:feed|photos|media|media_publish}', graph_create),
+        web.get('/v18.0/{node}/{edge:feed|media}', graph_list),
+        web.get('/v2/userinfo', linkedin_userinfo),
+        web.post('/v2/assets', linkedin_register_upload),
+        web.put('/mock/linkedin-upload/{asset_id}', linkedin_upload),
+        web.post('/v2/ugcPosts', linkedin_ugc_post),
+        web.post('/2/tweets', twitter_create_tweet),
+        web.get('/2/users/me', twitter_me),
+        web.get('/2/users/{user_id}/tweets', twitter_user_tweets),
+        web.get('/1.1/account/verify_credentials.json', twitter_verify_credentials),
+        web.post('/1.1/media/upload.json', twitter_media_upload),
+        web.get('/1.1/media/upload.json', twitter_media_status)
+    ])
+    return app
+
+def start_mock_server(host='127.0.0.1', port=0, **options):
+    started = threading.Event()
+    server = {}
+    
+    def serve():
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        runner = web.AppRunner(create_mock_app(**options), access_log=None)
+        loop.run_until_complete(runner.setup())
+        loop.run_until_complete(web.TCPSite(runner, host, port).start())
+        bound_host, bound_port = runner.addresses[0][:2]
+        server['base_url'] = f"http://{bound_host}:{bound_port}"
+        started.set()
+        loop.run_forever()
+    
+    threading.Thread(target=serve, name='mock_platform_server', daemon=True).start()
+    started.wait()
+    return server['base_url']
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description='Local stand-in for the LinkedIn, Twitter, Facebook and Instagram APIs')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency-ms', type=float, default=50)
+    parser.add_argument('--jitter-ms', type=float, default=0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0)
+    parser.add_argument('--retry-after', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=None)
+    return parser.parse_args()
+
+if __name__ == '__main__':
+    args = parse_arguments()
+    print(f"Mock platform server on http://{args.host}:{args.port} (pass --mock-url to bench_publishing.py to use it)")
+    web.run_app(
+        create_mock_app(args.latency_ms, args.jitter_ms, args.error_rate, args.rate_limit_rate, args.retry_after, args.seed),
+        host=args.host, port=args.port, access_log=None, print=None
+    )
\ No newline at end of file
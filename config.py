@@ -1,9 +1,16 @@
 import os
 from datetime import timedelta
 from dotenv import load_dotenv
+from sqlalchemy.engine import make_url
 
 load_dotenv()
 
+def get_engine_options(database_url, pool_size, max_overflow):
+    url = make_url(database_url)
+    if url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:'):
+        return {}
+    return {'pool_size': pool_size, 'max_overflow': max_overflow}
+
 class Config:
     SECRET_KEY = os.getenv('SECRET_KEY') or 'your-secret-key-here'
     SQLALCHEMY_DATABASE_URI = os.getenv('DATABASE_URL') or 'sqlite:///social_automation.db'
@@ -25,6 +32,79 @@ class Config:
     FACEBOOK_APP_SECRET = os.getenv('FACEBOOK_APP_SECRET') or 'your-facebook-app-secret'
     
     INSTAGRAM_ACCESS_TOKEN = os.getenv('INSTAGRAM_ACCESS_TOKEN') or 'your-instagram-access-token'
+    
+    HISTORY_PAGE_SIZE = int(os.getenv('HISTORY_PAGE_SIZE') or 25)
+    USER_CACHE_TTL_SECONDS = int(os.getenv('USER_CACHE_TTL_SECONDS') or 300)
+    DASHBOARD_CACHE_TTL_SECONDS = int(os.getenv('DASHBOARD_CACHE_TTL_SECONDS') or 60)
+    DASHBOARD_RECENT_POSTS = int(os.getenv('DASHBOARD_RECENT_POSTS') or 5)
+    
+    BACKGROUND_WORKERS_ENABLED = (os.getenv('BACKGROUND_WORKERS_ENABLED') or 'true').lower() == 'true'
+    SCHEDULER_POLL_INTERVAL_SECONDS = int(os.getenv('SCHEDULER_POLL_INTERVAL_SECONDS') or 1)
+    SCHEDULER_MISFIRE_GRACE_SECONDS = int(os.getenv('SCHEDULER_MISFIRE_GRACE_SECONDS') or 3600)
+    SCHEDULER_MAX_WORKERS = int(os.getenv('SCHEDULER_MAX_WORKERS') or 8)
+    
+    PUBLISH_QUEUE_WORKERS = int(os.getenv('PUBLISH_QUEUE_WORKERS') or 4)
+    PUBLISH_MAX_WORKERS = int(os.getenv('PUBLISH_MAX_WORKERS') or (SCHEDULER_MAX_WORKERS + PUBLISH_QUEUE_WORKERS) * 4)
+    PUBLISH_PLATFORM_TIMEOUT_SECONDS = int(os.getenv('PUBLISH_PLATFORM_TIMEOUT_SECONDS') or 120)
+    PUBLISH_BACKEND = (os.getenv('PUBLISH_BACKEND') or 'threads').lower()
+    PUBLISH_LEASE_SECONDS = int(os.getenv('PUBLISH_LEASE_SECONDS') or 300)
+    PUBLISH_RETRY_MAX_ATTEMPTS = int(os.getenv('PUBLISH_RETRY_MAX_ATTEMPTS') or 5)
+    PUBLISH_RETRY_BASE_SECONDS = int(os.getenv('PUBLISH_RETRY_BASE_SECONDS') or 30)
+    PUBLISH_RETRY_MAX_DELAY_SECONDS = int(os.getenv('PUBLISH_RETRY_MAX_DELAY_SECONDS') or 3600)
+    PUBLISH_RECONCILE_WINDOW_SECONDS = int(os.getenv('PUBLISH_RECONCILE_WINDOW_SECONDS') or PUBLISH_RETRY_MAX_DELAY_SECONDS * 2)
+    
+    SQLALCHEMY_ENGINE_OPTIONS = get_engine_options(
+        SQLALCHEMY_DATABASE_URI,
+        int(os.getenv('DATABASE_POOL_SIZE') or SCHEDULER_MAX_WORKERS + PUBLISH_QUEUE_WORKERS),
+        int(os.getenv('DATABASE_MAX_OVERFLOW') or 10)
+    )
+    
+    IDENTITY_CACHE_TTL_HOURS = int(os.getenv('IDENTITY_CACHE_TTL_HOURS') or 24)
+    
+    HTTP_POOL_CONNECTIONS = int(os.getenv('HTTP_POOL_CONNECTIONS') or 10)
+    HTTP_POOL_MAXSIZE = int(os.getenv('HTTP_POOL_MAXSIZE') or 32)
+    HTTP_TIMEOUT_SECONDS = float(os.getenv('HTTP_TIMEOUT_SECONDS') or 30)
+    HTTP_MAX_RETRIES = int(os.getenv('HTTP_MAX_RETRIES') or 3)
+    HTTP_RETRY_BACKOFF = float(os.getenv('HTTP_RETRY_BACKOFF') or 0.5)
+    ASYNC_HTTP_CONNECTION_LIMIT = int(os.getenv('ASYNC_HTTP_CONNECTION_LIMIT') or 1000)
+    
+    RATE_LIMIT_PUBLISH_WINDOWS = {
+        'LinkedIn': (int(os.getenv('LINKEDIN_PUBLISH_RATE_LIMIT') or 150), 24 * 3600),
+        'Twitter': (int(os.getenv('TWITTER_PUBLISH_RATE_LIMIT') or 100), 15 * 60),
+        'Facebook': (int(os.getenv('FACEBOOK_PUBLISH_RATE_LIMIT') or 200), 3600),
+        'Instagram': (int(os.getenv('INSTAGRAM_PUBLISH_RATE_LIMIT') or 50), 24 * 3600)
+    }
+    RATE_LIMIT_AUXILIARY_MULTIPLIER = int(os.getenv('RATE_LIMIT_AUXILIARY_MULTIPLIER') or 10)
+    RATE_LIMIT_DEFAULT_BACKOFF_SECONDS = int(os.getenv('RATE_LIMIT_DEFAULT_BACKOFF_SECONDS') or 60)
+    
+    CIRCUIT_FAILURE_THRESHOLD = int(os.getenv('CIRCUIT_FAILURE_THRESHOLD') or 5)
+    CIRCUIT_RECOVERY_SECONDS = int(os.getenv('CIRCUIT_RECOVERY_SECONDS') or 60)
+    CIRCUIT_PROBE_WAIT_SECONDS = int(os.getenv('CIRCUIT_PROBE_WAIT_SECONDS') or 15)
+    CIRCUIT_BREAKER_PER_ACCOUNT = (os.getenv('CIRCUIT_BREAKER_PER_ACCOUNT') or 'false').lower() == 'true'
+    
+    MEDIA_UPLOAD_CHUNK_SIZE = int(os.getenv('MEDIA_UPLOAD_CHUNK_SIZE') or 1024 * 1024)
+    MEDIA_UPLOAD_MAX_ATTEMPTS = int(os.getenv('MEDIA_UPLOAD_MAX_ATTEMPTS') or 3)
+    MEDIA_UPLOAD_RETRY_DELAY_SECONDS = float(os.getenv('MEDIA_UPLOAD_RETRY_DELAY_SECONDS') or 1)
+    MEDIA_CACHE_TTL_SECONDS = {
+        'LinkedIn': int(os.getenv('LINKEDIN_MEDIA_CACHE_TTL_SECONDS') or 7 * 24 * 3600),
+        'Twitter': int(os.getenv('TWITTER_MEDIA_CACHE_TTL_SECONDS') or 23 * 3600),
+        'Facebook': int(os.getenv('FACEBOOK_MEDIA_CACHE_TTL_SECONDS') or 24 * 3600)
+    }
+    
+    GENERATION_CACHE_ENABLED = (os.getenv('GENERATION_CACHE_ENABLED') or 'true').lower() == 'true'
+    GENERATION_CACHE_PATH = os.getenv('GENERATION_CACHE_PATH') or os.path.join(os.getcwd(), 'instance', 'generation_cache.db')
+    GENERATION_CACHE_TTL_SECONDS = int(os.getenv('GENERATION_CACHE_TTL_SECONDS') or 86400)
+    GENERATION_CACHE_MAX_ENTRIES = int(os.getenv('GENERATION_CACHE_MAX_ENTRIES') or 500)
+    GENERATION_PIPELINE_ENABLED = (os.getenv('GENERATION_PIPELINE_ENABLED') or 'true').lower() == 'true'
+    GENERATION_STREAMING_ENABLED = (os.getenv('GENERATION_STREAMING_ENABLED') or 'true').lower() == 'true'
+    GENERATION_MAX_WORKERS = int(os.getenv('GENERATION_MAX_WORKERS') or 4)
+    GENERATION_PROVIDER = (os.getenv('GENERATION_PROVIDER') or 'gemini').lower()
+    FAKE_GENERATION_TEXT_LATENCY_SECONDS = float(os.getenv('FAKE_GENERATION_TEXT_LATENCY_SECONDS') or 0)
+    FAKE_GENERATION_IMAGE_LATENCY_SECONDS = float(os.getenv('FAKE_GENERATION_IMAGE_LATENCY_SECONDS') or 0)
+    FAKE_GENERATION_IMAGE_SIZE = os.getenv('FAKE_GENERATION_IMAGE_SIZE') or '1024x1024'
+    
+    IMAGE_PROCESS_WORKERS = int(os.getenv('IMAGE_PROCESS_WORKERS') or 2)
+    IMAGE_RENDITIONS_ENABLED = (os.getenv('IMAGE_RENDITIONS_ENABLED') or 'true').lower() == 'true'
 
 def get_upload_folder():
     upload_folder = Config.UPLOAD_FOLDER
@@ -1,11 +1,16 @@
+import inspect
 import logging
 from functools import wraps
-from flask import flash, redirect, url_for, request, jsonify
+from flask import flash, redirect, url_for, request, jsonify, has_request_context
 from flask_login import current_user
 
 logger = logging.getLogger('social_automation.error_handler')
 
 def log_user_action(action_type):
+    if not has_request_context():
+        logger.info(f"Background Action - Action: {action_type}")
+        return
+    
     user_id = getattr(current_user, 'id', 'anonymous')
     user_agent = request.headers.get('User-Agent', 'unknown')
     ip_address = request.remote_addr
@@ -21,7 +26,8 @@ def handle_database_error(error, operation):
 def handle_ai_service_error(error, operation):
     error_message = f"AI service error during {operation}: {str(error)}"
     logger.error(error_message)
-    flash('AI service failed to complete the operation. Please try again.', 'error')
+    if has_request_context():
+        flash('AI service failed to complete the operation. Please try again.', 'error')
     return error_message
 
 def handle_general_error(error, operation):
@@ -66,6 +72,19 @@ def with_database_error_handling(operation_name, redirect_route='dashboard'):
 
 def with_ai_error_handling(operation_name):
     def decorator(func):
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                try:
+                    log_user_action(f"AI_{operation_name}")
+                    result = await func(*args, **kwargs)
+                    logger.info(f"AI operation successful: {operation_name}")
+                    return result
+                except Exception as error:
+                    handle_ai_service_error(error, operation_name)
+                    raise error
+            return async_wrapper
+        
         @wraps(func)
         def wrapper(*args, **kwargs):
             try:
@@ -0,0 +1,69 @@
+import threading
+import google.generativeai as generativeai
+from google import genai
+from google.genai import types
+from config import Config
+from logger_config import get_logger
+
+logger = get_logger('genai_registry')
+
+registry_lock = threading.RLock()
+text_models = {}
+shared_objects = {}
+
+def get_gemini_api_key():
+    api_key = Config.GEMINI_API_KEY
+    if not api_key:
+        raise ValueError("Gemini API key not found in configuration")
+    return api_key
+
+def ensure_text_sdk_configured():
+    if shared_objects.get('text_sdk'):
+        return
+    
+    with registry_lock:
+        if not shared_objects.get('text_sdk'):
+            generativeai.configure(api_key=Config.GEMINI_API_KEY)
+            shared_objects['text_sdk'] = True
+            logger.info("Gemini text SDK configured")
+
+def get_text_model(model_name):
+    model = text_models.get(model_name)
+    if model:
+        return model
+    
+    ensure_text_sdk_configured()
+    with registry_lock:
+        if model_name not in text_models:
+            text_models[model_name] = generativeai.GenerativeModel(model_name)
+            logger.info(f"Gemini text model created: {model_name}")
+        return text_models[model_name]
+
+def get_image_client():
+    client = shared_objects.get('image_client')
+    if client:
+        return client
+    
+    with registry_lock:
+        if 'image_client' not in shared_objects:
+            shared_objects['image_client'] = genai.Client(api_key=get_gemini_api_key())
+            logger.info("Gemini client created successfully")
+        return shared_objects['image_client']
+
+def get_image_content_config():
+    config = shared_objects.get('image_config')
+    if config:
+        return config
+    
+    with registry_lock:
+        if 'image_config' not in shared_objects:
+            shared_objects['image_config'] = types.GenerateContentConfig(
+                response_modalities=['TEXT', 'IMAGE']
+            )
+        return shared_objects['image_config']
+
+def get_json_content_config(response_schema):
+    return types.GenerateContentConfig(
+        response_mime_type='application/json',
+        response_schema=types.Schema.model_validate(response_schema)
+    )
\ No newline at end of file
@@ -0,0 +1,102 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from config import Config, get_upload_folder
+from logger_config import get_logger
+
+logger = get_logger('generation_cache')
+
+schema_lock = threading.Lock()
+schema_ready = {}
+
+def normalize_prompt_text(text):
+    return ' '.join((text or '').lower().split())
+
+def build_cache_key(prompt, platform, model_name):
+    key_source = '|'.join([platform or '', model_name or '', normalize_prompt_text(prompt)])
+    return hashlib.sha256(key_source.encode('utf-8')).hexdigest()
+
+def open_cache_connection():
+    cache_path = Config.GENERATION_CACHE_PATH
+    if not schema_ready.get(cache_path):
+        os.makedirs(os.path.dirname(os.path.abspath(cache_path)), exist_ok=True)
+    connection = sqlite3.connect(cache_path, timeout=5)
+    
+    if not schema_ready.get(cache_path):
+        with schema_lock:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS generation_cache ("
+                "cache_key TEXT PRIMARY KEY, payload TEXT NOT NULL, "
+                "created_at REAL NOT NULL, last_accessed REAL NOT NULL)"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS ix_generation_cache_last_accessed "
+                "ON generation_cache (last_accessed)"
+            )
+            connection.commit()
+            schema_ready[cache_path] = True
+    return connection
+
+def is_payload_usable(payload):
+    image_url = payload.get('image_url')
+    if image_url and image_url.startswith('/static/generated_images/'):
+        image_path = os.path.join(get_upload_folder(), image_url.split('/')[-1])
+        return os.path.exists(image_path)
+    return True
+
+def get_cached_generation(cache_key):
+    if not Config.GENERATION_CACHE_ENABLED:
+        return None
+    
+    connection = open_cache_connection()
+    try:
+        row = connection.execute(
+            "SELECT payload, created_at FROM generation_cache WHERE cache_key = ?", (cache_key,)
+        ).fetchone()
+        if not row:
+            return None
+        
+        payload, created_at = json.loads(row[0]), row[1]
+        if time.time() - created_at > Config.GENERATION_CACHE_TTL_SECONDS or not is_payload_usable(payload):
+            connection.execute("DELETE FROM generation_cache WHERE cache_key = ?", (cache_key,))
+            connection.commit()
+            logger.info(f"Generation cache entry expired: {cache_key[:12]}")
+            return None
+        
+        connection.execute(
+            "UPDATE generation_cache SET last_accessed = ? WHERE cache_key = ?", (time.time(), cache_key)
+        )
+        connection.commit()
+        logger.info(f"Generation cache hit: {cache_key[:12]}")
+        return payload
+    finally:
+        connection.close()
+
+def evict_least_recently_used(connection):
+    overflow = connection.execute("SELECT COUNT(*) FROM generation_cache").fetchone()[0] - Config.GENERATION_CACHE_MAX_ENTRIES
+    if overflow > 0:
+        connection.execute(
+            "DELETE FROM generation_cache WHERE cache_key IN ("
+            "SELECT cache_key FROM generation_cache ORDER BY last_accessed ASC LIMIT ?)", (overflow,)
+        )
+        logger.info(f"Evicted {overflow} generation cache entries")
+
+def store_generation(cache_key, payload):
+    if not Config.GENERATION_CACHE_ENABLED:
+        return
+    
+    now = time.time()
+    connection = open_cache_connection()
+    try:
+        connection.execute(
+            "INSERT OR REPLACE INTO generation_cache (cache_key, payload, created_at, last_accessed) "
+            "VALUES (?, ?, ?, ?)", (cache_key, json.dumps(payload), now, now)
+        )
+        evict_least_recently_used(connection)
+        connection.commit()
+        logger.info(f"Generation cached: {cache_key[:12]}")
+    finally:
+        connection.close()
@@ -0,0 +1,128 @@
+import functools
+import hashlib
+import json
+import random
+import threading
+import time
+from io import BytesIO
+from types import SimpleNamespace
+from PIL import Image
+from config import Config
+from logger_config import get_logger
+from genai_registry import get_text_model, get_image_client, get_image_content_config, get_json_content_config
+
+logger = get_logger('generation_providers')
+
+FAKE_STREAM_CHUNKS = 8
+FAKE_IMAGE_SEED = 2024
+
+provider_lock = threading.Lock()
+active_providers = {}
+
+class GeminiGenerationProvider:
+    name = 'gemini'
+    
+    def generate_text(self, model_name, prompt):
+        return get_text_model(model_name).generate_content(prompt).text
+    
+    def stream_text(self, model_name, prompt):
+        for chunk in get_text_model(model_name).generate_content(prompt, stream=True):
+            if chunk.text:
+                yield chunk.text
+    
+    def generate_json(self, model_name, prompt, response_schema):
+        return get_image_client().models.generate_content(
+            model=model_name,
+            contents=prompt,
+            config=get_json_content_config(response_schema)
+        ).text
+    
+    def generate_image(self, model_name, prompt):
+        return get_image_client().models.generate_content(
+            model=model_name,
+            contents=prompt,
+            config=get_image_content_config()
+        )
+
+class FakeGenerationProvider:
+    name = 'fake'
+    
+    def __init__(self, text_latency=0.0, image_latency=0.0, image_size=(1024, 1024)):
+        self.text_latency = text_latency
+        self.image_latency = image_latency
+        self.image_size = image_size
+    
+    def generate_text(self, model_name, prompt):
+        time.sleep(self.text_latency)
+        return build_fake_post(prompt)
+    
+    def generate_json(self, model_name, prompt, response_schema):
+        time.sleep(self.text_latency)
+        platforms = response_schema['items']['properties']['platform']['enum']
+        return json.dumps([
+            {'platform': platform, 'content': build_fake_post(f"{platform}: {prompt}")} for platform in platforms
+        ])
+    
+    def stream_text(self, model_name, prompt):
+        words = build_fake_post(prompt).split(' ')
+        chunk_length = max(1, -(-len(words) // FAKE_STREAM_CHUNKS))
+        for start in range(0, len(words), chunk_length):
+            time.sleep(self.text_latency / FAKE_STREAM_CHUNKS)
+            yield ' '.join(words[start:start + chunk_length]) + (' ' if start + chunk_length < len(words) else '')
+    
+    def generate_image(self, model_name, prompt):
+        time.sleep(self.image_latency)
+        image_data = build_fake_png(*self.image_size)
+        return build_fake_image_response(image_data, f"Fake image for: {prompt[:60]}")
+
+def get_prompt_digest(prompt):
+    return hashlib.sha256(prompt.encode('utf-8')).hexdigest()
+
+def build_fake_post(prompt):
+    digest = get_prompt_digest(prompt)
+    return f"{prompt[:160].strip()} (generated offline, ref {digest[:8]}) #automation #fake{digest[8:12]}"
+
+@functools.lru_cache(maxsize=4)
+def build_fake_png(width, height):
+    pixels = random.Random(FAKE_IMAGE_SEED).randbytes(width * height * 3)
+    buffer = BytesIO()
+    Image.frombytes('RGB', (width, height), pixels).save(buffer, 'PNG', compress_level=1)
+    return buffer.getvalue()
+
+def build_fake_image_response(image_data, caption):
+    parts = [
+        SimpleNamespace(text=caption, inline_data=None),
+        SimpleNamespace(text=None, inline_data=SimpleNamespace(mime_type='image/png', data=image_data))
+    ]
+    return SimpleNamespace(candidates=[SimpleNamespace(content=SimpleNamespace(parts=parts))])
+
+def parse_image_size(raw_size):
+    width, height = raw_size.lower().split('x')
+    return int(width), int(height)
+
+def create_generation_provider(provider_name):
+    if provider_name == 'gemini':
+        return GeminiGenerationProvider()
+    if provider_name == 'fake':
+        return FakeGenerationProvider(
+            text_latency=Config.FAKE_GENERATION_TEXT_LATENCY_SECONDS,
+            image_latency=Config.FAKE_GENERATION_IMAGE_LATENCY_SECONDS,
+            image_size=parse_image_size(Config.FAKE_GENERATION_IMAGE_SIZE)
+        )
+    raise ValueError(f"Unknown generation provider: {provider_name}")
+
+def get_generation_provider():
+    provider = active_providers.get('current')
+    if provider:
+        return provider
+    
+    with provider_lock:
+        if 'current' not in active_providers:
+            active_providers['current'] = create_generation_provider(Config.GENERATION_PROVIDER)
+            logger.info(f"Using {Config.GENERATION_PROVIDER} generation provider")
+        return active_providers['current']
+
+def set_generation_provider(provider):
+    with provider_lock:
+        active_providers['current'] = provider
+    logger.info(f"Generation provider set to {provider.name}")
\ No newline at end of file
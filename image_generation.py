@@ -1,35 +1,41 @@
-from google import genai
-from google.genai import types
-from PIL import Image
+from PIL import Image, ImageOps
 from io import BytesIO
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
 import os
+import threading
 import uuid
 from datetime import datetime
 from config import Config, get_upload_folder
 from error_handlers import with_ai_error_handling
 from logger_config import get_logger
+from generation_providers import get_generation_provider
+from image_renditions import build_platform_renditions
 
 logger = get_logger('image_generation')
 
+IMAGE_MODEL_NAME = "gemini-2.0-flash-preview-image-generation"
+
+PLATFORM_IMAGE_SIZES = {
+    'LinkedIn': (1200, 627),
+    'Twitter': (1600, 900),
+    'Instagram': (1080, 1080),
+    'Facebook': (1200, 630)
+}
+
+IMAGE_SIGNATURES = {
+    'png': b'\x89PNG\r\n\x1a\n',
+    'jpg': b'\xff\xd8\xff'
+}
+
+image_process_pool = None
+image_pool_lock = threading.Lock()
+
 def ensure_upload_directory():
     upload_dir = get_upload_folder()
     logger.info(f"Using upload directory: {upload_dir}")
     return upload_dir
 
-def create_genai_client():
-    api_key = Config.GEMINI_API_KEY
-    if not api_key:
-        raise ValueError("Gemini API key not found in configuration")
-    client = genai.Client(api_key=api_key)
-    logger.info("Gemini client created successfully")
-    return client
-
-def generate_content_config():
-    config = types.GenerateContentConfig(
-        response_modalities=['TEXT', 'IMAGE']
-    )
-    return config
-
 def create_image_prompt(content, platform):
     platform_styles = {
         'LinkedIn': 'professional, business-focused, clean and modern style',
@@ -49,22 +55,60 @@ def generate_unique_filename():
     filename = f"generated_{timestamp}_{unique_id}.png"
     return filename
 
-def send_generation_request(client, prompt, config):
+def send_generation_request(prompt):
     logger.info(f"Sending image generation request with prompt: {prompt[:100]}...")
-    response = client.models.generate_content(
-        model="gemini-2.0-flash-preview-image-generation",
-        contents=prompt,
-        config=config
-    )
+    response = get_generation_provider().generate_image(IMAGE_MODEL_NAME, prompt)
     logger.info("Image generation request completed")
     return response
 
+def detect_image_format(image_data):
+    for image_format, signature in IMAGE_SIGNATURES.items():
+        if image_data[:len(signature)] == signature:
+            return image_format
+    return None
+
+def get_image_process_pool():
+    global image_process_pool
+    
+    with image_pool_lock:
+        if image_process_pool is None:
+            image_process_pool = ProcessPoolExecutor(
+                max_workers=Config.IMAGE_PROCESS_WORKERS,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+            logger.info(f"Image process pool started with {Config.IMAGE_PROCESS_WORKERS} workers")
+        return image_process_pool
+
+def log_rendition_result(future):
+    try:
+        renditions = future.result()
+        sizes = ', '.join(f"{platform}={size // 1024}KB" for platform, (_, size) in renditions.items())
+        logger.info(f"Platform renditions ready: {sizes}")
+    except Exception as error:
+        logger.error(f"Platform rendition build failed: {str(error)}")
+
+def schedule_renditions(file_path):
+    if not Config.IMAGE_RENDITIONS_ENABLED:
+        return None
+    
+    future = get_image_process_pool().submit(build_platform_renditions, file_path)
+    future.add_done_callback(log_rendition_result)
+    return future
+
 def save_generated_image(image_data, filename):
     upload_dir = ensure_upload_directory()
-    file_path = os.path.join(upload_dir, filename)
+    image_format = detect_image_format(image_data)
+    
+    if image_format:
+        filename = f"{os.path.splitext(filename)[0]}.{image_format}"
+        file_path = os.path.join(upload_dir, filename)
+        with open(file_path, 'wb') as image_file:
+            image_file.write(image_data)
+    else:
+        file_path = os.path.join(upload_dir, filename)
+        with Image.open(BytesIO(image_data)) as image:
+            image.save(file_path, 'PNG')
     
-    image = Image.open(BytesIO(image_data))
-    image.save(file_path, 'PNG', optimize=True, quality=85)
     logger.info(f"Image saved successfully: {filename}")
     return file_path
 
@@ -72,7 +116,8 @@ def process_generation_response(response, filename):
     for part in response.candidates[0].content.parts:
         if part.inline_data is not None:
             file_path = save_generated_image(part.inline_data.data, filename)
-            relative_path = f"/static/generated_images/{filename}"
+            schedule_renditions(file_path)
+            relative_path = f"/static/generated_images/{os.path.basename(file_path)}"
             logger.info(f"Image processed successfully: {relative_path}")
             return relative_path
         elif part.text is not None:
@@ -83,17 +128,38 @@ def process_generation_response(response, filename):
 def generate_image_for_post(content, platform='LinkedIn'):
     logger.info(f"Starting image generation for {platform} post")
     
-    client = create_genai_client()
-    config = generate_content_config()
     prompt = create_image_prompt(content, platform)
     filename = generate_unique_filename()
     
-    response = send_generation_request(client, prompt, config)
+    response = send_generation_request(prompt)
     image_url = process_generation_response(response, filename)
     
     logger.info("Image generation completed successfully")
     return image_url
 
+def get_generated_image_path(image_url):
+    filename = image_url.split('/')[-1]
+    return os.path.join(ensure_upload_directory(), filename)
+
+def crop_image_for_platform(image_url, platform):
+    target_size = PLATFORM_IMAGE_SIZES.get(platform)
+    if not target_size:
+        return image_url
+    
+    source_path = get_generated_image_path(image_url)
+    stem = os.path.splitext(os.path.basename(source_path))[0]
+    filename = f"{stem}_{platform.lower()}.jpg"
+    
+    with Image.open(source_path) as image:
+        cropped = ImageOps.fit(image.convert('RGB'), target_size, method=Image.LANCZOS)
+        cropped.save(os.path.join(os.path.dirname(source_path), filename), 'JPEG', quality=90)
+    
+    logger.info(f"Cropped {os.path.basename(source_path)} to {target_size} for {platform}")
+    return f"/static/generated_images/{filename}"
+
+def create_platform_crops(image_url, platforms):
+    return {platform: crop_image_for_platform(image_url, platform) for platform in platforms}
+
 def cleanup_old_images():
     upload_dir = get_upload_folder()
     current_time = datetime.now()
@@ -0,0 +1,46 @@
+import os
+from io import BytesIO
+from PIL import Image
+
+PLATFORM_RENDITION_SPECS = {
+    'LinkedIn': {'max_size': (1200, 1200), 'max_bytes': 5 * 1024 * 1024},
+    'Twitter': {'max_size': (1600, 1600), 'max_bytes': 5 * 1024 * 1024},
+    'Facebook': {'max_size': (1200, 1200), 'max_bytes': 4 * 1024 * 1024},
+    'Instagram': {'max_size': (1080, 1350), 'max_bytes': 8 * 1024 * 1024}
+}
+
+RENDITION_QUALITY_STEPS = (88, 80, 72, 64, 56)
+
+def get_rendition_path(source_path, platform):
+    stem = os.path.splitext(source_path)[0]
+    return f"{stem}_rendition_{platform.lower()}.jpg"
+
+def encode_within_byte_limit(image, max_bytes):
+    for quality in RENDITION_QUALITY_STEPS:
+        buffer = BytesIO()
+        image.save(buffer, 'JPEG', quality=quality, optimize=True, progressive=True)
+        if buffer.tell() <= max_bytes:
+            break
+    return buffer.getvalue()
+
+def build_platform_rendition(image, source_path, platform):
+    spec = PLATFORM_RENDITION_SPECS[platform]
+    rendition = image.copy()
+    rendition.thumbnail(spec['max_size'], Image.LANCZOS)
+    
+    rendition_bytes = encode_within_byte_limit(rendition, spec['max_bytes'])
+    rendition_path = get_rendition_path(source_path, platform)
+    temp_path = f"{rendition_path}.tmp"
+    with open(temp_path, 'wb') as rendition_file:
+        rendition_file.write(rendition_bytes)
+    os.replace(temp_path, rendition_path)
+    return rendition_path, len(rendition_bytes)
+
+def build_platform_renditions(source_path, platforms=None):
+    renditions = {}
+    with Image.open(source_path) as source_image:
+        image = source_image.convert('RGB')
+    
+    for platform in platforms or PLATFORM_RENDITION_SPECS:
+        renditions[platform] = build_platform_rendition(image, source_path, platform)
+    return renditions
@@ -1,6 +1,11 @@
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import UserMixin
-from datetime import datetime
+from datetime import datetime, timedelta
+import os
+import random
+import socket
+import uuid
+from config import Config
 from logger_config import get_logger
 
 db = SQLAlchemy()
@@ -16,6 +21,10 @@ class User(UserMixin, db.Model):
     posts = db.relationship('Post', backref='user', lazy=True)
 
 class SocialAccount(db.Model):
+    __table_args__ = (
+        db.Index('ix_social_account_user_platform', 'user_id', 'platform', 'is_active'),
+    )
+    
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     platform = db.Column(db.String(50), nullable=False)
@@ -25,6 +34,12 @@ class SocialAccount(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
 class Post(db.Model):
+    __table_args__ = (
+        db.Index('ix_post_status_scheduled_time', 'status', 'scheduled_time'),
+        db.Index('ix_post_user_created_at', 'user_id', 'created_at'),
+        db.Index('ix_post_user_status', 'user_id', 'status'),
+    )
+    
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     content = db.Column(db.Text, nullable=False)
@@ -35,15 +50,227 @@ class Post(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     posted_at = db.Column(db.DateTime)
     error_message = db.Column(db.Text)
+    claimed_by = db.Column(db.String(120))
+    lease_expires_at = db.Column(db.DateTime)
+    content_preview = db.query_expression()
+    deliveries = db.relationship('PostDelivery', backref='post', lazy=True, cascade='all, delete-orphan')
+
+class PostDelivery(db.Model):
+    __table_args__ = (
+        db.UniqueConstraint('post_id', 'platform', name='uq_post_delivery_post_platform'),
+        db.Index('ix_post_delivery_platform_status', 'platform', 'status'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    post_id = db.Column(db.Integer, db.ForeignKey('post.id'), nullable=False)
+    platform = db.Column(db.String(50), nullable=False)
+    status = db.Column(db.String(20), default='pending')
+    remote_id = db.Column(db.String(255))
+    latency_ms = db.Column(db.Integer)
+    error_message = db.Column(db.Text)
+    attempted_at = db.Column(db.DateTime)
+    delivered_at = db.Column(db.DateTime)
+    attempts = db.Column(db.Integer, default=0)
+    next_attempt_at = db.Column(db.DateTime)
+
+class PlatformIdentity(db.Model):
+    __table_args__ = (
+        db.UniqueConstraint('token_fingerprint', 'identity_type', name='uq_platform_identity_token_type'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    platform = db.Column(db.String(50), nullable=False)
+    token_fingerprint = db.Column(db.String(64), nullable=False)
+    identity_type = db.Column(db.String(50), nullable=False)
+    identity_value = db.Column(db.String(255), nullable=False)
+    resolved_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class MediaUpload(db.Model):
+    __table_args__ = (
+        db.UniqueConstraint('platform', 'account_fingerprint', 'content_hash', name='uq_media_upload_platform_account_hash'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    platform = db.Column(db.String(50), nullable=False)
+    account_fingerprint = db.Column(db.String(64), nullable=False)
+    content_hash = db.Column(db.String(64), nullable=False)
+    remote_id = db.Column(db.String(255), nullable=False)
+    uploaded_at = db.Column(db.DateTime, default=datetime.utcnow)
+    expires_at = db.Column(db.DateTime, nullable=False)
 
 def init_database_tables():
     try:
         db.create_all()
+        run_schema_migrations()
         logger.info("Database tables created successfully")
     except Exception as error:
         logger.error(f"Failed to create database tables: {str(error)}")
         raise
 
+def ensure_table_columns():
+    inspector = db.inspect(db.engine)
+    for table in db.metadata.sorted_tables:
+        existing_columns = {column['name'] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing_columns:
+                continue
+            column_type = column.type.compile(dialect=db.engine.dialect)
+            with db.engine.begin() as connection:
+                connection.execute(db.text(f'ALTER TABLE "{table.name}" ADD COLUMN "{column.name}" {column_type}'))
+            logger.info(f"Added column {table.name}.{column.name}")
+
+def ensure_table_indexes():
+    for table in db.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=db.engine, checkfirst=True)
+
+LEGACY_DELIVERY_STATUSES = {
+    'failed': 'failed',
+    'cancelled': 'cancelled'
+}
+
+def get_legacy_delivery_status(post, platform):
+    if post.status == 'posted':
+        return 'failed' if post.error_message and platform in post.error_message else 'posted'
+    return LEGACY_DELIVERY_STATUSES.get(post.status, 'pending')
+
+def backfill_post_deliveries(batch_size=500):
+    backfilled_count = 0
+    last_id = 0
+    
+    while True:
+        posts = Post.query.outerjoin(PostDelivery).filter(
+            Post.id > last_id,
+            PostDelivery.id.is_(None),
+            Post.platforms.isnot(None),
+            Post.platforms != ''
+        ).order_by(Post.id).limit(batch_size).all()
+        if not posts:
+            break
+        
+        last_id = posts[-1].id
+        for post in posts:
+            for platform in parse_post_platforms(post.platforms):
+                status = get_legacy_delivery_status(post, platform)
+                db.session.add(PostDelivery(
+                    post_id=post.id,
+                    platform=platform,
+                    status=status,
+                    error_message=post.error_message if status == 'failed' else None,
+                    delivered_at=post.posted_at if status == 'posted' else None
+                ))
+        db.session.commit()
+        backfilled_count += len(posts)
+    
+    if backfilled_count:
+        logger.info(f"Backfilled deliveries for {backfilled_count} posts")
+
+def run_schema_migrations():
+    ensure_table_columns()
+    ensure_table_indexes()
+    backfill_post_deliveries()
+
+def parse_post_platforms(platforms):
+    return [name.strip() for name in platforms.split(',') if name.strip()] if platforms else []
+
+OPEN_DELIVERY_STATUSES = ('pending', 'deferred', 'unconfirmed')
+
+def create_post_deliveries(post, platforms):
+    for platform in platforms:
+        db.session.add(PostDelivery(post=post, platform=platform, status='pending'))
+
+def get_delivery_retry_delay(attempt):
+    backoff_ceiling = min(Config.PUBLISH_RETRY_MAX_DELAY_SECONDS, Config.PUBLISH_RETRY_BASE_SECONDS * 2 ** (attempt - 1))
+    return max(1.0, random.uniform(0, backoff_ceiling))
+
+def record_delivery_outcome(post_id, outcome):
+    delivery = PostDelivery.query.filter_by(post_id=post_id, platform=outcome['platform']).first()
+    if not delivery:
+        delivery = PostDelivery(post_id=post_id, platform=outcome['platform'], attempts=0)
+        db.session.add(delivery)
+    
+    now = datetime.utcnow()
+    delivery.remote_id = str(outcome['result']) if outcome['result'] else None
+    delivery.latency_ms = int(outcome['elapsed'] * 1000)
+    delivery.error_message = outcome['error']
+    delivery.attempted_at = now
+    delivery.next_attempt_at = None
+    
+    if outcome['retry_after']:
+        if delivery.status != 'unconfirmed':
+            delivery.status = 'deferred'
+        delivery.next_attempt_at = now + timedelta(seconds=outcome['retry_after'])
+        return outcome['retry_after']
+    
+    delivery.attempts = (delivery.attempts or 0) + 1
+    if outcome['success']:
+        delivery.status = 'posted'
+        delivery.delivered_at = now
+    elif outcome.get('retryable') and delivery.attempts < Config.PUBLISH_RETRY_MAX_ATTEMPTS:
+        retry_after = get_delivery_retry_delay(delivery.attempts)
+        delivery.status = 'unconfirmed' if outcome.get('ambiguous') else 'deferred'
+        delivery.next_attempt_at = now + timedelta(seconds=retry_after)
+        logger.info(f"Post {post_id} delivery to {delivery.platform} retries in {int(retry_after)}s (attempt {delivery.attempts})")
+        return retry_after
+    else:
+        delivery.status = 'failed'
+    return None
+
+def create_lease_owner():
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+def get_lease_expiry():
+    return datetime.utcnow() + timedelta(seconds=Config.PUBLISH_LEASE_SECONDS)
+
+def get_claim_filter(post_id, claim_token):
+    return db.and_(Post.id == post_id, Post.claimed_by == claim_token, Post.status == 'publishing')
+
+def renew_publishing_lease(post_id, claim_token, values=None):
+    renewed = Post.query.filter(get_claim_filter(post_id, claim_token)).update({
+        **(values or {}),
+        Post.lease_expires_at: get_lease_expiry()
+    }, synchronize_session=False)
+    db.session.commit()
+    if not renewed:
+        logger.warning(f"Post {post_id} lost its publishing lease while results were still arriving")
+    return renewed == 1
+
+def release_publishing_claim(post_id, claim_token, final_status):
+    released = Post.query.filter(get_claim_filter(post_id, claim_token)).update({
+        **final_status,
+        Post.claimed_by: None,
+        Post.lease_expires_at: None
+    }, synchronize_session=False)
+    db.session.commit()
+    if not released:
+        logger.warning(f"Post {post_id} lost its publishing lease before finishing, final status not written")
+        return None
+    return db.session.query(Post.user_id).filter(Post.id == post_id).scalar()
+
+def expire_publishing_leases():
+    lease_expired = db.or_(Post.lease_expires_at.is_(None), Post.lease_expires_at < datetime.utcnow())
+    expired_posts = dict(db.session.query(Post.id, Post.user_id).filter(
+        Post.status == 'publishing', lease_expired
+    ))
+    if not expired_posts:
+        return {}
+    expired_ids = list(expired_posts)
+    
+    error_message = 'Publishing lease expired before the post finished'
+    Post.query.filter(Post.id.in_(expired_ids), Post.status == 'publishing', lease_expired).update({
+        Post.status: 'failed',
+        Post.error_message: error_message,
+        Post.claimed_by: None,
+        Post.lease_expires_at: None
+    }, synchronize_session=False)
+    PostDelivery.query.filter(PostDelivery.post_id.in_(expired_ids), PostDelivery.status.in_(OPEN_DELIVERY_STATUSES)).update({
+        PostDelivery.status: 'failed',
+        PostDelivery.error_message: error_message
+    }, synchronize_session=False)
+    db.session.commit()
+    logger.warning(f"Failed {len(expired_ids)} posts whose publishing lease expired")
+    return expired_posts
+
 def create_sample_accounts_for_user(user_id, username):
     try:
         existing_accounts = SocialAccount.query.filter_by(user_id=user_id).first()
@@ -69,11 +296,5 @@ def create_sample_accounts_for_user(user_id, username):
         db.session.rollback()
         raise
 
-def ensure_user_has_accounts(user_id, username):
-    account_count = SocialAccount.query.filter_by(user_id=user_id).count()
-    if account_count == 0:
-        create_sample_accounts_for_user(user_id, username)
-        logger.info(f"Ensured accounts exist for user {user_id}")
-
 def init_db():
     init_database_tables()
\ No newline at end of file
@@ -0,0 +1,196 @@
+import queue
+import threading
+import atexit
+from datetime import datetime, timedelta
+from flask import current_app
+from config import Config
+from models import (Post, SocialAccount, db, parse_post_platforms, record_delivery_outcome,
+                    create_lease_owner, get_lease_expiry, expire_publishing_leases, renew_publishing_lease,
+                    release_publishing_claim)
+from logger_config import get_logger
+from user_cache import invalidate_dashboard_cache
+from social_platforms.platform_manager import publish_to_platforms, validate_platform_requirements, build_publish_outcome
+
+logger = get_logger('publish_queue')
+
+publish_jobs = queue.Queue()
+worker_threads = []
+workers_lock = threading.Lock()
+STOP_SIGNAL = None
+
+def describe_failure(outcome):
+    if outcome['error']:
+        return f"{outcome['platform']}: {outcome['error']}"
+    return outcome['platform']
+
+def publish_post_immediately(content, image_url, selected_accounts, on_result=None):
+    success_count = 0
+    failed_platforms = []
+    deferred_seconds = []
+    targets = []
+    
+    def handle_outcome(outcome):
+        nonlocal success_count
+        retry_after = on_result(outcome) if on_result else outcome['retry_after']
+        if outcome['success']:
+            success_count += 1
+        elif retry_after:
+            deferred_seconds.append(retry_after)
+        else:
+            failed_platforms.append(describe_failure(outcome))
+    
+    for account in selected_accounts:
+        is_valid, error_msg = validate_platform_requirements(account.platform, content, image_url)
+        if not is_valid:
+            handle_outcome(build_publish_outcome(account.platform, False, error=error_msg))
+            continue
+        
+        if account.access_token:
+            targets.append((account.platform, account.access_token))
+        else:
+            handle_outcome(build_publish_outcome(account.platform, False, error="No access token - connect account first"))
+    
+    publish_to_platforms(targets, content, image_url, on_result=handle_outcome)
+    return success_count, failed_platforms, deferred_seconds
+
+def load_post_accounts(post, account_ids=None):
+    if account_ids:
+        return SocialAccount.query.filter(
+            SocialAccount.id.in_(account_ids),
+            SocialAccount.user_id == post.user_id
+        ).all()
+    
+    platforms = parse_post_platforms(post.platforms)
+    return SocialAccount.query.filter(
+        SocialAccount.user_id == post.user_id,
+        SocialAccount.platform.in_(platforms),
+        SocialAccount.is_active == True
+    ).all()
+
+def defer_post(post, claim_token, deferred_seconds):
+    retry_at = datetime.now() + timedelta(seconds=min(deferred_seconds))
+    if release_publishing_claim(post.id, claim_token, {Post.status: 'scheduled', Post.scheduled_time: retry_at}):
+        invalidate_dashboard_cache(post.user_id)
+        logger.info(f"Post {post.id} has deliveries waiting for a retry, rescheduled for {retry_at}")
+
+def finalize_post_status(post, claim_token, success_count, failed_platforms):
+    if success_count > 0:
+        final_status = {
+            Post.status: 'posted',
+            Post.posted_at: datetime.utcnow(),
+            Post.error_message: f"Failed on: {', '.join(failed_platforms)}" if failed_platforms else None
+        }
+    else:
+        final_status = {
+            Post.status: 'failed',
+            Post.error_message: f'Failed on all platforms: {", ".join(failed_platforms)}'
+        }
+    if release_publishing_claim(post.id, claim_token, final_status):
+        invalidate_dashboard_cache(post.user_id)
+
+def claim_queued_post(post_id):
+    claim_token = create_lease_owner()
+    claimed = Post.query.filter_by(id=post_id, status='queued').update({
+        Post.status: 'publishing',
+        Post.claimed_by: claim_token,
+        Post.lease_expires_at: get_lease_expiry()
+    }, synchronize_session=False)
+    db.session.commit()
+    return claim_token if claimed == 1 else None
+
+def publish_queued_post(post_id, claim_token, account_ids=None):
+    post = Post.query.get(post_id)
+    invalidate_dashboard_cache(post.user_id)
+    accounts = load_post_accounts(post, account_ids)
+    
+    progress_failures = []
+    
+    def record_outcome(outcome):
+        retry_after = record_delivery_outcome(post_id, outcome)
+        progress = {}
+        if not outcome['success'] and not retry_after:
+            progress_failures.append(describe_failure(outcome))
+            progress[Post.error_message] = f"Failed on: {', '.join(progress_failures)}"
+        renew_publishing_lease(post_id, claim_token, progress)
+        logger.info(f"Post {post_id} finished on {outcome['platform']} in {outcome['elapsed']:.2f}s")
+        return retry_after
+    
+    success_count, failed_platforms, deferred_seconds = publish_post_immediately(
+        post.content, post.image_url, accounts, on_result=record_outcome
+    )
+    if deferred_seconds:
+        defer_post(post, claim_token, deferred_seconds)
+        return
+    finalize_post_status(post, claim_token, success_count, failed_platforms)
+    logger.info(f"Post {post_id} published to {success_count} platforms")
+
+def process_publish_job(app, job):
+    post_id, account_ids = job
+    with app.app_context():
+        claim_token = None
+        try:
+            claim_token = claim_queued_post(post_id)
+            if not claim_token:
+                logger.info(f"Queued post {post_id} was already claimed or cancelled")
+                return
+            publish_queued_post(post_id, claim_token, account_ids)
+        except Exception as error:
+            db.session.rollback()
+            failure = {Post.status: 'failed', Post.error_message: str(error)}
+            user_id = release_publishing_claim(post_id, claim_token, failure) if claim_token else None
+            if user_id:
+                invalidate_dashboard_cache(user_id)
+            logger.error(f"Error publishing queued post {post_id}: {str(error)}")
+
+def run_publish_worker(app):
+    while True:
+        job = publish_jobs.get()
+        try:
+            if job is STOP_SIGNAL:
+                return
+            process_publish_job(app, job)
+        finally:
+            publish_jobs.task_done()
+
+def recover_queued_posts():
+    expired_posts = expire_publishing_leases()
+    
+    queued_posts = db.session.query(Post.id, Post.user_id).filter_by(status='queued').order_by(Post.created_at).all()
+    for post_id, _ in queued_posts:
+        publish_jobs.put((post_id, None))
+    for user_id in set(expired_posts.values()) | {user_id for _, user_id in queued_posts}:
+        invalidate_dashboard_cache(user_id)
+    
+    logger.info(f"Recovered {len(queued_posts)} queued posts, {len(expired_posts)} expired publishing leases marked failed")
+
+def stop_publish_queue():
+    for _ in worker_threads:
+        publish_jobs.put(STOP_SIGNAL)
+
+def start_publish_queue(app):
+    with workers_lock:
+        if worker_threads:
+            return
+        
+        with app.app_context():
+            recover_queued_posts()
+        
+        for index in range(Config.PUBLISH_QUEUE_WORKERS):
+            worker = threading.Thread(
+                target=run_publish_worker,
+                args=(app,),
+                name=f"publish_worker_{index}",
+                daemon=True
+            )
+            worker.start()
+            worker_threads.append(worker)
+        
+        atexit.register(stop_publish_queue)
+        logger.info(f"Publish queue started with {len(worker_threads)} workers")
+
+def enqueue_post_publication(post_id, account_ids=None):
+    if not worker_threads:
+        start_publish_queue(current_app._get_current_object())
+    
+    publish_jobs.put((post_id, account_ids))
+    logger.info(f"Post {post_id} queued for publishing (queue depth {publish_jobs.qsize()})")
@@ -1,120 +1,269 @@
 from apscheduler.schedulers.background import BackgroundScheduler
-from apscheduler.triggers.date import DateTrigger
-from datetime import datetime
-from models import Post, SocialAccount, db
-from error_handlers import with_database_error_handling
+from apscheduler.triggers.interval import IntervalTrigger
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+import threading
+from config import Config
+from models import (Post, PostDelivery, SocialAccount, db, parse_post_platforms, record_delivery_outcome,
+                    create_lease_owner, get_lease_expiry, expire_publishing_leases, renew_publishing_lease,
+                    release_publishing_claim, OPEN_DELIVERY_STATUSES)
 from logger_config import get_logger
-from social_platforms.platform_manager import post_to_platform
+from user_cache import invalidate_dashboard_cache
+from social_platforms.platform_manager import publish_to_platforms, build_publish_outcome
 import atexit
 
-scheduler = BackgroundScheduler()
+scheduler = BackgroundScheduler(job_defaults={
+    'coalesce': True,
+    'max_instances': 1
+})
+scheduler_executor = ThreadPoolExecutor(
+    max_workers=Config.SCHEDULER_MAX_WORKERS,
+    thread_name_prefix='scheduled_post'
+)
+in_flight_lock = threading.Lock()
+scheduler_lock = threading.Lock()
+in_flight_posts = set()
 logger = get_logger('scheduler')
 
-def get_account_access_token(account_id):
-    account = SocialAccount.query.get(account_id)
-    if account and account.access_token:
-        return account.access_token
-    return None
+DISPATCH_JOB_ID = 'dispatch_due_posts'
 
-def post_to_single_platform(post_id, platform, account_id):
-    try:
-        post = Post.query.get(post_id)
-        access_token = get_account_access_token(account_id)
+def get_free_slots():
+    with in_flight_lock:
+        return Config.SCHEDULER_MAX_WORKERS - len(in_flight_posts)
+
+def claim_due_posts(limit):
+    candidate_ids = [post_id for (post_id,) in db.session.query(Post.id).filter(
+        Post.status == 'scheduled',
+        Post.scheduled_time <= datetime.now()
+    ).order_by(Post.scheduled_time, Post.id).limit(limit)]
+    if not candidate_ids:
+        return None, []
+    
+    lease_owner = create_lease_owner()
+    Post.query.filter(Post.id.in_(candidate_ids), Post.status == 'scheduled').update({
+        Post.status: 'publishing',
+        Post.claimed_by: lease_owner,
+        Post.lease_expires_at: get_lease_expiry()
+    }, synchronize_session=False)
+    db.session.commit()
+    
+    claimed_ids = [post_id for (post_id,) in db.session.query(Post.id).filter(
+        Post.claimed_by == lease_owner,
+        Post.status == 'publishing'
+    )]
+    if len(claimed_ids) < len(candidate_ids):
+        logger.info(f"{len(candidate_ids) - len(claimed_ids)} due posts were claimed by another worker")
+    return lease_owner, claimed_ids
+
+def load_scheduled_batch(post_ids, claim_token):
+    rows = db.session.query(
+        Post.id, Post.user_id, Post.content, Post.image_url, Post.platforms,
+        SocialAccount.platform, SocialAccount.id, SocialAccount.access_token
+    ).outerjoin(SocialAccount, db.and_(
+        SocialAccount.user_id == Post.user_id,
+        SocialAccount.is_active == True
+    )).filter(Post.id.in_(post_ids)).order_by(Post.id, SocialAccount.id).all()
+    
+    batch = {}
+    for post_id, user_id, content, image_url, platforms, platform, account_id, access_token in rows:
+        entry = batch.setdefault(post_id, {
+            'user_id': user_id,
+            'content': content,
+            'image_url': image_url,
+            'platforms': parse_post_platforms(platforms),
+            'accounts': {},
+            'deliveries': {},
+            'claim_token': claim_token
+        })
+        if platform and platform not in entry['accounts']:
+            entry['accounts'][platform] = (account_id, access_token)
+    
+    deliveries = db.session.query(
+        PostDelivery.post_id, PostDelivery.platform, PostDelivery.status, PostDelivery.next_attempt_at
+    ).filter(PostDelivery.post_id.in_(post_ids))
+    for post_id, platform, status, next_attempt_at in deliveries:
+        if post_id in batch:
+            batch[post_id]['deliveries'][platform] = (status, next_attempt_at)
+    return batch
+
+def publish_scheduled_entry(post_id, entry):
+    success_count = 0
+    failed_platforms = []
+    deferred_seconds = []
+    reconcile_platforms = set()
+    targets = []
+    now = datetime.utcnow()
+    
+    for platform_name in entry['platforms']:
+        status, next_attempt_at = entry['deliveries'].get(platform_name, ('pending', None))
+        if status == 'posted':
+            success_count += 1
+            continue
+        if status in ('failed', 'cancelled'):
+            failed_platforms.append(platform_name)
+            continue
+        if next_attempt_at and next_attempt_at > now:
+            deferred_seconds.append((next_attempt_at - now).total_seconds())
+            continue
+        if status == 'unconfirmed':
+            reconcile_platforms.add(platform_name)
         
-        if not access_token:
-            logger.error(f"No access token found for account {account_id}")
-            return False
+        account_id, access_token = entry['accounts'].get(platform_name, (None, None))
         
-        result = post_to_platform(platform, access_token, post.content, post.image_url)
+        if access_token:
+            targets.append((platform_name, access_token))
+            continue
         
-        if result:
-            logger.info(f"Successfully posted to {platform} for post {post_id}")
-            return True
-        return False
-    except Exception as error:
-        logger.error(f"Failed to post to {platform}: {str(error)}")
-        return False
-
-def execute_scheduled_post(post_id):
-    logger.info(f"Executing scheduled post {post_id}")
-    post = Post.query.get(post_id)
-    if not post:
-        logger.error(f"Post {post_id} not found for execution")
-        return
+        if account_id:
+            error_msg = "No access token - connect account first"
+            logger.error(f"No access token found for account {account_id}")
+        else:
+            error_msg = "No active account found"
+            logger.warning(f"No active account found for platform {platform_name}")
+        failed_platforms.append(platform_name)
+        record_delivery_outcome(post_id, build_publish_outcome(platform_name, False, error=error_msg))
+    
+    def record_outcome(outcome):
+        nonlocal success_count
+        retry_after = record_delivery_outcome(post_id, outcome)
+        renew_publishing_lease(post_id, entry['claim_token'])
+        if outcome['success']:
+            success_count += 1
+            logger.info(f"Successfully posted to {outcome['platform']} for post {post_id}")
+        elif retry_after:
+            deferred_seconds.append(retry_after)
+        else:
+            failed_platforms.append(outcome['platform'])
+    
+    publish_to_platforms(targets, entry['content'], entry['image_url'], on_result=record_outcome,
+                         reconcile_platforms=reconcile_platforms)
     
+    if deferred_seconds:
+        retry_at = datetime.now() + timedelta(seconds=min(deferred_seconds))
+        logger.info(f"Post {post_id} has deliveries waiting for a retry, rescheduled for {retry_at}")
+        return {Post.status: 'scheduled', Post.scheduled_time: retry_at}
+    
+    if success_count > 0:
+        final_status = {
+            Post.status: 'posted',
+            Post.posted_at: datetime.utcnow(),
+            Post.error_message: f"Failed on platforms: {', '.join(failed_platforms)}" if failed_platforms else None
+        }
+        logger.info(f"Post {post_id} executed successfully on {success_count} platforms")
+    else:
+        final_status = {
+            Post.status: 'failed',
+            Post.error_message: f'Failed to post to any platform: {", ".join(failed_platforms)}'
+        }
+        logger.error(f"Post {post_id} failed to execute on any platform")
+    return final_status
+
+def run_scheduled_post(app, post_id, entry):
     try:
-        platforms = post.platforms.split(',') if post.platforms else []
-        success_count = 0
-        failed_platforms = []
-        
-        for platform_name in platforms:
-            platform_name = platform_name.strip()
-            account = SocialAccount.query.filter_by(
-                user_id=post.user_id,
-                platform=platform_name,
-                is_active=True
-            ).first()
+        with app.app_context():
+            try:
+                final_status = publish_scheduled_entry(post_id, entry)
+            except Exception as error:
+                db.session.rollback()
+                final_status = {Post.status: 'failed', Post.error_message: str(error)}
+                logger.error(f"Error executing scheduled post {post_id}: {str(error)}")
             
-            if account:
-                if post_to_single_platform(post_id, platform_name, account.id):
-                    success_count += 1
-                else:
-                    failed_platforms.append(platform_name)
-            else:
-                failed_platforms.append(platform_name)
-                logger.warning(f"No active account found for platform {platform_name}")
-        
-        if success_count > 0:
-            post.status = 'posted'
-            post.posted_at = datetime.utcnow()
-            if failed_platforms:
-                post.error_message = f"Failed on platforms: {', '.join(failed_platforms)}"
-            logger.info(f"Post {post_id} executed successfully on {success_count} platforms")
-        else:
-            post.status = 'failed'
-            post.error_message = f'Failed to post to any platform: {", ".join(failed_platforms)}'
-            logger.error(f"Post {post_id} failed to execute on any platform")
-        
-        db.session.commit()
-    except Exception as error:
-        post.status = 'failed'
-        post.error_message = str(error)
-        db.session.commit()
-        logger.error(f"Error executing scheduled post {post_id}: {str(error)}")
+            if release_publishing_claim(post_id, entry['claim_token'], final_status):
+                invalidate_dashboard_cache(entry['user_id'])
+    finally:
+        with in_flight_lock:
+            in_flight_posts.discard(post_id)
 
-def schedule_post(post_id, scheduled_time):
-    job_id = f"post_{post_id}"
+def mark_posts_missed():
+    grace_cutoff = datetime.now() - timedelta(seconds=Config.SCHEDULER_MISFIRE_GRACE_SECONDS)
+    missed_filter = db.and_(
+        Post.status == 'scheduled',
+        db.or_(Post.scheduled_time.is_(None), Post.scheduled_time < grace_cutoff),
+        ~Post.deliveries.any(PostDelivery.status.in_(('deferred', 'unconfirmed')))
+    )
+    missed_posts = dict(db.session.query(Post.id, Post.user_id).filter(missed_filter))
+    if not missed_posts:
+        return
+    post_ids = list(missed_posts)
     
-    try:
-        scheduler.add_job(
-            func=execute_scheduled_post,
-            trigger=DateTrigger(run_date=scheduled_time),
-            args=[post_id],
-            id=job_id,
-            replace_existing=True
-        )
-        logger.info(f"Post {post_id} scheduled for {scheduled_time}")
-        return job_id
-    except Exception as error:
-        logger.error(f"Failed to schedule post {post_id}: {str(error)}")
-        raise
+    error_message = 'Missed scheduled time while the scheduler was offline'
+    Post.query.filter(Post.id.in_(post_ids), missed_filter).update({
+        Post.status: 'failed',
+        Post.error_message: error_message
+    }, synchronize_session=False)
+    PostDelivery.query.filter(PostDelivery.post_id.in_(post_ids), PostDelivery.status.in_(OPEN_DELIVERY_STATUSES)).update({
+        PostDelivery.status: 'failed',
+        PostDelivery.error_message: error_message
+    }, synchronize_session=False)
+    db.session.commit()
+    for user_id in set(missed_posts.values()):
+        invalidate_dashboard_cache(user_id)
+    logger.warning(f"Marked {len(post_ids)} scheduled posts as missed")
 
-def cancel_scheduled_post(post_id):
-    job_id = f"post_{post_id}"
-    try:
-        scheduler.remove_job(job_id)
+def dispatch_due_posts(app):
+    with app.app_context():
+        try:
+            for user_id in set(expire_publishing_leases().values()):
+                invalidate_dashboard_cache(user_id)
+            
+            free_slots = get_free_slots()
+            if free_slots <= 0:
+                return
+            
+            claim_token, post_ids = claim_due_posts(free_slots)
+            if not post_ids:
+                return
+            batch = load_scheduled_batch(post_ids, claim_token)
+        except Exception as error:
+            db.session.rollback()
+            logger.error(f"Failed to dispatch due posts: {str(error)}")
+            return
+    
+    with in_flight_lock:
+        in_flight_posts.update(batch)
+    for post_id, entry in batch.items():
+        scheduler_executor.submit(run_scheduled_post, app, post_id, entry)
+    logger.info(f"Dispatched {len(batch)} scheduled posts")
+
+def cancel_scheduled_post(post_id, user_id):
+    cancelled = Post.query.filter_by(id=post_id, user_id=user_id, status='scheduled').update(
+        {Post.status: 'cancelled'}, synchronize_session=False
+    )
+    if cancelled:
+        PostDelivery.query.filter(
+            PostDelivery.post_id == post_id,
+            PostDelivery.status.in_(OPEN_DELIVERY_STATUSES)
+        ).update({PostDelivery.status: 'cancelled'}, synchronize_session=False)
         logger.info(f"Cancelled scheduled post {post_id}")
-        return True
-    except Exception as error:
-        logger.warning(f"Failed to cancel scheduled post {post_id}: {str(error)}")
-        return False
+    else:
+        logger.warning(f"Post {post_id} could not be cancelled because it is no longer scheduled")
+    db.session.commit()
+    return cancelled == 1
 
-def start_scheduler():
-    try:
-        scheduler.start()
-        logger.info("Scheduler started successfully")
-        atexit.register(lambda: scheduler.shutdown())
-    except Exception as error:
-        logger.error(f"Failed to start scheduler: {str(error)}")
-        raise
-    
\ No newline at end of file
+def start_scheduler(app):
+    with scheduler_lock:
+        if scheduler.running:
+            return
+        
+        if Config.PUBLISH_LEASE_SECONDS <= Config.PUBLISH_PLATFORM_TIMEOUT_SECONDS:
+            logger.warning(f"PUBLISH_LEASE_SECONDS ({Config.PUBLISH_LEASE_SECONDS}) should exceed "
+                           f"PUBLISH_PLATFORM_TIMEOUT_SECONDS ({Config.PUBLISH_PLATFORM_TIMEOUT_SECONDS}), "
+                           f"slow platforms will lose their lease before reporting back")
+        try:
+            with app.app_context():
+                mark_posts_missed()
+            
+            scheduler.add_job(
+                func=dispatch_due_posts,
+                trigger=IntervalTrigger(seconds=Config.SCHEDULER_POLL_INTERVAL_SECONDS),
+                args=[app],
+                id=DISPATCH_JOB_ID,
+                replace_existing=True
+            )
+            scheduler.start()
+            logger.info(f"Scheduler started, polling for due posts every {Config.SCHEDULER_POLL_INTERVAL_SECONDS}s")
+            atexit.register(lambda: scheduler.shutdown())
+            atexit.register(lambda: scheduler_executor.shutdown(wait=False))
+        except Exception as error:
+            logger.error(f"Failed to start scheduler: {str(error)}")
+            raise
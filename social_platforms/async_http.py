@@ -0,0 +1,116 @@
+import asyncio
+import atexit
+import json
+import threading
+import aiohttp
+from config import Config
+from logger_config import get_logger
+from .rate_limiter import observe_platform_response
+from .http_clients import ADAPTER_RETRY_METHODS, create_retry_policy
+
+logger = get_logger('async_http')
+
+async_sessions = {}
+loop_lock = threading.Lock()
+shared_loop = None
+
+class AsyncPlatformResponse:
+    def __init__(self, status_code, headers, body):
+        self.status_code = status_code
+        self.headers = headers
+        self.body = body
+    
+    @property
+    def text(self):
+        return self.body.decode('utf-8', errors='replace')
+    
+    def json(self):
+        return json.loads(self.body or b'{}')
+
+def get_shared_loop():
+    global shared_loop
+    if shared_loop:
+        return shared_loop
+    
+    with loop_lock:
+        if shared_loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name='async_publish_loop', daemon=True).start()
+            shared_loop = loop
+            atexit.register(shutdown_shared_loop)
+            logger.info("Started shared asyncio publishing loop")
+        return shared_loop
+
+def submit_coroutine(coroutine):
+    return asyncio.run_coroutine_threadsafe(coroutine, get_shared_loop())
+
+def run_coroutine(coroutine, timeout=None):
+    return submit_coroutine(coroutine).result(timeout)
+
+def create_async_session(platform, request_class=aiohttp.ClientRequest):
+    connector = aiohttp.TCPConnector(
+        limit=Config.ASYNC_HTTP_CONNECTION_LIMIT,
+        limit_per_host=Config.ASYNC_HTTP_CONNECTION_LIMIT
+    )
+    timeout = aiohttp.ClientTimeout(
+        total=None,
+        sock_connect=Config.HTTP_TIMEOUT_SECONDS,
+        sock_read=Config.HTTP_TIMEOUT_SECONDS
+    )
+    return aiohttp.ClientSession(connector=connector, timeout=timeout, request_class=request_class)
+
+def get_async_session(platform):
+    session = async_sessions.get(platform)
+    if session is None or session.closed:
+        session = create_async_session(platform)
+        async_sessions[platform] = session
+        logger.info(f"Created async HTTP session for {platform}")
+    return session
+
+def get_retry_delay(retry_policy, attempt, response=None):
+    retry_after = response.headers.get('Retry-After') if response is not None else None
+    if retry_after and retry_policy.respect_retry_after_header:
+        return retry_policy.parse_retry_after(retry_after)
+    if attempt <= 1:
+        return 0
+    return min(retry_policy.backoff_max, retry_policy.backoff_factor * 2 ** (attempt - 1))
+
+async def send_platform_request(platform, method, url, **kwargs):
+    async with get_async_session(platform).request(method, url, **kwargs) as response:
+        body = await response.read()
+        observe_platform_response(platform, str(response.url), response.status, response.headers)
+        return AsyncPlatformResponse(response.status, response.headers, body)
+
+async def platform_request(platform, method, url, **kwargs):
+    retry_policy = create_retry_policy()
+    retryable_method = method.upper() in ADAPTER_RETRY_METHODS
+    
+    for attempt in range(1, retry_policy.total + 2):
+        final_attempt = attempt > retry_policy.total or not retryable_method
+        try:
+            response = await send_platform_request(platform, method, url, **kwargs)
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as error:
+            if final_attempt:
+                raise
+            logger.warning(f"{platform} {method} request failed: {str(error)}, retrying (attempt {attempt})")
+            await asyncio.sleep(get_retry_delay(retry_policy, attempt))
+            continue
+        
+        if final_attempt or not retry_policy.is_retry(method, response.status_code, 'Retry-After' in response.headers):
+            return response
+        logger.warning(f"{platform} {method} request returned {response.status_code}, retrying (attempt {attempt})")
+        await asyncio.sleep(get_retry_delay(retry_policy, attempt, response))
+
+async def close_async_sessions():
+    for session in list(async_sessions.values()):
+        await session.close()
+    async_sessions.clear()
+
+def shutdown_shared_loop():
+    global shared_loop
+    with loop_lock:
+        if shared_loop is None:
+            return
+        run_coroutine(close_async_sessions(), timeout=Config.HTTP_TIMEOUT_SECONDS)
+        shared_loop.call_soon_threadsafe(shared_loop.stop)
+        shared_loop = None
\ No newline at end of file
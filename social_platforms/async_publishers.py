@@ -0,0 +1,313 @@
+import asyncio
+import mimetypes
+import os
+from urllib.parse import urlencode
+import aiohttp
+from oauthlib.oauth1 import Client as OAuth1Client
+from config import Config
+from error_handlers import with_ai_error_handling
+from logger_config import get_logger
+from .errors import PlatformAPIError, RateLimitError
+from .async_http import platform_request
+from .identity_cache import get_cached_identity, store_identity
+from .media_cache import hash_media_file, get_cached_media_id, store_cached_media_id, invalidate_cached_media
+from .media_upload import iter_file_chunks, get_twitter_chunk_size, run_with_upload_retries_async
+from .linkedin_publisher import (
+    LINKEDIN_API_URL, create_linkedin_session, create_register_upload_payload, create_post_payload,
+    add_image_to_post_payload, validate_post_creation, parse_user_profile, parse_register_upload,
+    parse_image_upload, parse_post_submission
+)
+from .facebook_publisher import (
+    GRAPH_API_URL, PHOTO_UPLOAD_FIELDS, parse_user_pages, select_default_page_id, parse_photo_upload,
+    build_post_data, parse_post_creation
+)
+from .instagram_publisher import (
+    BUSINESS_ACCOUNT_PARAMS, parse_business_account, build_media_data, parse_media_creation, parse_media_publish
+)
+
+logger = get_logger('async_publishers')
+
+TWITTER_TWEETS_URL = 'https://api.twitter.com/2/tweets'
+TWITTER_UPLOAD_URL = 'https://upload.twitter.com/1.1/media/upload.json'
+FORM_CONTENT_TYPE = 'application/x-www-form-urlencoded'
+
+def call_in_app_context(app, func, *args):
+    if app is None:
+        return func(*args)
+    with app.app_context():
+        return func(*args)
+
+async def run_blocking(app, func, *args):
+    return await asyncio.to_thread(call_in_app_context, app, func, *args)
+
+async def resolve_identity_async(app, platform, access_token, identity_type, resolver):
+    cached_value = await run_blocking(app, get_cached_identity, access_token, identity_type)
+    if cached_value:
+        logger.info(f"Using cached {identity_type} for {platform}")
+        return cached_value
+    
+    identity_value = await resolver()
+    if identity_value:
+        await run_blocking(app, store_identity, platform, access_token, identity_type, str(identity_value))
+    return identity_value
+
+async def upload_media_once_async(app, platform, access_token, file_path, upload):
+    if app is None:
+        return await upload(), False
+    
+    content_hash = await asyncio.to_thread(hash_media_file, file_path)
+    cached_media_id = await run_blocking(app, get_cached_media_id, platform, access_token, content_hash)
+    if cached_media_id:
+        logger.info(f"Reusing cached {platform} media {cached_media_id}")
+        return cached_media_id, True
+    
+    media_id = await upload()
+    if media_id:
+        await run_blocking(app, store_cached_media_id, platform, access_token, content_hash, media_id)
+    return media_id, False
+
+async def get_linkedin_person_id_async(access_token):
+    response = await platform_request(
+        'LinkedIn', 'GET', f'{LINKEDIN_API_URL}/userinfo', headers=create_linkedin_session(access_token)
+    )
+    return parse_user_profile(response)
+
+async def put_file_async(platform, upload_url, file_path):
+    async def send_file():
+        with open(file_path, 'rb') as upload_file:
+            return await platform_request(platform, 'PUT', upload_url, data=upload_file)
+    return await run_with_upload_retries_async(send_file, f"Streaming upload of {os.path.basename(file_path)}")
+
+async def upload_image_to_linkedin_async(access_token, user_id, image_path):
+    try:
+        register_response = await platform_request(
+            'LinkedIn', 'POST', f'{LINKEDIN_API_URL}/assets?action=registerUpload',
+            headers=create_linkedin_session(access_token), json=create_register_upload_payload(user_id)
+        )
+        upload_url, asset_id = parse_register_upload(register_response)
+        if not upload_url:
+            return None
+        
+        upload_response = await put_file_async('LinkedIn', upload_url, image_path)
+        return parse_image_upload(upload_response, asset_id)
+    except RateLimitError:
+        raise
+    except Exception as error:
+        logger.error(f"Image upload error: {str(error)}")
+        return None
+
+@with_ai_error_handling('linkedin_post_creation')
+async def create_linkedin_post_async(app, access_token, content, image_path=None):
+    user_id = await resolve_identity_async(
+        app, 'LinkedIn', access_token, 'person_id', lambda: get_linkedin_person_id_async(access_token)
+    )
+    if not user_id:
+        raise Exception("Failed to get LinkedIn user profile")
+    
+    payload = create_post_payload(user_id, content)
+    media_from_cache = False
+    
+    if image_path:
+        asset_id, media_from_cache = await upload_media_once_async(
+            app, 'LinkedIn', access_token, image_path,
+            lambda: upload_image_to_linkedin_async(access_token, user_id, image_path)
+        )
+        if asset_id:
+            payload = add_image_to_post_payload(payload, asset_id)
+        else:
+            logger.warning("Image upload failed, posting without image")
+    
+    response = await platform_request(
+        'LinkedIn', 'POST', f'{LINKEDIN_API_URL}/ugcPosts',
+        headers=create_linkedin_session(access_token), json=payload
+    )
+    if media_from_cache and 400 <= response.status_code < 500:
+        logger.warning(f"LinkedIn rejected cached asset ({response.status_code}), uploading image again")
+        await run_blocking(app, invalidate_cached_media, 'LinkedIn', access_token, image_path)
+        return await create_linkedin_post_async(app, access_token, content, image_path)
+    
+    return validate_post_creation(*parse_post_submission(response))
+
+async def get_default_page_id_async(access_token):
+    response = await platform_request(
+        'Facebook', 'GET', f'{GRAPH_API_URL}/me/accounts', params={'access_token': access_token}
+    )
+    return select_default_page_id(parse_user_pages(response))
+
+async def post_multipart_file_async(platform, upload_url, params, fields, file_field, file_path):
+    async def send_form():
+        with open(file_path, 'rb') as upload_file:
+            form = aiohttp.FormData(fields)
+            form.add_field(
+                file_field, upload_file, filename=os.path.basename(file_path),
+                content_type=mimetypes.guess_type(file_path)[0] or 'application/octet-stream'
+            )
+            return await platform_request(platform, 'POST', upload_url, params=params, data=form)
+    return await run_with_upload_retries_async(send_form, f"Multipart upload of {os.path.basename(file_path)}")
+
+async def upload_image_to_facebook_async(access_token, page_id, image_path):
+    response = await post_multipart_file_async(
+        'Facebook', f'{GRAPH_API_URL}/{page_id}/photos', {'access_token': access_token},
+        PHOTO_UPLOAD_FIELDS, 'source', image_path
+    )
+    return parse_photo_upload(response)
+
+@with_ai_error_handling('facebook_post_creation')
+async def create_facebook_post_async(app, access_token, content, image_path=None, page_id=None):
+    if not page_id:
+        page_id = await resolve_identity_async(
+            app, 'Facebook', access_token, 'page_id', lambda: get_default_page_id_async(access_token)
+        )
+    
+    photo_id = None
+    media_from_cache = False
+    
+    if image_path:
+        photo_id, media_from_cache = await upload_media_once_async(
+            app, 'Facebook', access_token, image_path,
+            lambda: upload_image_to_facebook_async(access_token, page_id, image_path)
+        )
+    
+    response = await platform_request(
+        'Facebook', 'POST', f'{GRAPH_API_URL}/{page_id}/feed',
+        params={'access_token': access_token}, data=build_post_data(content, photo_id)
+    )
+    
+    if media_from_cache and 400 <= response.status_code < 500:
+        logger.warning(f"Facebook rejected cached photo ({response.status_code}), uploading image again")
+        await run_blocking(app, invalidate_cached_media, 'Facebook', access_token, image_path)
+        return await create_facebook_post_async(app, access_token, content, image_path, page_id)
+    
+    return parse_post_creation(response)
+
+async def get_instagram_business_account_async(access_token):
+    response = await platform_request(
+        'Instagram', 'GET', f'{GRAPH_API_URL}/me/accounts',
+        params={'access_token': access_token, **BUSINESS_ACCOUNT_PARAMS}
+    )
+    return parse_business_account(response)
+
+@with_ai_error_handling('instagram_post_creation')
+async def create_instagram_post_async(app, access_token, content, image_url):
+    ig_account_id = await resolve_identity_async(
+        app, 'Instagram', access_token, 'business_account_id',
+        lambda: get_instagram_business_account_async(access_token)
+    )
+    
+    creation_response = await platform_request(
+        'Instagram', 'POST', f'{GRAPH_API_URL}/{ig_account_id}/media',
+        params={'access_token': access_token}, data=build_media_data(image_url, content)
+    )
+    creation_id = parse_media_creation(creation_response)
+    
+    publish_response = await platform_request(
+        'Instagram', 'POST', f'{GRAPH_API_URL}/{ig_account_id}/media_publish',
+        params={'access_token': access_token}, data={'creation_id': creation_id}
+    )
+    media_id = parse_media_publish(publish_response)
+    
+    logger.info(f"Instagram post created successfully: {media_id}")
+    return media_id
+
+def sign_twitter_request(method, url, body=None, content_type=None):
+    client = OAuth1Client(
+        Config.TWITTER_API_KEY,
+        client_secret=Config.TWITTER_API_SECRET,
+        resource_owner_key=Config.TWITTER_ACCESS_TOKEN,
+        resource_owner_secret=Config.TWITTER_ACCESS_TOKEN_SECRET
+    )
+    headers = {'Content-Type': content_type} if content_type else {}
+    _, signed_headers, _ = client.sign(url, http_method=method, body=body, headers=headers)
+    return signed_headers
+
+async def twitter_upload_request(method, params=None, form=None):
+    if method == 'GET':
+        url = f'{TWITTER_UPLOAD_URL}?{urlencode(params)}'
+        response = await platform_request('Twitter', 'GET', url, headers=sign_twitter_request('GET', url))
+    elif form is not None:
+        response = await platform_request(
+            'Twitter', 'POST', TWITTER_UPLOAD_URL, headers=sign_twitter_request('POST', TWITTER_UPLOAD_URL), data=form
+        )
+    else:
+        body = urlencode(params)
+        response = await platform_request(
+            'Twitter', 'POST', TWITTER_UPLOAD_URL,
+            headers=sign_twitter_request('POST', TWITTER_UPLOAD_URL, body, FORM_CONTENT_TYPE), data=body
+        )
+    
+    if response.status_code >= 400:
+        logger.error(f"Twitter media upload failed: {response.status_code} - {response.text}")
+        raise PlatformAPIError('Twitter', response.status_code, f"Twitter media upload failed: {response.status_code}")
+    return response.json() if response.body else {}
+
+async def wait_for_twitter_processing_async(media):
+    while media.get('processing_info', {}).get('state') in ('pending', 'in_progress'):
+        await asyncio.sleep(media['processing_info'].get('check_after_secs', 1))
+        media = await twitter_upload_request('GET', {'command': 'STATUS', 'media_id': media['media_id_string']})
+    
+    if media.get('processing_info', {}).get('state') == 'failed':
+        raise Exception(f"Twitter media processing failed: {media['processing_info'].get('error')}")
+    return media
+
+async def append_twitter_chunk_async(media_id, segment_index, chunk, filename):
+    form = aiohttp.FormData()
+    form.add_field('command', 'APPEND')
+    form.add_field('media_id', media_id)
+    form.add_field('segment_index', str(segment_index))
+    form.add_field('media', chunk, filename=filename)
+    return await twitter_upload_request('POST', form=form)
+
+async def upload_image_to_twitter_async(image_path):
+    filename = os.path.basename(image_path)
+    total_bytes = os.path.getsize(image_path)
+    
+    media = await run_with_upload_retries_async(lambda: twitter_upload_request('POST', {
+        'command': 'INIT',
+        'total_bytes': total_bytes,
+        'media_type': mimetypes.guess_type(image_path)[0] or 'application/octet-stream',
+        'media_category': 'tweet_image'
+    }), f"Twitter upload INIT for {filename}")
+    media_id = media['media_id_string']
+    
+    for segment_index, chunk in enumerate(iter_file_chunks(image_path, get_twitter_chunk_size(total_bytes))):
+        await run_with_upload_retries_async(
+            lambda: append_twitter_chunk_async(media_id, segment_index, chunk, filename),
+            f"Twitter upload APPEND segment {segment_index} for {filename}"
+        )
+    
+    media = await run_with_upload_retries_async(
+        lambda: twitter_upload_request('POST', {'command': 'FINALIZE', 'media_id': media_id}),
+        f"Twitter upload FINALIZE for {filename}"
+    )
+    media = await wait_for_twitter_processing_async(media)
+    logger.info(f"Image uploaded to Twitter: {media_id}")
+    return media_id
+
+@with_ai_error_handling('twitter_post_creation')
+async def create_twitter_post_async(app, content, image_path=None):
+    payload = {'text': content}
+    media_from_cache = False
+    if image_path:
+        media_id, media_from_cache = await upload_media_once_async(
+            app, 'Twitter', Config.TWITTER_ACCESS_TOKEN, image_path,
+            lambda: upload_image_to_twitter_async(image_path)
+        )
+        payload['media'] = {'media_ids': [str(media_id)]}
+    
+    response = await platform_request(
+        'Twitter', 'POST', TWITTER_TWEETS_URL,
+        headers=sign_twitter_request('POST', TWITTER_TWEETS_URL, content_type='application/json'), json=payload
+    )
+    
+    if media_from_cache and response.status_code == 400:
+        logger.warning("Twitter rejected cached media, uploading image again")
+        await run_blocking(app, invalidate_cached_media, 'Twitter', Config.TWITTER_ACCESS_TOKEN, image_path)
+        return await create_twitter_post_async(app, content, image_path)
+    
+    if response.status_code == 201:
+        tweet_id = response.json()['data']['id']
+        logger.info(f"Twitter post created successfully: {tweet_id}")
+        return tweet_id
+    
+    logger.error(f"Failed to create Twitter post: {response.status_code} - {response.text}")
+    raise PlatformAPIError('Twitter', response.status_code, f"Twitter posting failed: {response.status_code}")
\ No newline at end of file
@@ -0,0 +1,91 @@
+import threading
+import time
+from config import Config
+from logger_config import get_logger
+from .errors import CircuitOpenError
+
+logger = get_logger('circuit_breaker')
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+breakers = {}
+breakers_lock = threading.Lock()
+
+class CircuitBreaker:
+    def __init__(self, platform, account_key=None):
+        self.platform = platform
+        self.account_key = account_key
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.probe_in_flight = False
+        self.lock = threading.Lock()
+    
+    def get_retry_in(self, now):
+        return max(0.0, self.opened_at + Config.CIRCUIT_RECOVERY_SECONDS - now)
+    
+    def before_call(self):
+        with self.lock:
+            now = time.monotonic()
+            if self.state == OPEN:
+                retry_in = self.get_retry_in(now)
+                if retry_in > 0:
+                    raise CircuitOpenError(self.platform, retry_in)
+                self.state = HALF_OPEN
+                logger.info(f"{self.platform} circuit half-open, sending a probe")
+            
+            if self.state == HALF_OPEN:
+                if self.probe_in_flight:
+                    raise CircuitOpenError(self.platform, Config.CIRCUIT_PROBE_WAIT_SECONDS)
+                self.probe_in_flight = True
+    
+    def record_success(self):
+        with self.lock:
+            if self.state != CLOSED:
+                logger.info(f"{self.platform} circuit closed after a successful call")
+            self.state = CLOSED
+            self.consecutive_failures = 0
+            self.probe_in_flight = False
+    
+    def record_failure(self):
+        with self.lock:
+            self.consecutive_failures += 1
+            self.probe_in_flight = False
+            if self.state == HALF_OPEN or self.consecutive_failures >= Config.CIRCUIT_FAILURE_THRESHOLD:
+                if self.state != OPEN:
+                    logger.warning(f"{self.platform} circuit opened after {self.consecutive_failures} consecutive failures")
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+    
+    def release_probe(self):
+        with self.lock:
+            self.probe_in_flight = False
+    
+    def describe(self):
+        with self.lock:
+            now = time.monotonic()
+            return {
+                'platform': self.platform,
+                'account_key': self.account_key,
+                'state': self.state,
+                'consecutive_failures': self.consecutive_failures,
+                'retry_in_seconds': int(self.get_retry_in(now)) if self.state == OPEN else 0
+            }
+
+def get_circuit_breaker(platform, account_key=None):
+    key = (platform, account_key if Config.CIRCUIT_BREAKER_PER_ACCOUNT else None)
+    breaker = breakers.get(key)
+    if breaker:
+        return breaker
+    
+    with breakers_lock:
+        if key not in breakers:
+            breakers[key] = CircuitBreaker(*key)
+        return breakers[key]
+
+def get_circuit_states():
+    with breakers_lock:
+        current_breakers = list(breakers.values())
+    return [breaker.describe() for breaker in current_breakers]
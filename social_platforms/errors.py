@@ -0,0 +1,33 @@
+class PublishDeferredError(Exception):
+    def __init__(self, platform, retry_after, message):
+        self.platform = platform
+        self.retry_after = max(float(retry_after), 1.0)
+        super().__init__(message)
+
+class RateLimitError(PublishDeferredError):
+    def __init__(self, platform, endpoint, retry_after):
+        self.endpoint = endpoint
+        retry_after = max(float(retry_after), 1.0)
+        super().__init__(platform, retry_after, f"{platform} {endpoint} rate limited, retry in {int(retry_after)}s")
+
+class CircuitOpenError(PublishDeferredError):
+    def __init__(self, platform, retry_after):
+        retry_after = max(float(retry_after), 1.0)
+        super().__init__(platform, retry_after, f"{platform} circuit is open, retry in {int(retry_after)}s")
+
+class PlatformAPIError(Exception):
+    def __init__(self, platform, status_code, message):
+        self.platform = platform
+        self.status_code = status_code
+        super().__init__(message)
+
+def iter_error_chain(error):
+    while error is not None:
+        yield error
+        error = error.__cause__ or error.__context__
+
+def find_deferred_error(error):
+    for cause in iter_error_chain(error):
+        if isinstance(cause, PublishDeferredError):
+            return cause
+    return None
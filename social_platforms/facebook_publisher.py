@@ -1,19 +1,21 @@
-import requests
 from config import Config
 from error_handlers import with_ai_error_handling
 from logger_config import get_logger
+from .errors import PlatformAPIError
+from .identity_cache import resolve_identity
+from .http_clients import bind_platform_session, get_platform_session
+from .media_upload import stream_multipart_file
+from .media_cache import upload_media_once, invalidate_cached_media
 
 logger = get_logger('facebook_publisher')
 
+GRAPH_API_URL = 'https://graph.facebook.com/v18.0'
+PHOTO_UPLOAD_FIELDS = {'published': 'false'}
+
 def create_facebook_session(access_token):
-    session = requests.Session()
-    session.params.update({'access_token': access_token})
-    return session
+    return bind_platform_session('Facebook', params={'access_token': access_token})
 
-def get_user_pages(session):
-    pages_url = 'https://graph.facebook.com/v18.0/me/accounts'
-    response = session.get(pages_url)
-    
+def parse_user_pages(response):
     if response.status_code == 200:
         pages_data = response.json()
         pages = pages_data.get('data', [])
@@ -21,54 +23,90 @@ def get_user_pages(session):
         return pages
     else:
         logger.error(f"Failed to get Facebook pages: {response.status_code}")
-        raise Exception(f"Facebook API error: {response.status_code}")
+        raise PlatformAPIError('Facebook', response.status_code, f"Facebook API error: {response.status_code}")
+
+def select_default_page_id(pages):
+    if pages:
+        return pages[0]['id']
+    raise Exception("No Facebook pages found")
+
+def get_user_pages(session):
+    return parse_user_pages(session.get(f'{GRAPH_API_URL}/me/accounts'))
+
+def get_default_page_id(session):
+    return select_default_page_id(get_user_pages(session))
+
+def parse_photo_upload(response):
+    if response.status_code == 200:
+        upload_data = response.json()
+        photo_id = upload_data.get('id')
+        logger.info(f"Image uploaded to Facebook: {photo_id}")
+        return photo_id
+    else:
+        logger.error(f"Failed to upload image to Facebook: {response.status_code}")
+        raise PlatformAPIError('Facebook', response.status_code, f"Facebook image upload failed: {response.status_code}")
 
 def upload_image_to_facebook(session, page_id, image_path):
-    upload_url = f'https://graph.facebook.com/v18.0/{page_id}/photos'
+    upload_url = f'{GRAPH_API_URL}/{page_id}/photos'
     
-    with open(image_path, 'rb') as image_file:
-        files = {'source': image_file}
-        data = {'published': 'false'}
-        
-        response = session.post(upload_url, files=files, data=data)
-        
-        if response.status_code == 200:
-            upload_data = response.json()
-            photo_id = upload_data.get('id')
-            logger.info(f"Image uploaded to Facebook: {photo_id}")
-            return photo_id
-        else:
-            logger.error(f"Failed to upload image to Facebook: {response.status_code}")
-            raise Exception(f"Facebook image upload failed: {response.status_code}")
+    response = stream_multipart_file(session, upload_url, PHOTO_UPLOAD_FIELDS, 'source', image_path)
+    return parse_photo_upload(response)
+
+def build_post_data(content, photo_id=None):
+    post_data = {'message': content}
+    if photo_id:
+        post_data['object_attachment'] = photo_id
+    return post_data
+
+def parse_post_creation(response):
+    if response.status_code == 200:
+        post_response = response.json()
+        post_id = post_response.get('id')
+        logger.info(f"Facebook post created successfully: {post_id}")
+        return post_id
+    else:
+        logger.error(f"Failed to create Facebook post: {response.status_code}")
+        raise PlatformAPIError('Facebook', response.status_code, f"Facebook posting failed: {response.status_code}")
 
 @with_ai_error_handling('facebook_post_creation')
 def create_facebook_post(access_token, content, image_path=None, page_id=None):
     session = create_facebook_session(access_token)
     
     if not page_id:
-        pages = get_user_pages(session)
-        if pages:
-            page_id = pages[0]['id']
-        else:
-            raise Exception("No Facebook pages found")
+        page_id = resolve_identity('Facebook', access_token, 'page_id', lambda: get_default_page_id(session))
     
-    post_url = f'https://graph.facebook.com/v18.0/{page_id}/feed'
-    post_data = {'message': content}
+    post_url = f'{GRAPH_API_URL}/{page_id}/feed'
+    photo_id = None
+    media_from_cache = False
     
     if image_path:
-        photo_id = upload_image_to_facebook(session, page_id, image_path)
-        post_data['object_attachment'] = photo_id
+        photo_id, media_from_cache = upload_media_once(
+            'Facebook', access_token, image_path,
+            lambda: upload_image_to_facebook(session, page_id, image_path)
+        )
     
-    response = session.post(post_url, data=post_data)
+    response = session.post(post_url, data=build_post_data(content, photo_id))
     
-    if response.status_code == 200:
-        post_response = response.json()
-        post_id = post_response.get('id')
-        logger.info(f"Facebook post created successfully: {post_id}")
-        return post_id
-    else:
-        logger.error(f"Failed to create Facebook post: {response.status_code}")
-        raise Exception(f"Facebook posting failed: {response.status_code}")
+    if media_from_cache and 400 <= response.status_code < 500:
+        logger.warning(f"Facebook rejected cached photo ({response.status_code}), uploading image again")
+        invalidate_cached_media('Facebook', access_token, image_path)
+        return create_facebook_post(access_token, content, image_path, page_id)
+    
+    return parse_post_creation(response)
+
+def find_recent_facebook_post(access_token, content):
+    session = create_facebook_session(access_token)
+    page_id = resolve_identity('Facebook', access_token, 'page_id', lambda: get_default_page_id(session))
+    
+    response = session.get(f'{GRAPH_API_URL}/{page_id}/feed', params={'fields': 'id,message', 'limit': 10})
+    if response.status_code != 200:
+        raise PlatformAPIError('Facebook', response.status_code, f"Facebook feed lookup failed: {response.status_code}")
+    
+    for post in response.json().get('data', []):
+        if post.get('message') == content:
+            logger.info(f"Found existing Facebook post: {post['id']}")
+            return post['id']
+    return None
 
 def get_facebook_auth_url():
     facebook_auth_url = "https://www.facebook.com/v18.0/dialog/oauth"
@@ -83,7 +121,7 @@ def get_facebook_auth_url():
     return auth_url
 
 def exchange_code_for_token(code):
-    token_url = 'https://graph.facebook.com/v18.0/oauth/access_token'
+    token_url = f'{GRAPH_API_URL}/oauth/access_token'
     
     token_params = {
         'client_id': Config.FACEBOOK_APP_ID,
@@ -92,7 +130,7 @@ def exchange_code_for_token(code):
         'code': code
     }
     
-    response = requests.get(token_url, params=token_params)
+    response = get_platform_session('Facebook').get(token_url, params=token_params)
     if response.status_code == 200:
         token_data = response.json()
         access_token = token_data.get('access_token')
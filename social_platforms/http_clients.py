@@ -0,0 +1,107 @@
+import atexit
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from config import Config
+from logger_config import get_logger
+from .rate_limiter import create_rate_limit_hook
+
+logger = get_logger('http_clients')
+
+RETRY_STATUSES = (500, 502, 503, 504)
+
+ADAPTER_RETRY_METHODS = frozenset(['GET', 'HEAD', 'OPTIONS', 'DELETE'])
+
+platform_sessions = {}
+shared_clients = {}
+registry_lock = threading.Lock()
+
+class TimeoutHTTPAdapter(HTTPAdapter):
+    def __init__(self, timeout=None, *args, **kwargs):
+        self.timeout = timeout
+        super().__init__(*args, **kwargs)
+    
+    def send(self, request, **kwargs):
+        if kwargs.get('timeout') is None:
+            kwargs['timeout'] = self.timeout
+        return super().send(request, **kwargs)
+
+class PlatformSession:
+    def __init__(self, session, params=None, headers=None):
+        self.session = session
+        self.params = params or {}
+        self.headers = headers or {}
+    
+    def request(self, method, url, **kwargs):
+        kwargs['params'] = {**self.params, **(kwargs.get('params') or {})}
+        kwargs['headers'] = {**self.headers, **(kwargs.get('headers') or {})}
+        return self.session.request(method, url, **kwargs)
+    
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+    
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+    
+    def put(self, url, **kwargs):
+        return self.request('PUT', url, **kwargs)
+
+def create_retry_policy():
+    return Retry(
+        total=Config.HTTP_MAX_RETRIES,
+        backoff_factor=Config.HTTP_RETRY_BACKOFF,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=ADAPTER_RETRY_METHODS,
+        respect_retry_after_header=False,
+        raise_on_status=False
+    )
+
+def create_platform_adapter(adapter_class=TimeoutHTTPAdapter):
+    return adapter_class(
+        timeout=Config.HTTP_TIMEOUT_SECONDS,
+        pool_connections=Config.HTTP_POOL_CONNECTIONS,
+        pool_maxsize=Config.HTTP_POOL_MAXSIZE,
+        max_retries=create_retry_policy()
+    )
+
+def mount_platform_adapter(session, platform):
+    adapter = create_platform_adapter()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.hooks['response'].append(create_rate_limit_hook(platform))
+    return session
+
+def get_platform_session(platform):
+    session = platform_sessions.get(platform)
+    if session:
+        return session
+    
+    with registry_lock:
+        if platform not in platform_sessions:
+            platform_sessions[platform] = mount_platform_adapter(requests.Session(), platform)
+            logger.info(f"Created pooled HTTP session for {platform}")
+        return platform_sessions[platform]
+
+def bind_platform_session(platform, params=None, headers=None):
+    return PlatformSession(get_platform_session(platform), params=params, headers=headers)
+
+def get_shared_client(name, factory):
+    client = shared_clients.get(name)
+    if client:
+        return client
+    
+    with registry_lock:
+        if name not in shared_clients:
+            shared_clients[name] = factory()
+            logger.info(f"Created shared API client: {name}")
+        return shared_clients[name]
+
+def close_platform_sessions():
+    with registry_lock:
+        for session in platform_sessions.values():
+            session.close()
+        platform_sessions.clear()
+        shared_clients.clear()
+
+atexit.register(close_platform_sessions)
\ No newline at end of file
@@ -0,0 +1,80 @@
+import hashlib
+from datetime import datetime, timedelta
+from flask import has_app_context
+from sqlalchemy.exc import IntegrityError
+from config import Config
+from models import PlatformIdentity, db
+from logger_config import get_logger
+
+logger = get_logger('identity_cache')
+
+def get_token_fingerprint(access_token):
+    return hashlib.sha256(access_token.encode('utf-8')).hexdigest()
+
+def get_cached_identity(access_token, identity_type):
+    if not has_app_context():
+        return None
+    
+    fingerprint = get_token_fingerprint(access_token)
+    identity = PlatformIdentity.query.filter_by(
+        token_fingerprint=fingerprint,
+        identity_type=identity_type
+    ).first()
+    
+    if not identity:
+        return None
+    
+    expires_at = identity.resolved_at + timedelta(hours=Config.IDENTITY_CACHE_TTL_HOURS)
+    if expires_at < datetime.utcnow():
+        logger.info(f"Cached {identity_type} for {identity.platform} expired")
+        return None
+    
+    return identity.identity_value
+
+def store_identity(platform, access_token, identity_type, identity_value):
+    if not has_app_context():
+        return
+    
+    fingerprint = get_token_fingerprint(access_token)
+    try:
+        identity = PlatformIdentity.query.filter_by(
+            token_fingerprint=fingerprint,
+            identity_type=identity_type
+        ).first()
+        
+        if identity:
+            identity.identity_value = identity_value
+            identity.resolved_at = datetime.utcnow()
+        else:
+            db.session.add(PlatformIdentity(
+                platform=platform,
+                token_fingerprint=fingerprint,
+                identity_type=identity_type,
+                identity_value=identity_value
+            ))
+        db.session.commit()
+        logger.info(f"Cached {identity_type} for {platform}")
+    except IntegrityError:
+        db.session.rollback()
+        logger.info(f"{identity_type} for {platform} was cached concurrently")
+
+def resolve_identity(platform, access_token, identity_type, resolver):
+    cached_value = get_cached_identity(access_token, identity_type)
+    if cached_value:
+        logger.info(f"Using cached {identity_type} for {platform}")
+        return cached_value
+    
+    identity_value = resolver()
+    if identity_value:
+        store_identity(platform, access_token, identity_type, str(identity_value))
+    return identity_value
+
+def invalidate_token_identities(access_token):
+    if not access_token:
+        return 0
+    
+    removed = PlatformIdentity.query.filter_by(
+        token_fingerprint=get_token_fingerprint(access_token)
+    ).delete(synchronize_session=False)
+    logger.info(f"Invalidated {removed} cached identities for replaced token")
+    return removed
@@ -1,45 +1,41 @@
-import requests
 from config import Config
 from error_handlers import with_ai_error_handling
 from logger_config import get_logger
+from .errors import PlatformAPIError
+from .identity_cache import resolve_identity
+from .http_clients import bind_platform_session
+from .facebook_publisher import GRAPH_API_URL
 
 logger = get_logger('instagram_publisher')
 
+BUSINESS_ACCOUNT_PARAMS = {'fields': 'id,instagram_business_account'}
+
 def create_instagram_session(access_token):
-    session = requests.Session()
-    session.params.update({'access_token': access_token})
-    return session
+    return bind_platform_session('Instagram', params={'access_token': access_token})
 
-def get_instagram_business_account(session):
-    accounts_url = 'https://graph.facebook.com/v18.0/me/accounts'
-    response = session.get(accounts_url)
-    
+def parse_business_account(response):
     if response.status_code == 200:
         accounts_data = response.json()
         for account in accounts_data.get('data', []):
-            page_id = account['id']
-            instagram_url = f'https://graph.facebook.com/v18.0/{page_id}?fields=instagram_business_account'
-            ig_response = session.get(instagram_url)
-            
-            if ig_response.status_code == 200:
-                ig_data = ig_response.json()
-                if 'instagram_business_account' in ig_data:
-                    ig_account_id = ig_data['instagram_business_account']['id']
-                    logger.info(f"Found Instagram business account: {ig_account_id}")
-                    return ig_account_id
+            if 'instagram_business_account' in account:
+                ig_account_id = account['instagram_business_account']['id']
+                logger.info(f"Found Instagram business account: {ig_account_id}")
+                return ig_account_id
     
     raise Exception("No Instagram business account found")
 
-def upload_image_to_instagram(session, ig_account_id, image_url, caption):
-    create_url = f'https://graph.facebook.com/v18.0/{ig_account_id}/media'
-    
-    create_data = {
+def get_instagram_business_account(session):
+    accounts_url = f'{GRAPH_API_URL}/me/accounts'
+    response = session.get(accounts_url, params=BUSINESS_ACCOUNT_PARAMS)
+    return parse_business_account(response)
+
+def build_media_data(image_url, caption):
+    return {
         'image_url': image_url,
         'caption': caption
     }
-    
-    response = session.post(create_url, data=create_data)
-    
+
+def parse_media_creation(response):
     if response.status_code == 200:
         creation_data = response.json()
         creation_id = creation_data.get('id')
@@ -47,14 +43,15 @@ def upload_image_to_instagram(session, ig_account_id, image_url, caption):
         return creation_id
     else:
         logger.error(f"Failed to create Instagram media: {response.status_code}")
-        raise Exception(f"Instagram media creation failed: {response.status_code}")
+        raise PlatformAPIError('Instagram', response.status_code, f"Instagram media creation failed: {response.status_code}")
 
-def publish_instagram_media(session, ig_account_id, creation_id):
-    publish_url = f'https://graph.facebook.com/v18.0/{ig_account_id}/media_publish'
-    
-    publish_data = {'creation_id': creation_id}
-    response = session.post(publish_url, data=publish_data)
+def upload_image_to_instagram(session, ig_account_id, image_url, caption):
+    create_url = f'{GRAPH_API_URL}/{ig_account_id}/media'
     
+    response = session.post(create_url, data=build_media_data(image_url, caption))
+    return parse_media_creation(response)
+
+def parse_media_publish(response):
     if response.status_code == 200:
         publish_data = response.json()
         media_id = publish_data.get('id')
@@ -62,15 +59,35 @@ def publish_instagram_media(session, ig_account_id, creation_id):
         return media_id
     else:
         logger.error(f"Failed to publish Instagram media: {response.status_code}")
-        raise Exception(f"Instagram publishing failed: {response.status_code}")
+        raise PlatformAPIError('Instagram', response.status_code, f"Instagram publishing failed: {response.status_code}")
+
+def publish_instagram_media(session, ig_account_id, creation_id):
+    publish_url = f'{GRAPH_API_URL}/{ig_account_id}/media_publish'
+    
+    response = session.post(publish_url, data={'creation_id': creation_id})
+    return parse_media_publish(response)
 
 @with_ai_error_handling('instagram_post_creation')
 def create_instagram_post(access_token, content, image_url):
     session = create_instagram_session(access_token)
-    ig_account_id = get_instagram_business_account(session)
+    ig_account_id = resolve_identity('Instagram', access_token, 'business_account_id', lambda: get_instagram_business_account(session))
     
     creation_id = upload_image_to_instagram(session, ig_account_id, image_url, content)
     media_id = publish_instagram_media(session, ig_account_id, creation_id)
     
     logger.info(f"Instagram post created successfully: {media_id}")
-    return media_id
\ No newline at end of file
+    return media_id
+
+def find_recent_instagram_post(access_token, content):
+    session = create_instagram_session(access_token)
+    ig_account_id = resolve_identity('Instagram', access_token, 'business_account_id', lambda: get_instagram_business_account(session))
+    
+    response = session.get(f'{GRAPH_API_URL}/{ig_account_id}/media', params={'fields': 'id,caption', 'limit': 10})
+    if response.status_code != 200:
+        raise PlatformAPIError('Instagram', response.status_code, f"Instagram media lookup failed: {response.status_code}")
+    
+    for media in response.json().get('data', []):
+        if media.get('caption') == content:
+            logger.info(f"Found existing Instagram post: {media['id']}")
+            return media['id']
+    return None
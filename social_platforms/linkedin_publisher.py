@@ -1,11 +1,17 @@
-import requests
 from urllib.parse import urlencode
 from config import Config
 from error_handlers import with_ai_error_handling
 from logger_config import get_logger
+from .errors import RateLimitError, PlatformAPIError
+from .identity_cache import resolve_identity
+from .http_clients import get_platform_session
+from .media_upload import stream_put_file
+from .media_cache import upload_media_once, invalidate_cached_media
 
 logger = get_logger('linkedin_publisher')
 
+LINKEDIN_API_URL = 'https://api.linkedin.com/v2'
+
 def get_linkedin_credentials():
     client_id = Config.LINKEDIN_CLIENT_ID
     client_secret = Config.LINKEDIN_CLIENT_SECRET
@@ -21,10 +27,7 @@ def create_linkedin_session(access_token):
     }
     return headers
 
-def get_user_profile_v2(access_token):
-    headers = create_linkedin_session(access_token)
-    response = requests.get('https://api.linkedin.com/v2/userinfo', headers=headers)
-    
+def parse_user_profile(response):
     logger.info(f"Profile API Response Status: {response.status_code}")
     
     if response.status_code == 200:
@@ -40,40 +43,56 @@ def get_user_profile_v2(access_token):
         logger.error(f"Profile API failed: {response.status_code} - {response.text}")
         return None
 
+def get_user_profile_v2(access_token):
+    headers = create_linkedin_session(access_token)
+    response = get_platform_session('LinkedIn').get(f'{LINKEDIN_API_URL}/userinfo', headers=headers)
+    return parse_user_profile(response)
+
+def create_register_upload_payload(user_id):
+    return {
+        "registerUploadRequest": {
+            "recipes": ["urn:li:digitalmediaRecipe:feedshare-image"],
+            "owner": f"urn:li:person:{user_id}",
+            "serviceRelationships": [{
+                "relationshipType": "OWNER",
+                "identifier": "urn:li:userGeneratedContent"
+            }]
+        }
+    }
+
+def parse_register_upload(response):
+    if response.status_code != 200:
+        logger.error(f"Image register failed: {response.status_code} - {response.text}")
+        return None, None
+    
+    upload_data = response.json()
+    upload_url = upload_data['value']['uploadMechanism']['com.linkedin.digitalmedia.uploading.MediaUploadHttpRequest']['uploadUrl']
+    return upload_url, upload_data['value']['asset']
+
+def parse_image_upload(response, asset_id):
+    if response.status_code != 201:
+        logger.error(f"Image upload failed: {response.status_code}")
+        return None
+    
+    logger.info(f"Image uploaded successfully: {asset_id}")
+    return asset_id
+
 def upload_image_to_linkedin_v2(access_token, user_id, image_path):
     try:
         headers = create_linkedin_session(access_token)
-        register_url = 'https://api.linkedin.com/v2/assets?action=registerUpload'
-        
-        register_payload = {
-            "registerUploadRequest": {
-                "recipes": ["urn:li:digitalmediaRecipe:feedshare-image"],
-                "owner": f"urn:li:person:{user_id}",
-                "serviceRelationships": [{
-                    "relationshipType": "OWNER",
-                    "identifier": "urn:li:userGeneratedContent"
-                }]
-            }
-        }
+        register_url = f'{LINKEDIN_API_URL}/assets?action=registerUpload'
         
-        register_response = requests.post(register_url, headers=headers, json=register_payload)
+        register_payload = create_register_upload_payload(user_id)
+        register_response = get_platform_session('LinkedIn').post(register_url, headers=headers, json=register_payload)
         
-        if register_response.status_code != 200:
-            logger.error(f"Image register failed: {register_response.status_code} - {register_response.text}")
+        upload_url, asset_id = parse_register_upload(register_response)
+        if not upload_url:
             return None
         
-        upload_data = register_response.json()
-        upload_url = upload_data['value']['uploadMechanism']['com.linkedin.digitalmedia.uploading.MediaUploadHttpRequest']['uploadUrl']
-        asset_id = upload_data['value']['asset']
-        
-        with open(image_path, 'rb') as image_file:
-            upload_response = requests.put(upload_url, data=image_file)
-            if upload_response.status_code != 201:
-                logger.error(f"Image upload failed: {upload_response.status_code}")
-                return None
-        
-        logger.info(f"Image uploaded successfully: {asset_id}")
-        return asset_id
+        upload_response = stream_put_file(get_platform_session('LinkedIn'), upload_url, image_path)
+        return parse_image_upload(upload_response, asset_id)
+    except RateLimitError:
+        raise
     except Exception as error:
         logger.error(f"Image upload error: {str(error)}")
         return None
@@ -102,10 +121,16 @@ def add_image_to_post_payload(payload, asset_id):
     }]
     return payload
 
+def parse_post_submission(response):
+    try:
+        return response.json(), response.status_code
+    except ValueError:
+        return {}, response.status_code
+
 def submit_post_to_linkedin(access_token, payload):
     headers = create_linkedin_session(access_token)
-    response = requests.post('https://api.linkedin.com/v2/ugcPosts', headers=headers, json=payload)
-    return response.json(), response.status_code
+    response = get_platform_session('LinkedIn').post(f'{LINKEDIN_API_URL}/ugcPosts', headers=headers, json=payload)
+    return parse_post_submission(response)
 
 def validate_post_creation(result, status_code):
     if status_code == 201 and 'id' in result:
@@ -114,25 +139,34 @@ def validate_post_creation(result, status_code):
         return post_id
     else:
         logger.error(f"Post creation failed: Status {status_code}, Response: {result}")
-        raise Exception(f"LinkedIn posting failed: {status_code}")
+        raise PlatformAPIError('LinkedIn', status_code, f"LinkedIn posting failed: {status_code}")
 
 @with_ai_error_handling('linkedin_post_creation')
 def create_linkedin_post(access_token, content, image_path=None):
-    user_id = get_user_profile_v2(access_token)
+    user_id = resolve_identity('LinkedIn', access_token, 'person_id', lambda: get_user_profile_v2(access_token))
     
     if not user_id:
         raise Exception("Failed to get LinkedIn user profile")
     
     payload = create_post_payload(user_id, content)
+    media_from_cache = False
     
     if image_path:
-        asset_id = upload_image_to_linkedin_v2(access_token, user_id, image_path)
+        asset_id, media_from_cache = upload_media_once(
+            'LinkedIn', access_token, image_path,
+            lambda: upload_image_to_linkedin_v2(access_token, user_id, image_path)
+        )
         if asset_id:
             payload = add_image_to_post_payload(payload, asset_id)
         else:
             logger.warning("Image upload failed, posting without image")
     
     result, status_code = submit_post_to_linkedin(access_token, payload)
+    if media_from_cache and 400 <= status_code < 500:
+        logger.warning(f"LinkedIn rejected cached asset ({status_code}), uploading image again")
+        invalidate_cached_media('LinkedIn', access_token, image_path)
+        return create_linkedin_post(access_token, content, image_path)
+    
     post_id = validate_post_creation(result, status_code)
     return post_id
 
@@ -159,7 +193,7 @@ def exchange_code_for_token(code):
         'client_secret': client_secret
     }
     
-    response = requests.post('https://www.linkedin.com/oauth/v2/accessToken', data=token_payload)
+    response = get_platform_session('LinkedIn').post('https://www.linkedin.com/oauth/v2/accessToken', data=token_payload)
     
     if response.status_code == 200:
         token_data = response.json()
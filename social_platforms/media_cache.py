@@ -0,0 +1,82 @@
+import hashlib
+from datetime import datetime, timedelta
+from flask import has_app_context
+from sqlalchemy.exc import IntegrityError
+from config import Config
+from models import MediaUpload, db
+from logger_config import get_logger
+from .identity_cache import get_token_fingerprint
+
+logger = get_logger('media_cache')
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+def hash_media_file(file_path):
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as media_file:
+        for chunk in iter(lambda: media_file.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def find_cached_upload(platform, access_token, content_hash):
+    return MediaUpload.query.filter_by(
+        platform=platform,
+        account_fingerprint=get_token_fingerprint(access_token),
+        content_hash=content_hash
+    ).first()
+
+def get_cached_media_id(platform, access_token, content_hash):
+    cached_upload = find_cached_upload(platform, access_token, content_hash)
+    if cached_upload and cached_upload.expires_at > datetime.utcnow():
+        return cached_upload.remote_id
+    return None
+
+def store_cached_media_id(platform, access_token, content_hash, remote_id):
+    ttl_seconds = Config.MEDIA_CACHE_TTL_SECONDS.get(platform, 3600)
+    expires_at = datetime.utcnow() + timedelta(seconds=ttl_seconds)
+    
+    try:
+        cached_upload = find_cached_upload(platform, access_token, content_hash)
+        if cached_upload:
+            cached_upload.remote_id = remote_id
+            cached_upload.uploaded_at = datetime.utcnow()
+            cached_upload.expires_at = expires_at
+        else:
+            db.session.add(MediaUpload(
+                platform=platform,
+                account_fingerprint=get_token_fingerprint(access_token),
+                content_hash=content_hash,
+                remote_id=str(remote_id),
+                expires_at=expires_at
+            ))
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        logger.info(f"{platform} media upload was cached concurrently")
+
+def invalidate_cached_media(platform, access_token, file_path):
+    if not has_app_context():
+        return
+    
+    MediaUpload.query.filter_by(
+        platform=platform,
+        account_fingerprint=get_token_fingerprint(access_token),
+        content_hash=hash_media_file(file_path)
+    ).delete(synchronize_session=False)
+    db.session.commit()
+    logger.info(f"Invalidated cached {platform} media for {file_path}")
+
+def upload_media_once(platform, access_token, file_path, upload):
+    if not has_app_context():
+        return upload(), False
+    
+    content_hash = hash_media_file(file_path)
+    cached_media_id = get_cached_media_id(platform, access_token, content_hash)
+    if cached_media_id:
+        logger.info(f"Reusing cached {platform} media {cached_media_id}")
+        return cached_media_id, True
+    
+    media_id = upload()
+    if media_id:
+        store_cached_media_id(platform, access_token, content_hash, media_id)
+    return media_id, False
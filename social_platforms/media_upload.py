@@ -0,0 +1,234 @@
+import asyncio
+import math
+import mimetypes
+import mmap
+import os
+import time
+import uuid
+import aiohttp
+import requests
+import tweepy
+from config import Config
+from logger_config import get_logger
+from .errors import PlatformAPIError
+
+logger = get_logger('media_upload')
+
+TWITTER_MAX_CHUNK_SIZE = 5 * 1024 * 1024
+TWITTER_MAX_SEGMENTS = 1000
+TRANSIENT_UPLOAD_ERRORS = (
+    requests.ConnectionError, requests.Timeout, tweepy.errors.TwitterServerError,
+    aiohttp.ClientConnectionError, asyncio.TimeoutError
+)
+
+class ProgressFileReader:
+    def __init__(self, file_path, progress_callback=None):
+        self.file = open(file_path, 'rb')
+        self.total = os.path.getsize(file_path)
+        self.progress_callback = progress_callback
+    
+    def __len__(self):
+        return self.total
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def read(self, size=-1):
+        data = self.file.read(size)
+        if self.progress_callback and data:
+            self.progress_callback(self.file.tell(), self.total)
+        return data
+    
+    def tell(self):
+        return self.file.tell()
+    
+    def seek(self, offset, whence=os.SEEK_SET):
+        return self.file.seek(offset, whence)
+    
+    def close(self):
+        self.file.close()
+
+class StreamingMultipartBody:
+    def __init__(self, fields, file_field, file_path, progress_callback=None):
+        boundary = uuid.uuid4().hex
+        filename = os.path.basename(file_path)
+        file_type = mimetypes.guess_type(file_path)[0] or 'application/octet-stream'
+        
+        preamble = ''.join(
+            f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'
+            for name, value in fields.items()
+        )
+        preamble += (
+            f'--{boundary}\r\nContent-Disposition: form-data; name="{file_field}"; filename="{filename}"\r\n'
+            f'Content-Type: {file_type}\r\n\r\n'
+        )
+        
+        self.content_type = f'multipart/form-data; boundary={boundary}'
+        self.preamble = preamble.encode('utf-8')
+        self.epilogue = f'\r\n--{boundary}--\r\n'.encode('utf-8')
+        self.reader = ProgressFileReader(file_path, progress_callback)
+        self.total = len(self.preamble) + len(self.reader) + len(self.epilogue)
+        self.position = 0
+    
+    def __len__(self):
+        return self.total
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def read(self, size=-1):
+        if size is None or size < 0:
+            size = self.total - self.position
+        
+        parts = []
+        while size > 0 and self.position < self.total:
+            data = self.read_segment(size)
+            parts.append(data)
+            size -= len(data)
+            self.position += len(data)
+        return b''.join(parts)
+    
+    def read_segment(self, size):
+        file_start = len(self.preamble)
+        file_end = file_start + len(self.reader)
+        
+        if self.position < file_start:
+            return self.preamble[self.position:min(file_start, self.position + size)]
+        if self.position < file_end:
+            return self.reader.read(min(size, file_end - self.position))
+        offset = self.position - file_end
+        return self.epilogue[offset:offset + size]
+    
+    def tell(self):
+        return self.position
+    
+    def seek(self, offset, whence=os.SEEK_SET):
+        if whence == os.SEEK_CUR:
+            offset += self.position
+        elif whence == os.SEEK_END:
+            offset += self.total
+        
+        self.position = max(0, min(offset, self.total))
+        file_start = len(self.preamble)
+        self.reader.seek(max(0, min(self.position - file_start, len(self.reader))))
+        return self.position
+    
+    def close(self):
+        self.reader.close()
+
+def create_progress_logger(label):
+    reported = {'step': -1}
+    
+    def report_progress(sent_bytes, total_bytes):
+        step = (sent_bytes * 4) // max(total_bytes, 1)
+        if step != reported['step']:
+            reported['step'] = step
+            logger.info(f"{label}: uploaded {sent_bytes}/{total_bytes} bytes")
+    return report_progress
+
+def iter_file_chunks(file_path, chunk_size):
+    if os.path.getsize(file_path) == 0:
+        return
+    
+    with open(file_path, 'rb') as media_file:
+        with mmap.mmap(media_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped_file:
+            for offset in range(0, len(mapped_file), chunk_size):
+                yield mapped_file[offset:offset + chunk_size]
+
+def is_transient_upload_error(error):
+    if isinstance(error, TRANSIENT_UPLOAD_ERRORS):
+        return True
+    if isinstance(error, PlatformAPIError):
+        return error.status_code >= 500
+    return isinstance(error, tweepy.errors.TweepyException) and isinstance(error.__cause__, TRANSIENT_UPLOAD_ERRORS)
+
+def run_with_upload_retries(operation, description):
+    max_attempts = Config.MEDIA_UPLOAD_MAX_ATTEMPTS
+    
+    for attempt in range(1, max_attempts + 1):
+        try:
+            result = operation()
+            if getattr(result, 'status_code', 0) < 500 or attempt == max_attempts:
+                return result
+            logger.warning(f"{description} failed with status {result.status_code} (attempt {attempt}/{max_attempts})")
+        except Exception as error:
+            if not is_transient_upload_error(error) or attempt == max_attempts:
+                raise
+            logger.warning(f"{description} failed: {str(error)} (attempt {attempt}/{max_attempts})")
+        time.sleep(Config.MEDIA_UPLOAD_RETRY_DELAY_SECONDS * attempt)
+
+async def run_with_upload_retries_async(operation, description):
+    max_attempts = Config.MEDIA_UPLOAD_MAX_ATTEMPTS
+    
+    for attempt in range(1, max_attempts + 1):
+        try:
+            result = await operation()
+            if getattr(result, 'status_code', 0) < 500 or attempt == max_attempts:
+                return result
+            logger.warning(f"{description} failed with status {result.status_code} (attempt {attempt}/{max_attempts})")
+        except Exception as error:
+            if not is_transient_upload_error(error) or attempt == max_attempts:
+                raise
+            logger.warning(f"{description} failed: {str(error)} (attempt {attempt}/{max_attempts})")
+        await asyncio.sleep(Config.MEDIA_UPLOAD_RETRY_DELAY_SECONDS * attempt)
+
+def stream_put_file(session, upload_url, file_path, headers=None):
+    progress_callback = create_progress_logger(f"PUT {os.path.basename(file_path)}")
+    
+    def send_file():
+        with ProgressFileReader(file_path, progress_callback) as reader:
+            return session.put(upload_url, data=reader, headers=headers)
+    return run_with_upload_retries(send_file, f"Streaming upload of {os.path.basename(file_path)}")
+
+def stream_multipart_file(session, upload_url, fields, file_field, file_path):
+    progress_callback = create_progress_logger(f"POST {os.path.basename(file_path)}")
+    
+    def send_form():
+        with StreamingMultipartBody(fields, file_field, file_path, progress_callback) as body:
+            return session.post(upload_url, data=body, headers={'Content-Type': body.content_type})
+    return run_with_upload_retries(send_form, f"Multipart upload of {os.path.basename(file_path)}")
+
+def get_twitter_chunk_size(total_bytes):
+    minimum_chunk_size = math.ceil(total_bytes / TWITTER_MAX_SEGMENTS)
+    return max(min(Config.MEDIA_UPLOAD_CHUNK_SIZE, TWITTER_MAX_CHUNK_SIZE), minimum_chunk_size, 1)
+
+def wait_for_twitter_processing(api, media):
+    while hasattr(media, 'processing_info') and media.processing_info['state'] in ('pending', 'in_progress'):
+        time.sleep(media.processing_info.get('check_after_secs', 1))
+        media = api.get_media_upload_status(media.media_id)
+    
+    if hasattr(media, 'processing_info') and media.processing_info['state'] == 'failed':
+        raise Exception(f"Twitter media processing failed: {media.processing_info.get('error')}")
+    return media
+
+def upload_twitter_media_chunked(api, file_path, media_category='tweet_image'):
+    filename = os.path.basename(file_path)
+    total_bytes = os.path.getsize(file_path)
+    media_type = mimetypes.guess_type(file_path)[0] or 'application/octet-stream'
+    progress_callback = create_progress_logger(f"Twitter chunked upload {filename}")
+    
+    media_id = run_with_upload_retries(
+        lambda: api.chunked_upload_init(total_bytes, media_type, media_category=media_category),
+        f"Twitter upload INIT for {filename}"
+    ).media_id
+    
+    sent_bytes = 0
+    for segment_index, chunk in enumerate(iter_file_chunks(file_path, get_twitter_chunk_size(total_bytes))):
+        run_with_upload_retries(
+            lambda: api.chunked_upload_append(media_id, (filename, chunk), segment_index),
+            f"Twitter upload APPEND segment {segment_index} for {filename}"
+        )
+        sent_bytes += len(chunk)
+        progress_callback(sent_bytes, total_bytes)
+    
+    media = run_with_upload_retries(
+        lambda: api.chunked_upload_finalize(media_id),
+        f"Twitter upload FINALIZE for {filename}"
+    )
+    return wait_for_twitter_processing(api, media).media_id
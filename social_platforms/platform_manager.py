@@ -1,20 +1,43 @@
 import os
-from config import get_upload_folder
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from flask import current_app, has_app_context
+from config import Config, get_upload_folder
 from error_handlers import with_ai_error_handling
 from logger_config import get_logger
+from image_renditions import get_rendition_path
+from .errors import find_deferred_error
+from .rate_limiter import rate_limit_scope, get_account_key
+from .circuit_breaker import get_circuit_breaker
+from .retry_policy import classify_publish_error, is_platform_response_error
 from .linkedin_publisher import create_linkedin_post
-from .twitter_publisher import create_twitter_post
-from .facebook_publisher import create_facebook_post
-from .instagram_publisher import create_instagram_post
+from .twitter_publisher import create_twitter_post, find_recent_twitter_post
+from .facebook_publisher import create_facebook_post, find_recent_facebook_post
+from .instagram_publisher import create_instagram_post, find_recent_instagram_post
+from .async_http import submit_coroutine, run_coroutine
+from .async_publishers import (
+    run_blocking, create_linkedin_post_async, create_twitter_post_async,
+    create_facebook_post_async, create_instagram_post_async
+)
 
 logger = get_logger('platform_manager')
 
-def get_local_image_path(image_url):
+PUBLISH_TIMEOUT_POLL_SECONDS = 1
+
+publish_executor = ThreadPoolExecutor(max_workers=Config.PUBLISH_MAX_WORKERS, thread_name_prefix='platform_publish')
+
+def get_local_image_path(image_url, platform=None):
     if image_url.startswith('/static/generated_images/'):
         filename = image_url.split('/')[-1]
         upload_folder = get_upload_folder()
         local_path = os.path.join(upload_folder, filename)
         
+        if platform:
+            rendition_path = get_rendition_path(local_path, platform)
+            if os.path.exists(rendition_path):
+                logger.info(f"Using {platform} rendition: {rendition_path}")
+                return rendition_path
+        
         if os.path.exists(local_path):
             logger.info(f"Found local image: {local_path}")
             return local_path
@@ -22,6 +45,12 @@ def get_local_image_path(image_url):
     logger.warning(f"Local image not found for URL: {image_url}")
     return None
 
+def get_platform_image_url(image_url, platform):
+    local_path = get_local_image_path(image_url, platform)
+    if local_path and image_url.startswith('/static/generated_images/'):
+        return f"/static/generated_images/{os.path.basename(local_path)}"
+    return image_url
+
 def get_full_image_url(image_url, base_url='http://localhost:5000'):
     if image_url.startswith('/static/'):
         full_url = f"{base_url}{image_url}"
@@ -29,8 +58,31 @@ def get_full_image_url(image_url, base_url='http://localhost:5000'):
         return full_url
     return image_url
 
+def record_breaker_outcome(breaker, error):
+    if find_deferred_error(error):
+        breaker.release_probe()
+        return
+    
+    retryable, _ = classify_publish_error(error)
+    if retryable:
+        breaker.record_failure()
+    elif is_platform_response_error(error):
+        breaker.record_success()
+    else:
+        breaker.release_probe()
+
+def use_async_backend():
+    return Config.PUBLISH_BACKEND == 'asyncio'
+
+def get_account_token(platform, access_token):
+    return Config.TWITTER_ACCESS_TOKEN if platform == 'Twitter' else access_token
+
 @with_ai_error_handling('platform_posting')
-def post_to_platform(platform, access_token, content, image_url=None):
+def post_to_platform(platform, access_token, content, image_url=None, reconcile=False):
+    if use_async_backend():
+        app = current_app._get_current_object() if has_app_context() else None
+        return run_coroutine(post_to_platform_async(app, platform, access_token, content, image_url, reconcile))
+    
     platform_handlers = {
         'LinkedIn': post_to_linkedin,
         'Twitter': post_to_twitter,
@@ -42,29 +94,72 @@ def post_to_platform(platform, access_token, content, image_url=None):
     if not handler:
         raise Exception(f"Unsupported platform: {platform}")
     
-    logger.info(f"Posting to {platform}")
-    result = handler(access_token, content, image_url)
+    account_token = get_account_token(platform, access_token)
+    breaker = get_circuit_breaker(platform, get_account_key(account_token))
+    breaker.before_call()
+    try:
+        with rate_limit_scope(platform, account_token):
+            result = find_published_post(platform, access_token, content) if reconcile else None
+            if result:
+                logger.info(f"Earlier {platform} attempt already published {result}, not posting again")
+            else:
+                logger.info(f"Posting to {platform}")
+                result = handler(access_token, content, image_url)
+    except Exception as error:
+        record_breaker_outcome(breaker, error)
+        raise
+    breaker.record_success()
+    logger.info(f"Successfully posted to {platform}: {result}")
+    return result
+
+async def post_to_platform_async(app, platform, access_token, content, image_url=None, reconcile=False):
+    platform_handlers = {
+        'LinkedIn': post_to_linkedin_async,
+        'Twitter': post_to_twitter_async,
+        'Facebook': post_to_facebook_async,
+        'Instagram': post_to_instagram_async
+    }
+    
+    handler = platform_handlers.get(platform)
+    if not handler:
+        raise Exception(f"Unsupported platform: {platform}")
+    
+    account_token = get_account_token(platform, access_token)
+    breaker = get_circuit_breaker(platform, get_account_key(account_token))
+    breaker.before_call()
+    try:
+        with rate_limit_scope(platform, account_token):
+            result = await run_blocking(app, find_published_post, platform, access_token, content) if reconcile else None
+            if result:
+                logger.info(f"Earlier {platform} attempt already published {result}, not posting again")
+            else:
+                logger.info(f"Posting to {platform}")
+                result = await handler(app, access_token, content, image_url)
+    except Exception as error:
+        record_breaker_outcome(breaker, error)
+        raise
+    breaker.record_success()
     logger.info(f"Successfully posted to {platform}: {result}")
     return result
 
 def post_to_linkedin(access_token, content, image_url=None):
     image_path = None
     if image_url:
-        image_path = get_local_image_path(image_url)
+        image_path = get_local_image_path(image_url, 'LinkedIn')
     
     return create_linkedin_post(access_token, content, image_path)
 
 def post_to_twitter(access_token, content, image_url=None):
     image_path = None
     if image_url:
-        image_path = get_local_image_path(image_url)
+        image_path = get_local_image_path(image_url, 'Twitter')
     
     return create_twitter_post(content, image_path)
 
 def post_to_facebook(access_token, content, image_url=None):
     image_path = None
     if image_url:
-        image_path = get_local_image_path(image_url)
+        image_path = get_local_image_path(image_url, 'Facebook')
     
     return create_facebook_post(access_token, content, image_path)
 
@@ -72,9 +167,164 @@ def post_to_instagram(access_token, content, image_url=None):
     if not image_url:
         raise Exception("Instagram posts require an image")
     
-    full_image_url = get_full_image_url(image_url)
+    full_image_url = get_full_image_url(get_platform_image_url(image_url, 'Instagram'))
     return create_instagram_post(access_token, content, full_image_url)
 
+async def post_to_linkedin_async(app, access_token, content, image_url=None):
+    image_path = None
+    if image_url:
+        image_path = get_local_image_path(image_url, 'LinkedIn')
+    
+    return await create_linkedin_post_async(app, access_token, content, image_path)
+
+async def post_to_twitter_async(app, access_token, content, image_url=None):
+    image_path = None
+    if image_url:
+        image_path = get_local_image_path(image_url, 'Twitter')
+    
+    return await create_twitter_post_async(app, content, image_path)
+
+async def post_to_facebook_async(app, access_token, content, image_url=None):
+    image_path = None
+    if image_url:
+        image_path = get_local_image_path(image_url, 'Facebook')
+    
+    return await create_facebook_post_async(app, access_token, content, image_path)
+
+async def post_to_instagram_async(app, access_token, content, image_url=None):
+    if not image_url:
+        raise Exception("Instagram posts require an image")
+    
+    full_image_url = get_full_image_url(get_platform_image_url(image_url, 'Instagram'))
+    return await create_instagram_post_async(app, access_token, content, full_image_url)
+
+PLATFORM_POST_LOOKUPS = {
+    'Twitter': lambda access_token, content: find_recent_twitter_post(content),
+    'Facebook': find_recent_facebook_post,
+    'Instagram': find_recent_instagram_post
+}
+
+def find_published_post(platform, access_token, content):
+    lookup = PLATFORM_POST_LOOKUPS.get(platform)
+    if not lookup:
+        return None
+    return lookup(access_token, content)
+
+def build_publish_outcome(platform, success, result=None, error=None, elapsed=0.0, retry_after=None,
+                          retryable=False, ambiguous=False):
+    return {
+        'platform': platform,
+        'success': success,
+        'result': result,
+        'error': error,
+        'elapsed': elapsed,
+        'retry_after': retry_after,
+        'retryable': retryable,
+        'ambiguous': ambiguous
+    }
+
+def build_failure_outcome(platform, error_message, elapsed, retryable, ambiguous):
+    if ambiguous and platform not in PLATFORM_POST_LOOKUPS:
+        retryable = False
+        error_message = f"{error_message} (outcome unknown, not retried to avoid a duplicate post)"
+    return build_publish_outcome(
+        platform, False, error=error_message, elapsed=elapsed, retryable=retryable, ambiguous=ambiguous
+    )
+
+def build_error_outcome(platform, error, elapsed):
+    deferred_error = find_deferred_error(error)
+    if deferred_error:
+        logger.warning(f"Deferring {platform} publish: {str(deferred_error)}")
+        return build_publish_outcome(
+            platform, False, error=str(deferred_error), elapsed=elapsed, retry_after=deferred_error.retry_after
+        )
+    retryable, ambiguous = classify_publish_error(error)
+    logger.error(f"Failed to post to {platform} (retryable={retryable}, ambiguous={ambiguous}): {str(error)}")
+    return build_failure_outcome(platform, str(error), elapsed, retryable, ambiguous)
+
+def run_platform_publish(app, platform, access_token, content, image_url, reconcile=False, start_times=None):
+    started_at = time.monotonic()
+    if start_times is not None:
+        start_times[(platform, access_token)] = started_at
+    try:
+        if app is not None:
+            with app.app_context():
+                result = post_to_platform(platform, access_token, content, image_url, reconcile)
+        else:
+            result = post_to_platform(platform, access_token, content, image_url, reconcile)
+        return build_publish_outcome(platform, bool(result), result=result, elapsed=time.monotonic() - started_at)
+    except Exception as error:
+        return build_error_outcome(platform, error, time.monotonic() - started_at)
+
+async def run_platform_publish_async(app, platform, access_token, content, image_url, reconcile=False, start_times=None):
+    started_at = time.monotonic()
+    if start_times is not None:
+        start_times[(platform, access_token)] = started_at
+    try:
+        result = await post_to_platform_async(app, platform, access_token, content, image_url, reconcile)
+        return build_publish_outcome(platform, bool(result), result=result, elapsed=time.monotonic() - started_at)
+    except Exception as error:
+        return build_error_outcome(platform, error, time.monotonic() - started_at)
+
+def submit_platform_publish(app, platform, access_token, content, image_url, reconcile, start_times):
+    if use_async_backend():
+        return submit_coroutine(
+            run_platform_publish_async(app, platform, access_token, content, image_url, reconcile, start_times)
+        )
+    return publish_executor.submit(
+        run_platform_publish, app, platform, access_token, content, image_url, reconcile, start_times
+    )
+
+def publish_to_platforms(targets, content, image_url=None, on_result=None, reconcile_platforms=()):
+    app = current_app._get_current_object() if has_app_context() else None
+    timeout = Config.PUBLISH_PLATFORM_TIMEOUT_SECONDS
+    start_times = {}
+    
+    futures = {
+        submit_platform_publish(
+            app, platform, access_token, content, image_url, platform in reconcile_platforms, start_times
+        ): (platform, access_token)
+        for platform, access_token in targets
+    }
+    
+    submitted_at = time.monotonic()
+    outcomes = []
+    
+    def report(outcome):
+        outcomes.append(outcome)
+        if on_result:
+            on_result(outcome)
+    
+    pending = set(futures)
+    while pending:
+        done, pending = wait(pending, timeout=PUBLISH_TIMEOUT_POLL_SECONDS, return_when=FIRST_COMPLETED)
+        for future in done:
+            report(future.result())
+        
+        now = time.monotonic()
+        for future in list(pending):
+            target = futures[future]
+            platform = target[0]
+            started_at = start_times.get(target)
+            if started_at is None:
+                if now - submitted_at < timeout or not future.cancel() or target in start_times:
+                    continue
+                pending.discard(future)
+                logger.error(f"Publishing to {platform} did not start within {timeout} seconds")
+                report(build_failure_outcome(
+                    platform, f"Not started within {timeout} seconds", now - submitted_at, True, False
+                ))
+                continue
+            if now - started_at < timeout:
+                continue
+            pending.discard(future)
+            future.cancel()
+            logger.error(f"Publishing to {platform} timed out after {timeout} seconds")
+            report(build_failure_outcome(platform, f"Timed out after {timeout} seconds", now - started_at, True, True))
+    
+    logger.info(f"Fan-out publish finished for {len(outcomes)} platforms")
+    return outcomes
+
 def validate_platform_requirements(platform, content, image_url):
     if platform == 'Instagram' and not image_url:
         return False, "Instagram posts require an image"
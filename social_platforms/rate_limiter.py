@@ -0,0 +1,181 @@
+import contextlib
+import contextvars
+import json
+import threading
+import time
+from config import Config
+from logger_config import get_logger
+from .errors import RateLimitError
+from .identity_cache import get_token_fingerprint
+
+logger = get_logger('rate_limiter')
+
+PUBLISH_ENDPOINT = 'publish'
+
+PLATFORM_ENDPOINTS = {
+    'LinkedIn': [('/ugcPosts', PUBLISH_ENDPOINT), ('/assets', 'media'), ('/userinfo', 'identity')],
+    'Twitter': [('/2/tweets', PUBLISH_ENDPOINT), ('media/upload', 'media'), ('verify_credentials', 'identity')],
+    'Facebook': [('/feed', PUBLISH_ENDPOINT), ('/photos', 'media'), ('/me/accounts', 'identity')],
+    'Instagram': [('/media_publish', PUBLISH_ENDPOINT), ('/media', 'media'), ('/me/accounts', 'identity')]
+}
+
+USAGE_HEADERS = ('x-app-usage', 'x-ad-account-usage', 'x-business-use-case-usage')
+
+current_scope = contextvars.ContextVar('rate_limit_scope', default=None)
+buckets = {}
+buckets_lock = threading.Lock()
+
+class TokenBucket:
+    def __init__(self, capacity, window_seconds):
+        self.capacity = float(capacity)
+        self.refill_rate = self.capacity / window_seconds
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self.blocked_until = 0.0
+        self.lock = threading.Lock()
+    
+    def refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.refill_rate)
+        self.updated_at = now
+    
+    def get_blocked_seconds(self):
+        return max(0.0, self.blocked_until - time.monotonic())
+    
+    def try_acquire(self):
+        with self.lock:
+            now = time.monotonic()
+            self.refill(now)
+            if self.blocked_until > now:
+                return self.blocked_until - now
+            if self.tokens < 1:
+                return (1 - self.tokens) / self.refill_rate
+            self.tokens -= 1
+            return 0.0
+    
+    def sync_remaining(self, remaining, reset_in):
+        with self.lock:
+            now = time.monotonic()
+            self.refill(now)
+            self.tokens = min(self.tokens, float(remaining))
+            if remaining <= 0:
+                self.blocked_until = max(self.blocked_until, now + reset_in)
+    
+    def block_for(self, seconds):
+        with self.lock:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+def get_account_key(access_token):
+    return get_token_fingerprint(access_token or '')
+
+def get_bucket(platform, account_key, endpoint):
+    key = (platform, account_key, endpoint)
+    bucket = buckets.get(key)
+    if bucket:
+        return bucket
+    
+    with buckets_lock:
+        if key not in buckets:
+            capacity, window_seconds = Config.RATE_LIMIT_PUBLISH_WINDOWS.get(platform, (100, 3600))
+            if endpoint != PUBLISH_ENDPOINT:
+                capacity = capacity * Config.RATE_LIMIT_AUXILIARY_MULTIPLIER
+            buckets[key] = TokenBucket(capacity, window_seconds)
+        return buckets[key]
+
+def classify_endpoint(platform, url):
+    for marker, endpoint in PLATFORM_ENDPOINTS.get(platform, []):
+        if marker in url:
+            return endpoint
+    return 'other'
+
+def acquire_publish_slot(platform, account_key):
+    blocked_seconds = max(
+        [bucket.get_blocked_seconds() for (bucket_platform, bucket_account, _), bucket in list(buckets.items())
+         if bucket_platform == platform and bucket_account == account_key] or [0.0]
+    )
+    if blocked_seconds > 0:
+        raise RateLimitError(platform, PUBLISH_ENDPOINT, blocked_seconds)
+    
+    wait_seconds = get_bucket(platform, account_key, PUBLISH_ENDPOINT).try_acquire()
+    if wait_seconds > 0:
+        raise RateLimitError(platform, PUBLISH_ENDPOINT, wait_seconds)
+
+@contextlib.contextmanager
+def rate_limit_scope(platform, access_token):
+    account_key = get_account_key(access_token)
+    acquire_publish_slot(platform, account_key)
+    token = current_scope.set(account_key)
+    try:
+        yield account_key
+    finally:
+        current_scope.reset(token)
+
+def parse_header_number(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+def get_retry_after(headers):
+    retry_after = parse_header_number(headers.get('retry-after'))
+    if retry_after is not None:
+        return retry_after
+    
+    reset_at = parse_header_number(headers.get('x-rate-limit-reset'))
+    if reset_at is not None:
+        return reset_at - time.time()
+    return get_usage_block_seconds(headers)
+
+def get_usage_block_seconds(headers):
+    block_seconds = None
+    for header in USAGE_HEADERS:
+        raw_usage = headers.get(header)
+        if not raw_usage:
+            continue
+        try:
+            usage = json.loads(raw_usage)
+        except ValueError:
+            continue
+        
+        usage_entries = [usage]
+        if header == 'x-business-use-case-usage':
+            usage_entries = [entry for entries in usage.values() for entry in entries]
+        
+        for entry in usage_entries:
+            regain_minutes = entry.get('estimated_time_to_regain_access') or 0
+            peak_usage = max([value for key, value in entry.items() if key in ('call_count', 'total_time', 'total_cputime')] or [0])
+            if regain_minutes or peak_usage >= 100:
+                entry_block = regain_minutes * 60 or Config.RATE_LIMIT_DEFAULT_BACKOFF_SECONDS
+                block_seconds = max(block_seconds or 0, entry_block)
+    return block_seconds
+
+def observe_rate_limit_headers(platform, bucket, headers):
+    remaining = parse_header_number(headers.get('x-rate-limit-remaining'))
+    reset_at = parse_header_number(headers.get('x-rate-limit-reset'))
+    if remaining is not None and reset_at is not None:
+        bucket.sync_remaining(remaining, max(0.0, reset_at - time.time()))
+    
+    usage_block = get_usage_block_seconds(headers)
+    if usage_block:
+        logger.warning(f"{platform} reported exhausted usage, pausing for {int(usage_block)}s")
+        bucket.block_for(usage_block)
+
+def observe_platform_response(platform, url, status_code, headers):
+    account_key = current_scope.get()
+    if account_key is None:
+        return
+    
+    endpoint = classify_endpoint(platform, url)
+    bucket = get_bucket(platform, account_key, endpoint)
+    observe_rate_limit_headers(platform, bucket, headers)
+    
+    if status_code == 429:
+        retry_after = get_retry_after(headers) or Config.RATE_LIMIT_DEFAULT_BACKOFF_SECONDS
+        bucket.block_for(retry_after)
+        logger.warning(f"{platform} {endpoint} returned 429, deferring for {int(retry_after)}s")
+        raise RateLimitError(platform, endpoint, retry_after)
+
+def create_rate_limit_hook(platform):
+    def observe_response(response, *args, **kwargs):
+        observe_platform_response(platform, response.request.url, response.status_code, response.headers)
+        return response
+    return observe_response
@@ -0,0 +1,34 @@
+import asyncio
+import aiohttp
+import requests
+import tweepy
+from .errors import PlatformAPIError, iter_error_chain
+
+RETRYABLE_STATUS_CODES = frozenset([408, 500, 502, 503, 504])
+AMBIGUOUS_STATUS_CODES = frozenset([408, 502, 504])
+
+def classify_status_code(status_code):
+    return status_code in RETRYABLE_STATUS_CODES, status_code in AMBIGUOUS_STATUS_CODES
+
+def classify_publish_error(error):
+    for cause in iter_error_chain(error):
+        if isinstance(cause, requests.ConnectTimeout):
+            return True, False
+        if isinstance(cause, (requests.Timeout, requests.ConnectionError)):
+            return True, True
+        if isinstance(cause, aiohttp.ClientConnectorError):
+            return True, False
+        if isinstance(cause, (asyncio.TimeoutError, aiohttp.ServerTimeoutError, aiohttp.ServerDisconnectedError,
+                              aiohttp.ClientOSError, aiohttp.ClientPayloadError)):
+            return True, True
+        if isinstance(cause, PlatformAPIError) and cause.status_code:
+            return classify_status_code(cause.status_code)
+        if isinstance(cause, tweepy.errors.HTTPException):
+            return classify_status_code(cause.response.status_code)
+    return False, False
+
+def is_platform_response_error(error):
+    return any(
+        isinstance(cause, (PlatformAPIError, tweepy.errors.HTTPException))
+        for cause in iter_error_chain(error)
+    )
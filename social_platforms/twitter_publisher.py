@@ -1,42 +1,66 @@
+import html
+import re
+import unicodedata
+from datetime import datetime, timedelta, timezone
 import tweepy
 from config import Config
 from error_handlers import with_ai_error_handling
 from logger_config import get_logger
+from .http_clients import get_shared_client, mount_platform_adapter
+from .media_upload import upload_twitter_media_chunked
+from .media_cache import upload_media_once, invalidate_cached_media
 
 logger = get_logger('twitter_publisher')
 
+URL_PATTERN = re.compile(r'https?://\S+')
+
 def create_twitter_client():
     auth = tweepy.OAuthHandler(Config.TWITTER_API_KEY, Config.TWITTER_API_SECRET)
     auth.set_access_token(Config.TWITTER_ACCESS_TOKEN, Config.TWITTER_ACCESS_TOKEN_SECRET)
     
-    api = tweepy.API(auth, wait_on_rate_limit=True)
+    api = tweepy.API(auth, wait_on_rate_limit=False)
     client = tweepy.Client(
         consumer_key=Config.TWITTER_API_KEY,
         consumer_secret=Config.TWITTER_API_SECRET,
         access_token=Config.TWITTER_ACCESS_TOKEN,
         access_token_secret=Config.TWITTER_ACCESS_TOKEN_SECRET,
-        wait_on_rate_limit=True
+        wait_on_rate_limit=False
     )
+    mount_platform_adapter(api.session, 'Twitter')
+    mount_platform_adapter(client.session, 'Twitter')
     
     logger.info("Twitter client created successfully")
     return api, client
 
+def get_twitter_clients():
+    return get_shared_client('Twitter', create_twitter_client)
+
 def upload_image_to_twitter(api, image_path):
-    media = api.media_upload(image_path)
-    media_id = media.media_id
+    media_id = upload_twitter_media_chunked(api, image_path, media_category='tweet_image')
     logger.info(f"Image uploaded to Twitter: {media_id}")
     return media_id
 
 @with_ai_error_handling('twitter_post_creation')
 def create_twitter_post(content, image_path=None):
-    api, client = create_twitter_client()
+    api, client = get_twitter_clients()
     
     media_ids = None
+    media_from_cache = False
     if image_path:
-        media_id = upload_image_to_twitter(api, image_path)
+        media_id, media_from_cache = upload_media_once(
+            'Twitter', Config.TWITTER_ACCESS_TOKEN, image_path,
+            lambda: upload_image_to_twitter(api, image_path)
+        )
         media_ids = [media_id]
     
-    tweet = client.create_tweet(text=content, media_ids=media_ids)
+    try:
+        tweet = client.create_tweet(text=content, media_ids=media_ids)
+    except tweepy.errors.BadRequest:
+        if not media_from_cache:
+            raise
+        logger.warning("Twitter rejected cached media, uploading image again")
+        invalidate_cached_media('Twitter', Config.TWITTER_ACCESS_TOKEN, image_path)
+        return create_twitter_post(content, image_path)
     
     if tweet.data:
         tweet_id = tweet.data['id']
@@ -46,14 +70,22 @@ def create_twitter_post(content, image_path=None):
         logger.error("Failed to create Twitter post")
         raise Exception("Twitter posting failed")
 
-def verify_twitter_credentials():
-    try:
-        api, client = create_twitter_client()
-        user = api.verify_credentials()
-        if user:
-            logger.info(f"Twitter credentials verified for user: {user.screen_name}")
-            return True
-        return False
-    except Exception as error:
-        logger.error(f"Twitter credentials verification failed: {str(error)}")
-        return False
\ No newline at end of file
+def normalize_tweet_text(text):
+    text = unicodedata.normalize('NFC', html.unescape(text))
+    return ' '.join(URL_PATTERN.sub('', text).split())
+
+def find_recent_twitter_post(content):
+    api, client = get_twitter_clients()
+    user = client.get_me(user_auth=True)
+    start_time = datetime.now(timezone.utc) - timedelta(seconds=Config.PUBLISH_RECONCILE_WINDOW_SECONDS)
+    tweets = client.get_users_tweets(user.data.id, max_results=10, start_time=start_time,
+                                     tweet_fields=['created_at'], user_auth=True)
+    
+    expected_text = normalize_tweet_text(content)
+    for tweet in tweets.data or []:
+        if tweet.created_at and tweet.created_at < start_time:
+            continue
+        if normalize_tweet_text(tweet.text) == expected_text:
+            logger.info(f"Found existing Twitter post: {tweet.id}")
+            return tweet.id
+    return None
\ No newline at end of file
@@ -0,0 +1,24 @@
+import os
+
+os.environ['DATABASE_URL'] = 'sqlite://'
+os.environ['GENERATION_PROVIDER'] = 'fake'
+os.environ['BACKGROUND_WORKERS_ENABLED'] = 'false'
+
+import pytest
+from app import app as flask_app
+from models import db, User
+
+@pytest.fixture
+def app():
+    with flask_app.app_context():
+        db.create_all()
+        yield flask_app
+        db.session.remove()
+        db.drop_all()
+
+@pytest.fixture
+def user(app):
+    user = User(username='tester', email='tester@example.com', password_hash='not-a-real-hash')
+    db.session.add(user)
+    db.session.commit()
+    return user
@@ -0,0 +1,27 @@
+import os
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+STARTUP_CHECK = """
+import app
+from scheduler import scheduler, DISPATCH_JOB_ID
+from publish_queue import worker_threads
+app.start_background_workers()
+print(scheduler.running, scheduler.get_job(DISPATCH_JOB_ID) is not None, len(scheduler.get_jobs()), len(worker_threads))
+"""
+
+def test_importing_app_starts_the_dispatcher_once(tmp_path):
+    env = {
+        **os.environ,
+        'PYTHONPATH': REPO_ROOT,
+        'DATABASE_URL': f"sqlite:///{tmp_path / 'startup.db'}",
+        'BACKGROUND_WORKERS_ENABLED': 'true',
+        'PUBLISH_QUEUE_WORKERS': '2'
+    }
+    result = subprocess.run([sys.executable, '-c', STARTUP_CHECK], cwd=tmp_path, env=env,
+                            capture_output=True, text=True, timeout=60)
+    
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.split() == ['True', 'True', '1', '2']
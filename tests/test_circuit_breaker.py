@@ -0,0 +1,93 @@
+import pytest
+from config import Config
+from social_platforms import circuit_breaker
+from social_platforms.circuit_breaker import CircuitBreaker, CLOSED, OPEN, HALF_OPEN, get_circuit_breaker
+from social_platforms.errors import CircuitOpenError
+
+def open_breaker(breaker):
+    for _ in range(Config.CIRCUIT_FAILURE_THRESHOLD):
+        breaker.before_call()
+        breaker.record_failure()
+
+def let_recovery_elapse(breaker):
+    breaker.opened_at -= Config.CIRCUIT_RECOVERY_SECONDS
+
+def test_breaker_opens_after_consecutive_failures():
+    breaker = CircuitBreaker('Twitter')
+    for _ in range(Config.CIRCUIT_FAILURE_THRESHOLD - 1):
+        breaker.record_failure()
+    assert breaker.state == CLOSED
+    
+    breaker.record_failure()
+    
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpenError) as error:
+        breaker.before_call()
+    assert error.value.retry_after > 0
+
+def test_success_resets_the_failure_count():
+    breaker = CircuitBreaker('Twitter')
+    for _ in range(Config.CIRCUIT_FAILURE_THRESHOLD - 1):
+        breaker.record_failure()
+    
+    breaker.record_success()
+    breaker.record_failure()
+    
+    assert breaker.state == CLOSED
+    assert breaker.consecutive_failures == 1
+
+def test_half_open_allows_a_single_probe():
+    breaker = CircuitBreaker('Twitter')
+    open_breaker(breaker)
+    let_recovery_elapse(breaker)
+    
+    breaker.before_call()
+    
+    assert breaker.state == HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+def test_successful_probe_closes_the_breaker():
+    breaker = CircuitBreaker('Twitter')
+    open_breaker(breaker)
+    let_recovery_elapse(breaker)
+    
+    breaker.before_call()
+    breaker.record_success()
+    
+    assert breaker.state == CLOSED
+    breaker.before_call()
+
+def test_failed_probe_reopens_the_breaker():
+    breaker = CircuitBreaker('Twitter')
+    open_breaker(breaker)
+    let_recovery_elapse(breaker)
+    
+    breaker.before_call()
+    breaker.record_failure()
+    
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+def test_released_probe_lets_the_next_call_probe():
+    breaker = CircuitBreaker('Twitter')
+    open_breaker(breaker)
+    let_recovery_elapse(breaker)
+    
+    breaker.before_call()
+    breaker.release_probe()
+    
+    breaker.before_call()
+    assert breaker.state == HALF_OPEN
+
+@pytest.mark.parametrize('per_account, shared', [(False, True), (True, False)])
+def test_breakers_are_shared_per_platform_unless_per_account(monkeypatch, per_account, shared):
+    monkeypatch.setattr(circuit_breaker, 'breakers', {})
+    monkeypatch.setattr(Config, 'CIRCUIT_BREAKER_PER_ACCOUNT', per_account)
+    
+    first = get_circuit_breaker('Facebook', 'account-a')
+    second = get_circuit_breaker('Facebook', 'account-b')
+    
+    assert (first is second) == shared
+    assert get_circuit_breaker('Facebook', 'account-a') is first
@@ -0,0 +1,40 @@
+from datetime import datetime
+from models import Post, PostDelivery, db, backfill_post_deliveries
+
+def create_legacy_post(user, platforms, status='posted', error_message=None):
+    post = Post(user_id=user.id, content='Legacy post', platforms=platforms, status=status,
+                error_message=error_message, posted_at=datetime.utcnow() if status == 'posted' else None)
+    db.session.add(post)
+    db.session.commit()
+    return post.id
+
+def get_delivery_statuses(post_id):
+    return {delivery.platform: delivery.status for delivery in PostDelivery.query.filter_by(post_id=post_id)}
+
+def test_backfill_derives_delivery_status_from_legacy_post(user):
+    partial_id = create_legacy_post(user, 'LinkedIn,Twitter', error_message='Failed on platforms: Twitter')
+    failed_id = create_legacy_post(user, 'Facebook', status='failed', error_message='No active account found')
+    scheduled_id = create_legacy_post(user, 'Instagram', status='scheduled')
+    
+    backfill_post_deliveries()
+    
+    assert get_delivery_statuses(partial_id) == {'LinkedIn': 'posted', 'Twitter': 'failed'}
+    assert get_delivery_statuses(failed_id) == {'Facebook': 'failed'}
+    assert get_delivery_statuses(scheduled_id) == {'Instagram': 'pending'}
+
+def test_backfill_walks_every_batch_once(user):
+    post_ids = [create_legacy_post(user, 'LinkedIn') for _ in range(5)]
+    
+    backfill_post_deliveries(batch_size=2)
+    backfill_post_deliveries(batch_size=2)
+    
+    assert PostDelivery.query.count() == len(post_ids)
+
+def test_backfill_terminates_on_platform_lists_without_names(user):
+    blank_id = create_legacy_post(user, ' , ')
+    named_id = create_legacy_post(user, 'Twitter')
+    
+    backfill_post_deliveries(batch_size=1)
+    
+    assert get_delivery_statuses(blank_id) == {}
+    assert get_delivery_statuses(named_id) == {'Twitter': 'posted'}
@@ -0,0 +1,81 @@
+from datetime import datetime, timedelta
+from app import get_post_history_page, decode_history_cursor, encode_history_cursor
+from models import Post, User, db
+
+def create_posts(user, created_times):
+    posts = [Post(user_id=user.id, content=f"History post {index}", platforms='LinkedIn', created_at=created_at)
+             for index, created_at in enumerate(created_times)]
+    db.session.add_all(posts)
+    db.session.commit()
+    return [(post.created_at, post.id) for post in posts]
+
+def collect_pages(user_id, page_size):
+    cursor = None
+    pages = []
+    while True:
+        posts, cursor = get_post_history_page(user_id, cursor, page_size)
+        pages.append([post.id for post in posts])
+        if not cursor:
+            return pages
+
+def test_pages_walk_every_post_once_newest_first(user):
+    start = datetime(2024, 1, 1, 12, 0)
+    keys = create_posts(user, [start, start, start + timedelta(minutes=1), start + timedelta(minutes=1),
+                               start + timedelta(minutes=2), start - timedelta(minutes=1), start])
+    
+    pages = collect_pages(user.id, 3)
+    
+    assert [len(page) for page in pages] == [3, 3, 1]
+    assert [post_id for page in pages for post_id in page] == [post_id for _, post_id in sorted(keys, reverse=True)]
+
+def test_exact_page_size_has_no_next_cursor(user):
+    create_posts(user, [datetime(2024, 1, 1, 12, minute) for minute in range(3)])
+    
+    posts, next_cursor = get_post_history_page(user.id, page_size=3)
+    
+    assert len(posts) == 3
+    assert next_cursor is None
+
+def test_pages_only_include_the_users_posts(user):
+    other_user = User(username='other', email='other@example.com', password_hash='not-a-real-hash')
+    db.session.add(other_user)
+    db.session.commit()
+    create_posts(other_user, [datetime(2024, 1, 1)])
+    create_posts(user, [datetime(2024, 1, 2)])
+    
+    posts, _ = get_post_history_page(user.id, page_size=10)
+    
+    assert [post.user_id for post in posts] == [user.id]
+
+def test_preview_is_loaded_without_the_full_content(user):
+    user_id = user.id
+    db.session.add(Post(user_id=user_id, content='x' * 500, platforms='LinkedIn'))
+    db.session.commit()
+    db.session.expunge_all()
+    
+    [loaded_post], _ = get_post_history_page(user_id)
+    
+    assert len(loaded_post.content_preview) == 51
+    assert 'content' not in loaded_post.__dict__
+
+def test_cursor_round_trip_and_invalid_cursor(user):
+    post = Post(id=7, created_at=datetime(2024, 1, 1, 8, 30))
+    
+    assert decode_history_cursor(encode_history_cursor(post)) == (datetime(2024, 1, 1, 8, 30), 7)
+    assert decode_history_cursor('not-a-cursor') is None
+    
+    create_posts(user, [datetime(2024, 1, 1)])
+    posts, _ = get_post_history_page(user.id, 'not-a-cursor')
+    assert len(posts) == 1
+
+def test_history_endpoint_rejects_an_invalid_cursor(app, user):
+    create_posts(user, [datetime(2024, 1, 1)])
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['_user_id'] = str(user.id)
+    
+    response = client.get('/api/post_history?cursor=not-a-cursor')
+    
+    assert response.status_code == 400
+    assert 'posts' not in response.get_json()
+    assert len(client.get('/api/post_history').get_json()['posts']) == 1
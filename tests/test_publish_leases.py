@@ -0,0 +1,130 @@
+from datetime import datetime, timedelta
+from config import Config
+import publish_queue
+from models import User, Post, PostDelivery, db, renew_publishing_lease, release_publishing_claim, expire_publishing_leases
+from scheduler import claim_due_posts, mark_posts_missed
+from user_cache import store_dashboard, get_cached_dashboard
+
+def create_post(user, status='scheduled', scheduled_time=None, platforms='LinkedIn'):
+    post = Post(user_id=user.id, content='Lease test post', platforms=platforms, status=status,
+                scheduled_time=scheduled_time or datetime.now() - timedelta(minutes=1))
+    db.session.add(post)
+    db.session.add(PostDelivery(post=post, platform=platforms, status='pending'))
+    db.session.commit()
+    return post.id
+
+def load_post(post_id):
+    db.session.expire_all()
+    return db.session.get(Post, post_id)
+
+def test_claim_due_posts_only_claims_due_scheduled_posts(user):
+    due_id = create_post(user)
+    future_id = create_post(user, scheduled_time=datetime.now() + timedelta(hours=1))
+    draft_id = create_post(user, status='draft')
+    
+    claim_token, claimed_ids = claim_due_posts(10)
+    
+    assert claimed_ids == [due_id]
+    assert load_post(due_id).status == 'publishing'
+    assert load_post(due_id).claimed_by == claim_token
+    assert load_post(due_id).lease_expires_at > datetime.utcnow()
+    assert load_post(future_id).status == 'scheduled'
+    assert load_post(draft_id).status == 'draft'
+
+def test_claim_due_posts_skips_posts_claimed_by_another_worker(user):
+    create_post(user)
+    first_token, first_ids = claim_due_posts(10)
+    
+    second_token, second_ids = claim_due_posts(10)
+    
+    assert first_token and len(first_ids) == 1
+    assert second_token is None
+    assert second_ids == []
+
+def test_claim_due_posts_respects_limit(user):
+    post_ids = [create_post(user, scheduled_time=datetime.now() - timedelta(minutes=index)) for index in range(3, 0, -1)]
+    
+    _, claimed_ids = claim_due_posts(2)
+    
+    assert claimed_ids == post_ids[:2]
+
+def test_renew_and_release_require_the_current_claim(user):
+    post_id = create_post(user)
+    claim_token, _ = claim_due_posts(10)
+    
+    assert not renew_publishing_lease(post_id, 'someone-else')
+    assert not release_publishing_claim(post_id, 'someone-else', {Post.status: 'posted'})
+    assert renew_publishing_lease(post_id, claim_token, {Post.error_message: 'LinkedIn: posted'})
+    assert load_post(post_id).error_message == 'LinkedIn: posted'
+    
+    assert release_publishing_claim(post_id, claim_token, {Post.status: 'posted'}) == user.id
+    post = load_post(post_id)
+    assert post.status == 'posted'
+    assert post.claimed_by is None
+    assert post.lease_expires_at is None
+
+def test_expired_lease_fails_post_and_blocks_late_release(user):
+    post_id = create_post(user)
+    claim_token, _ = claim_due_posts(10)
+    Post.query.filter_by(id=post_id).update({Post.lease_expires_at: datetime.utcnow() - timedelta(seconds=1)})
+    db.session.commit()
+    
+    assert expire_publishing_leases() == {post_id: user.id}
+    assert not renew_publishing_lease(post_id, claim_token)
+    assert not release_publishing_claim(post_id, claim_token, {Post.status: 'posted'})
+    
+    post = load_post(post_id)
+    assert post.status == 'failed'
+    assert post.claimed_by is None
+    assert [delivery.status for delivery in post.deliveries] == ['failed']
+
+def test_expire_publishing_leases_keeps_live_leases(user):
+    post_id = create_post(user)
+    claim_token, _ = claim_due_posts(10)
+    
+    assert expire_publishing_leases() == {}
+    assert load_post(post_id).status == 'publishing'
+    assert load_post(post_id).claimed_by == claim_token
+
+def test_mark_posts_missed_skips_posts_waiting_for_a_retry(user):
+    long_ago = datetime.now() - timedelta(seconds=Config.SCHEDULER_MISFIRE_GRACE_SECONDS + 60)
+    missed_id = create_post(user, scheduled_time=long_ago)
+    deferred_id = create_post(user, scheduled_time=long_ago)
+    PostDelivery.query.filter_by(post_id=deferred_id).update({PostDelivery.status: 'deferred'})
+    db.session.commit()
+    
+    mark_posts_missed()
+    
+    assert load_post(missed_id).status == 'failed'
+    assert load_post(deferred_id).status == 'scheduled'
+
+def test_failed_queue_job_only_evicts_its_owner(app, user, monkeypatch):
+    other_user = User(username='other', email='other@example.com', password_hash='not-a-real-hash')
+    db.session.add(other_user)
+    db.session.commit()
+    post_id = create_post(user, status='queued')
+    store_dashboard(user.id, {'posts': 1})
+    store_dashboard(other_user.id, {'posts': 2})
+    
+    def fail_publish(post_id, claim_token, account_ids=None):
+        raise RuntimeError('publisher crashed')
+    monkeypatch.setattr(publish_queue, 'publish_queued_post', fail_publish)
+    
+    publish_queue.process_publish_job(app, (post_id, None))
+    
+    assert load_post(post_id).status == 'failed'
+    assert get_cached_dashboard(user.id) is None
+    assert get_cached_dashboard(other_user.id) == {'posts': 2}
+
+def test_mark_posts_missed_only_evicts_affected_users(user):
+    other_user = User(username='other', email='other@example.com', password_hash='not-a-real-hash')
+    db.session.add(other_user)
+    db.session.commit()
+    create_post(user, scheduled_time=datetime.now() - timedelta(seconds=Config.SCHEDULER_MISFIRE_GRACE_SECONDS + 60))
+    store_dashboard(user.id, {'posts': 1})
+    store_dashboard(other_user.id, {'posts': 2})
+    
+    mark_posts_missed()
+    
+    assert get_cached_dashboard(user.id) is None
+    assert get_cached_dashboard(other_user.id) == {'posts': 2}
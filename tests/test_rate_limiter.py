@@ -0,0 +1,127 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from config import Config
+from social_platforms import rate_limiter
+from social_platforms.http_clients import get_platform_session
+from social_platforms.errors import RateLimitError
+from social_platforms.rate_limiter import (TokenBucket, PUBLISH_ENDPOINT, acquire_publish_slot, classify_endpoint,
+                                          get_bucket, get_retry_after, observe_platform_response, rate_limit_scope)
+
+@pytest.fixture(autouse=True)
+def empty_buckets(monkeypatch):
+    monkeypatch.setattr(rate_limiter, 'buckets', {})
+
+def test_bucket_spends_tokens_then_reports_the_wait():
+    bucket = TokenBucket(2, 60)
+    
+    assert bucket.try_acquire() == 0.0
+    assert bucket.try_acquire() == 0.0
+    assert bucket.try_acquire() == pytest.approx(30.0, rel=0.01)
+
+def test_bucket_refills_over_time():
+    bucket = TokenBucket(2, 60)
+    bucket.try_acquire()
+    bucket.try_acquire()
+    
+    bucket.updated_at -= 30
+    
+    assert bucket.try_acquire() == 0.0
+    assert bucket.try_acquire() > 0
+
+def test_bucket_blocks_when_the_platform_reports_no_remaining_calls():
+    bucket = TokenBucket(10, 60)
+    
+    bucket.sync_remaining(0, 120)
+    
+    assert bucket.get_blocked_seconds() == pytest.approx(120, abs=1)
+    assert bucket.try_acquire() == pytest.approx(120, abs=1)
+
+def test_auxiliary_buckets_get_more_capacity():
+    publish_bucket = get_bucket('Twitter', 'account', PUBLISH_ENDPOINT)
+    media_bucket = get_bucket('Twitter', 'account', 'media')
+    
+    assert media_bucket.capacity == publish_bucket.capacity * Config.RATE_LIMIT_AUXILIARY_MULTIPLIER
+    assert get_bucket('Twitter', 'other-account', PUBLISH_ENDPOINT) is not publish_bucket
+
+@pytest.mark.parametrize('platform, url, endpoint', [
+    ('LinkedIn', 'https://api.linkedin.com/v2/ugcPosts', PUBLISH_ENDPOINT),
+    ('Twitter', 'https://upload.twitter.com/1.1/media/upload.json', 'media'),
+    ('Facebook', 'https://graph.facebook.com/v18.0/me/accounts', 'identity'),
+    ('Instagram', 'https://graph.facebook.com/v18.0/1/media_publish', PUBLISH_ENDPOINT),
+    ('Instagram', 'https://graph.facebook.com/v18.0/1/comments', 'other')
+])
+def test_classify_endpoint(platform, url, endpoint):
+    assert classify_endpoint(platform, url) == endpoint
+
+def test_acquire_publish_slot_defers_when_the_bucket_is_empty(monkeypatch):
+    monkeypatch.setitem(Config.RATE_LIMIT_PUBLISH_WINDOWS, 'Twitter', (1, 900))
+    acquire_publish_slot('Twitter', 'account')
+    
+    with pytest.raises(RateLimitError) as error:
+        acquire_publish_slot('Twitter', 'account')
+    assert error.value.retry_after == pytest.approx(900, rel=0.01)
+
+def test_acquire_publish_slot_defers_while_any_endpoint_is_blocked():
+    get_bucket('Facebook', 'account', 'media').block_for(45)
+    
+    with pytest.raises(RateLimitError) as error:
+        acquire_publish_slot('Facebook', 'account')
+    assert error.value.retry_after == pytest.approx(45, abs=1)
+
+def test_get_retry_after_reads_platform_headers():
+    usage = json.dumps({'call_count': 100, 'total_time': 10, 'total_cputime': 5})
+    
+    assert get_retry_after({'retry-after': '12'}) == 12
+    assert get_retry_after({'x-rate-limit-reset': str(time.time() + 60)}) == pytest.approx(60, abs=1)
+    assert get_retry_after({'x-app-usage': usage}) == Config.RATE_LIMIT_DEFAULT_BACKOFF_SECONDS
+    assert get_retry_after({}) is None
+
+def test_429_inside_a_scope_blocks_the_account():
+    with rate_limit_scope('LinkedIn', 'token') as account_key:
+        with pytest.raises(RateLimitError):
+            observe_platform_response('LinkedIn', 'https://api.linkedin.com/v2/assets', 429, {'retry-after': '30'})
+    
+    assert get_bucket('LinkedIn', account_key, 'media').get_blocked_seconds() == pytest.approx(30, abs=1)
+    with pytest.raises(RateLimitError):
+        acquire_publish_slot('LinkedIn', account_key)
+
+def test_responses_outside_a_scope_are_ignored():
+    observe_platform_response('LinkedIn', 'https://api.linkedin.com/v2/assets', 429, {'retry-after': '30'})
+    
+    assert rate_limiter.buckets == {}
+
+@pytest.fixture
+def rate_limited_server():
+    requests_seen = []
+    
+    class RateLimitedHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            requests_seen.append(self.path)
+            self.send_response(429)
+            self.send_header('Retry-After', '30')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+        
+        def log_message(self, *args):
+            pass
+    
+    server = ThreadingHTTPServer(('127.0.0.1', 0), RateLimitedHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}", requests_seen
+    server.shutdown()
+    server.server_close()
+
+def test_429_on_a_get_is_not_retried_by_the_adapter(rate_limited_server):
+    base_url, requests_seen = rate_limited_server
+    started_at = time.monotonic()
+    
+    with rate_limit_scope('LinkedIn', 'token'):
+        with pytest.raises(RateLimitError) as error:
+            get_platform_session('LinkedIn').get(f"{base_url}/v2/me")
+    
+    assert requests_seen == ['/v2/me']
+    assert error.value.retry_after == 30
+    assert time.monotonic() - started_at < 5
@@ -0,0 +1,215 @@
+import time
+from concurrent.futures import Future
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+import pytest
+import requests
+from config import Config
+from models import PostDelivery, Post, db, record_delivery_outcome
+from social_platforms import circuit_breaker, platform_manager, rate_limiter, twitter_publisher
+from social_platforms.errors import PlatformAPIError
+from social_platforms.platform_manager import (build_failure_outcome, build_publish_outcome, publish_to_platforms,
+                                               run_platform_publish)
+from social_platforms.rate_limiter import get_account_key
+from social_platforms.retry_policy import classify_publish_error
+
+@pytest.mark.parametrize('error, expected', [
+    (requests.ConnectTimeout(), (True, False)),
+    (requests.ReadTimeout(), (True, True)),
+    (requests.ConnectionError(), (True, True)),
+    (PlatformAPIError('Facebook', 503, 'unavailable'), (True, False)),
+    (PlatformAPIError('Facebook', 504, 'gateway timeout'), (True, True)),
+    (PlatformAPIError('Facebook', 400, 'bad request'), (False, False)),
+    (ValueError('bad content'), (False, False))
+])
+def test_classify_publish_error(error, expected):
+    assert classify_publish_error(error) == expected
+
+def test_classify_publish_error_follows_the_cause_chain():
+    try:
+        try:
+            raise requests.ReadTimeout()
+        except requests.ReadTimeout as timeout:
+            raise Exception('Twitter posting failed') from timeout
+    except Exception as error:
+        assert classify_publish_error(error) == (True, True)
+
+def test_ambiguous_failure_without_post_lookup_is_not_retried():
+    outcome = build_failure_outcome('LinkedIn', 'Timed out', 1.0, True, True)
+    
+    assert not outcome['retryable']
+    assert 'not retried' in outcome['error']
+
+def test_ambiguous_failure_with_post_lookup_stays_retryable():
+    outcome = build_failure_outcome('Twitter', 'Timed out', 1.0, True, True)
+    
+    assert outcome['retryable'] and outcome['ambiguous']
+
+@pytest.fixture
+def post_id(user):
+    post = Post(user_id=user.id, content='Retry test post', platforms='Twitter', status='publishing')
+    db.session.add(post)
+    db.session.commit()
+    return post.id
+
+def get_delivery(post_id):
+    db.session.commit()
+    return PostDelivery.query.filter_by(post_id=post_id, platform='Twitter').one()
+
+def test_record_delivery_outcome_schedules_retryable_failures(post_id):
+    retry_after = record_delivery_outcome(post_id, build_failure_outcome('Twitter', 'Server error', 0.1, True, False))
+    
+    delivery = get_delivery(post_id)
+    assert 1.0 <= retry_after <= Config.PUBLISH_RETRY_BASE_SECONDS
+    assert delivery.status == 'deferred'
+    assert delivery.attempts == 1
+    assert delivery.next_attempt_at is not None
+
+def test_record_delivery_outcome_marks_ambiguous_failures_unconfirmed(post_id):
+    assert record_delivery_outcome(post_id, build_failure_outcome('Twitter', 'Timed out', 0.1, True, True))
+    assert get_delivery(post_id).status == 'unconfirmed'
+
+def test_record_delivery_outcome_gives_up_after_max_attempts(post_id, monkeypatch):
+    monkeypatch.setattr(Config, 'PUBLISH_RETRY_MAX_ATTEMPTS', 2)
+    failure = build_failure_outcome('Twitter', 'Server error', 0.1, True, False)
+    
+    assert record_delivery_outcome(post_id, failure)
+    assert record_delivery_outcome(post_id, failure) is None
+    assert get_delivery(post_id).status == 'failed'
+
+def test_record_delivery_outcome_rate_limit_does_not_use_an_attempt(post_id):
+    outcome = build_publish_outcome('Twitter', False, error='rate limited', retry_after=42)
+    
+    assert record_delivery_outcome(post_id, outcome) == 42
+    delivery = get_delivery(post_id)
+    assert delivery.status == 'deferred'
+    assert delivery.attempts == 0
+
+def test_record_delivery_outcome_records_success(post_id):
+    assert record_delivery_outcome(post_id, build_publish_outcome('Twitter', True, result='123', elapsed=0.2)) is None
+    
+    delivery = get_delivery(post_id)
+    assert delivery.status == 'posted'
+    assert delivery.remote_id == '123'
+    assert delivery.latency_ms == 200
+
+@pytest.fixture
+def short_timeouts(monkeypatch):
+    monkeypatch.setattr(Config, 'PUBLISH_PLATFORM_TIMEOUT_SECONDS', 0.1)
+    monkeypatch.setattr(platform_manager, 'PUBLISH_TIMEOUT_POLL_SECONDS', 0.02)
+
+def install_futures(monkeypatch, create_future):
+    def submit(app, platform, access_token, content, image_url, reconcile, start_times):
+        return create_future((platform, access_token), start_times)
+    monkeypatch.setattr(platform_manager, 'submit_platform_publish', submit)
+
+def test_task_that_never_starts_is_cancelled_as_retryable(short_timeouts, monkeypatch):
+    install_futures(monkeypatch, lambda target, start_times: Future())
+    
+    [outcome] = publish_to_platforms([('Twitter', 'token')], 'content')
+    
+    assert outcome['error'].startswith('Not started')
+    assert outcome['retryable'] and not outcome['ambiguous']
+
+def test_task_that_started_before_cancel_reports_its_own_result(short_timeouts, monkeypatch):
+    def create_future(target, start_times):
+        future = Future()
+        future.set_running_or_notify_cancel()
+        platform_manager.publish_executor.submit(
+            lambda: (time.sleep(0.3), future.set_result(build_publish_outcome(target[0], True, result='42')))
+        )
+        return future
+    install_futures(monkeypatch, create_future)
+    
+    [outcome] = publish_to_platforms([('Twitter', 'token')], 'content')
+    
+    assert outcome['success'] and outcome['result'] == '42'
+
+def test_task_that_runs_past_the_timeout_is_ambiguous(short_timeouts, monkeypatch):
+    def create_future(target, start_times):
+        start_times[target] = time.monotonic()
+        future = Future()
+        future.set_running_or_notify_cancel()
+        return future
+    install_futures(monkeypatch, create_future)
+    
+    [outcome] = publish_to_platforms([('Twitter', 'token')], 'content')
+    
+    assert outcome['error'].startswith('Timed out')
+    assert outcome['retryable'] and outcome['ambiguous']
+
+def test_timeouts_are_tracked_per_account(short_timeouts, monkeypatch):
+    def create_future(target, start_times):
+        future = Future()
+        if target[1] == 'started-token':
+            start_times[target] = time.monotonic()
+            future.set_running_or_notify_cancel()
+        return future
+    install_futures(monkeypatch, create_future)
+    
+    outcomes = publish_to_platforms([('Twitter', 'started-token'), ('Twitter', 'queued-token')], 'content')
+    
+    assert sorted(outcome['error'].split()[0] for outcome in outcomes) == ['Not', 'Timed']
+
+@pytest.fixture
+def recorded_lookups(monkeypatch):
+    monkeypatch.setattr(circuit_breaker, 'breakers', {})
+    lookups = []
+    
+    def find_post(access_token, content):
+        lookups.append(rate_limiter.current_scope.get())
+        return 'existing-post'
+    monkeypatch.setitem(platform_manager.PLATFORM_POST_LOOKUPS, 'Facebook', find_post)
+    return lookups
+
+@pytest.mark.parametrize('backend', ['threads', 'asyncio'])
+def test_reconcile_lookup_runs_inside_the_rate_limit_scope(recorded_lookups, monkeypatch, backend):
+    monkeypatch.setattr(Config, 'PUBLISH_BACKEND', backend)
+    
+    outcome = run_platform_publish(None, 'Facebook', 'token', 'content', None, reconcile=True)
+    
+    assert outcome['success'] and outcome['result'] == 'existing-post'
+    assert recorded_lookups == [get_account_key('token')]
+
+def test_open_breaker_skips_the_reconcile_lookup(recorded_lookups):
+    breaker = circuit_breaker.get_circuit_breaker('Facebook', get_account_key('token'))
+    for _ in range(Config.CIRCUIT_FAILURE_THRESHOLD):
+        breaker.record_failure()
+    
+    outcome = run_platform_publish(None, 'Facebook', 'token', 'content', None, reconcile=True)
+    
+    assert not outcome['success'] and outcome['retry_after'] > 0
+    assert recorded_lookups == []
+
+class FakeTwitterClient:
+    def __init__(self, tweets):
+        self.tweets = tweets
+        self.start_time = None
+    
+    def get_me(self, user_auth=False):
+        return SimpleNamespace(data=SimpleNamespace(id=1))
+    
+    def get_users_tweets(self, id, start_time=None, **params):
+        self.start_time = start_time
+        return SimpleNamespace(data=self.tweets)
+
+def install_twitter_client(monkeypatch, tweets):
+    client = FakeTwitterClient(tweets)
+    monkeypatch.setattr(twitter_publisher, 'get_twitter_clients', lambda: (None, client))
+    return client
+
+def create_tweet(tweet_id, text, age_seconds=60):
+    return SimpleNamespace(id=tweet_id, text=text, created_at=datetime.now(timezone.utc) - timedelta(seconds=age_seconds))
+
+def test_twitter_lookup_matches_text_as_twitter_returns_it(monkeypatch):
+    install_twitter_client(monkeypatch, [create_tweet(7, 'Launch  day &amp; caf\u00e9 https://t.co/abc123\n')])
+    
+    assert twitter_publisher.find_recent_twitter_post('Launch day & cafe\u0301 https://example.com/launch') == 7
+
+def test_twitter_lookup_ignores_tweets_outside_the_window(monkeypatch):
+    client = install_twitter_client(monkeypatch, [
+        create_tweet(7, 'Same text', age_seconds=Config.PUBLISH_RECONCILE_WINDOW_SECONDS + 60)
+    ])
+    
+    assert twitter_publisher.find_recent_twitter_post('Same text') is None
+    assert client.start_time < datetime.now(timezone.utc) - timedelta(seconds=Config.PUBLISH_RECONCILE_WINDOW_SECONDS - 60)
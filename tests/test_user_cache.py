@@ -0,0 +1,20 @@
+import user_cache
+from user_cache import load_cached_user, store_dashboard, get_cached_dashboard, invalidate_dashboard_cache, invalidate_user_cache
+
+def test_post_writes_keep_the_user_snapshot(user):
+    load_cached_user(user.id)
+    store_dashboard(user.id, {'posts': 1})
+    
+    invalidate_dashboard_cache(user.id)
+    
+    assert get_cached_dashboard(user.id) is None
+    assert user.id in user_cache.user_entries
+
+def test_account_changes_evict_every_snapshot(user):
+    load_cached_user(user.id)
+    store_dashboard(user.id, {'posts': 1})
+    
+    invalidate_user_cache(user.id)
+    
+    assert get_cached_dashboard(user.id) is None
+    assert user.id not in user_cache.user_entries
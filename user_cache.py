@@ -0,0 +1,89 @@
+import threading
+import time
+from flask import g, has_app_context
+from sqlalchemy.orm import make_transient_to_detached
+from config import Config
+from models import User, SocialAccount, db
+from logger_config import get_logger
+
+logger = get_logger('user_cache')
+
+cache_lock = threading.Lock()
+user_entries = {}
+account_entries = {}
+dashboard_entries = {}
+
+def get_cache_entry(entries, user_id, ttl_seconds):
+    with cache_lock:
+        entry = entries.get(user_id)
+        if not entry:
+            return None
+        
+        stored_at, value = entry
+        if time.monotonic() - stored_at > ttl_seconds:
+            del entries[user_id]
+            return None
+        return value
+
+def store_cache_entry(entries, user_id, value):
+    with cache_lock:
+        entries[user_id] = (time.monotonic(), value)
+
+def snapshot_columns(instance):
+    return {column.key: getattr(instance, column.key) for column in instance.__table__.columns}
+
+def restore_instance(model, columns):
+    instance = model(**columns)
+    make_transient_to_detached(instance)
+    return db.session.merge(instance, load=False)
+
+def load_cached_user(user_id):
+    columns = get_cache_entry(user_entries, user_id, Config.USER_CACHE_TTL_SECONDS)
+    if columns is not None:
+        return restore_instance(User, columns)
+    
+    user = User.query.get(user_id)
+    if user:
+        store_cache_entry(user_entries, user_id, snapshot_columns(user))
+    return user
+
+def load_cached_accounts(user_id):
+    request_accounts = g.setdefault('active_accounts', {})
+    if user_id in request_accounts:
+        return request_accounts[user_id]
+    
+    cached_columns = get_cache_entry(account_entries, user_id, Config.USER_CACHE_TTL_SECONDS)
+    if cached_columns is not None:
+        accounts = [restore_instance(SocialAccount, columns) for columns in cached_columns]
+    else:
+        accounts = SocialAccount.query.filter_by(user_id=user_id, is_active=True).all()
+        store_cache_entry(account_entries, user_id, [snapshot_columns(account) for account in accounts])
+    
+    request_accounts[user_id] = accounts
+    return accounts
+
+def get_cached_dashboard(user_id):
+    return get_cache_entry(dashboard_entries, user_id, Config.DASHBOARD_CACHE_TTL_SECONDS)
+
+def store_dashboard(user_id, dashboard):
+    store_cache_entry(dashboard_entries, user_id, dashboard)
+
+def invalidate_dashboard_cache(user_id):
+    with cache_lock:
+        dashboard_entries.pop(user_id, None)
+    logger.info(f"Invalidated dashboard cache for user {user_id}")
+
+def invalidate_user_cache(user_id=None):
+    with cache_lock:
+        for entries in (user_entries, account_entries, dashboard_entries):
+            if user_id is None:
+                entries.clear()
+            else:
+                entries.pop(user_id, None)
+    
+    if has_app_context() and 'active_accounts' in g:
+        if user_id is None:
+            g.active_accounts.clear()
+        else:
+            g.active_accounts.pop(user_id, None)
+    logger.info(f"Invalidated user cache for {'all users' if user_id is None else f'user {user_id}'}")